@@ -0,0 +1,102 @@
+from json import dump as json_dump
+from random import Random
+
+DOMAIN_START = -1_000_000
+DOMAIN_END = 1_000_000
+CLUSTER_CORE = 1000
+WORKLOAD_SHAPES = ('uniform', 'clustered', 'fragmented', 'semi_infinite', 'empty_result')
+WORKLOAD_SCALES = {'small': (100, 20),
+                   'many_sets': (5000, 10),
+                   'many_ranges': (20, 5000),
+                   'large': (2000, 200)}
+
+
+def generate_math_sets(shape: str, sets_number: int, ranges_per_set: int, seed: int = 0) -> list:
+    """Returns the list of the initial math sets as text (as they are written to TXT data file).
+    The shape of the workload:
+        uniform         disjoint ranges and points spread over the whole domain
+        clustered       ranges gathered around a few centers, so the math sets overlap much,
+                        the odd number of negative endpoints makes every math set cover
+                        [-CLUSTER_CORE, CLUSTER_CORE]
+        fragmented      the same comb of short ranges with jittered endpoints, the intersection has many pieces
+        semi_infinite   every math set starts at -inf and ends at +inf, some math sets are (-inf, +inf)
+        empty_result    a half of the math sets is on the negative half of the domain, the other half is positive
+    The same seed produces the same math sets."""
+    if shape not in WORKLOAD_SHAPES:
+        raise ValueError(f'Unknown workload shape {shape}, one of {", ".join(WORKLOAD_SHAPES)} expected')
+    random = Random(seed)
+    math_sets = list()
+    for set_number in range(sets_number):
+        if shape == 'uniform':
+            endpoints = sorted(random.sample(range(DOMAIN_START, DOMAIN_END), 2 * ranges_per_set))
+        elif shape == 'clustered':
+            centers = [DOMAIN_START // 2, 0, DOMAIN_END // 2]
+            endpoints = sorted({endpoint for _ in range(2 * ranges_per_set)
+                                if abs(endpoint := int(random.gauss(random.choice(centers), DOMAIN_END // 20)))
+                                > CLUSTER_CORE})
+            if sum(endpoint < 0 for endpoint in endpoints) % 2 == 0:
+                endpoints = endpoints[1:]
+            if len(endpoints) % 2:
+                endpoints = endpoints[:-1]
+        elif shape == 'fragmented':
+            comb_step = (DOMAIN_END - DOMAIN_START) // (ranges_per_set + 1)
+            endpoints = list()
+            for range_number in range(ranges_per_set):
+                range_start = DOMAIN_START + range_number * comb_step + random.randint(0, comb_step // 10)
+                endpoints.extend((range_start, range_start + comb_step // 2 + random.randint(0, comb_step // 10)))
+        elif shape == 'semi_infinite':
+            if set_number % 10 == 0:
+                math_sets.append("[(float('-inf'), float('inf'))]")
+                continue
+            endpoints = sorted(random.sample(range(DOMAIN_START, DOMAIN_END), 2 * ranges_per_set))
+            endpoints[0], endpoints[-1] = float('-inf'), float('inf')
+        else:
+            domain_start, domain_end = (DOMAIN_START, -1) if set_number % 2 else (1, DOMAIN_END)
+            endpoints = sorted(random.sample(range(domain_start, domain_end), 2 * ranges_per_set))
+        math_sets.append(format_math_set(endpoints, random, 0 if shape in ('clustered', 'fragmented') else 0.1))
+    return math_sets
+
+
+def format_math_set(endpoints: list, random: Random, points_share: float = 0.1) -> str:
+    """Returns the math set of the sorted endpoints as text: every pair of endpoints is a range,
+    the given share of the pairs are points, a quarter of the endpoints are given as "float" (moved by 0.25)."""
+    math_ranges = list()
+    for start, end in zip(endpoints[::2], endpoints[1::2]):
+        if random.random() < points_share and start != float('-inf'):
+            math_ranges.append(format_endpoint(start, random))
+        else:
+            math_ranges.append(f'({format_endpoint(start, random)}, {format_endpoint(end, random)})')
+    return f'[{", ".join(math_ranges)}]'
+
+
+def format_endpoint(endpoint: int | float, random: Random) -> str:
+    """Returns the endpoint as text, infinite endpoint is given as float('-inf') (float('inf'))."""
+    if endpoint == float('-inf'):
+        return "float('-inf')"
+    if endpoint == float('inf'):
+        return "float('inf')"
+    if random.random() < 0.25:
+        return f'{endpoint}.25'
+    return f'{endpoint}'
+
+
+def generate_math_points(points_number: int, seed: int = 0) -> list:
+    """Returns the list of math points spread over the whole domain."""
+    random = Random(seed)
+    return [random.uniform(DOMAIN_START, DOMAIN_END) for _ in range(points_number)]
+
+
+def write_data_file(math_sets: list, data_format: str, file_path: str) -> None:
+    """Writes the math sets to the data file of the given format (JSON / TXT / XML)."""
+    with open(file_path, 'w') as file_to_write:
+        if data_format == 'JSON':
+            json_dump(math_sets, file_to_write)
+        elif data_format == 'TXT':
+            file_to_write.write('\n'.join(math_sets))
+        elif data_format == 'XML':
+            file_to_write.write('<MathSets>\n')
+            for math_set in math_sets:
+                file_to_write.write(f'    <value>{math_set}</value>\n')
+            file_to_write.write('</MathSets>\n')
+        else:
+            raise ValueError(f'Unknown data format {data_format}, JSON / TXT / XML expected')
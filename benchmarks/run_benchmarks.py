@@ -0,0 +1,220 @@
+from argparse import ArgumentParser
+from json import dump as json_dump
+from json import load as json_load
+from os.path import abspath, dirname, getsize
+from os.path import join as os_path_join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from tracemalloc import get_traced_memory, is_tracing
+from tracemalloc import start as start_tracing
+from tracemalloc import stop as stop_tracing
+
+from benchmarks.generate_workload import WORKLOAD_SCALES, WORKLOAD_SHAPES, generate_math_points, write_data_file
+from benchmarks.generate_workload import generate_math_sets
+from math_analyser import (ConfigFileData, determine_closest_points_of_math_intersection,
+                           determine_intersection_by_sweep_line, output_script_data, read_initial_math_sets,
+                           write_bin_data_file)
+
+DATA_FORMATS = ('JSON', 'TXT', 'XML', 'BIN')
+BENCHMARK_STAGES = ('parse', 'intersect', 'nearest_point', 'output')
+DEFAULT_BASELINE_FILE = os_path_join(abspath(dirname(__file__)), 'baseline.json')
+DEFAULT_TOLERANCE = 0.25
+
+
+def run_benchmarks(shapes: list, data_formats: list, sets_number: int, ranges_per_set: int,
+                   points_number: int = 10000, repeat: int = 3, output_format: str = 'txt') -> dict:
+    """Generates the data file of every workload shape in every data format and runs all stages on it.
+    Returns the dictionary {workload name: workload result},
+    the workload name is "{shape}-{format}-{sets}x{ranges}".
+    The workload result contains the best time of every stage in seconds (of the repeat runs),
+    the throughput of every stage, the peak memory of every stage in bytes (traced by tracemalloc in a separate run,
+    so the timings are not slowed down by tracing) and the sizes of the workload."""
+    benchmark_results = dict()
+    with TemporaryDirectory() as work_dir:
+        for shape in shapes:
+            math_sets = generate_math_sets(shape, sets_number, ranges_per_set)
+            math_points = generate_math_points(points_number)
+            for data_format in data_formats:
+                data_file = os_path_join(work_dir, f'{shape}.{data_format.lower()}')
+                if data_format == 'BIN':
+                    write_bin_data_file(read_initial_math_sets(write_text_data_file(math_sets, work_dir), 'TXT'),
+                                        data_file)
+                else:
+                    write_data_file(math_sets, data_format, data_file)
+                config_data = ConfigFileData(data_format, data_file, output_format,
+                                             os_path_join(work_dir, f'{shape}_result'), 'INTS', None)
+                workload_name = f'{shape}-{data_format}-{sets_number}x{ranges_per_set}'
+                benchmark_results[workload_name] = run_workload(config_data, math_points, repeat)
+    return benchmark_results
+
+
+def write_text_data_file(math_sets: list, work_dir: str) -> str:
+    """Writes the math sets to the TXT data file in the directory (the source of BIN data file),
+    returns its path."""
+    data_file = os_path_join(work_dir, 'source.txt')
+    write_data_file(math_sets, 'TXT', data_file)
+    return data_file
+
+
+def run_workload(config_data: ConfigFileData, math_points: list, repeat: int) -> dict:
+    """Runs every stage of the analysis on the data file of the configuration and returns the workload result.
+    Every stage gets the result of the previous one, the output files are written to the output directory.
+    The stages:
+        parse           reading and parsing the data file (the math sets are validated while they are parsed)
+        intersect       the intersection of the math sets by the sweep line
+        nearest_point   the closest points of the intersection for all math points
+        output          writing the intersection to the output file"""
+    stages = {'parse': lambda: read_initial_math_sets(config_data.get_data_file(), config_data.get_data_format()),
+              'intersect': lambda: determine_intersection_by_sweep_line(ini_math_sets),
+              'nearest_point': lambda: determine_closest_points_of_math_intersection(math_points,
+                                                                                      math_intersection),
+              'output': lambda: output_script_data(config_data, math_intersection)}
+    stage_seconds, stage_peak_memory = dict(), dict()
+    ini_math_sets = math_intersection = None
+    for stage_name, stage in stages.items():
+        stage_seconds[stage_name], stage_result = time_stage(stage, repeat)
+        stage_peak_memory[stage_name] = trace_stage_memory(stage)
+        if stage_name == 'parse':
+            ini_math_sets = stage_result
+        elif stage_name == 'intersect':
+            math_intersection = stage_result
+
+    data_file_size = getsize(config_data.get_data_file())
+    subranges_number = sum(len(math_set) for math_set in ini_math_sets)
+    stage_items = {'parse': data_file_size, 'intersect': subranges_number, 'nearest_point': len(math_points),
+                   'output': len(math_intersection)}
+    return {'sets': len(ini_math_sets),
+            'subranges': subranges_number,
+            'data_file_bytes': data_file_size,
+            'intersection_subranges': len(math_intersection),
+            'seconds': stage_seconds,
+            'throughput': {stage_name: stage_items[stage_name] / seconds if seconds else None
+                           for stage_name, seconds in stage_seconds.items()},
+            'peak_memory_bytes': stage_peak_memory}
+
+
+def time_stage(stage: 'Callable object', repeat: int) -> tuple:
+    """Runs the stage repeat times and returns the best time in seconds and the result of the stage."""
+    best_seconds = float('inf')
+    stage_result = None
+    for _ in range(max(1, repeat)):
+        start_time = perf_counter()
+        stage_result = stage()
+        best_seconds = min(best_seconds, perf_counter() - start_time)
+    return best_seconds, stage_result
+
+
+def trace_stage_memory(stage: 'Callable object') -> int:
+    """Runs the stage once with tracemalloc and returns the peak of the memory allocated by it in bytes."""
+    was_tracing = is_tracing()
+    if not was_tracing:
+        start_tracing()
+    try:
+        memory_before = get_traced_memory()[0]
+        stage()
+        return get_traced_memory()[1] - memory_before
+    finally:
+        if not was_tracing:
+            stop_tracing()
+
+
+def compare_with_baseline(benchmark_results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """Returns the list of regressions: (workload name, stage, baseline, current) for every stage time
+    or peak memory that is more than (1 + tolerance) times of the baseline one.
+    The workloads and stages that are not in the baseline are skipped."""
+    regressions = list()
+    for workload_name, workload_result in benchmark_results.items():
+        workload_baseline = baseline.get(workload_name)
+        if workload_baseline is None:
+            continue
+        for measure in ('seconds', 'peak_memory_bytes'):
+            for stage_name, current_value in workload_result[measure].items():
+                baseline_value = workload_baseline.get(measure, {}).get(stage_name)
+                if baseline_value and current_value > baseline_value * (1 + tolerance):
+                    regressions.append((workload_name, f'{stage_name} {measure}', baseline_value, current_value))
+    return regressions
+
+
+def get_workloads_without_baseline(benchmark_results: dict, baseline: dict) -> list:
+    """Returns the names of the workloads that are not in the baseline, they are not compared."""
+    return [workload_name for workload_name in benchmark_results if workload_name not in baseline]
+
+
+def load_baseline(baseline_file: str) -> dict | None:
+    """Returns the stored benchmark results of the baseline file, or None if there is no file."""
+    try:
+        with open(baseline_file) as file_to_read:
+            return json_load(file_to_read)
+    except FileNotFoundError:
+        return None
+
+
+def print_benchmark_results(benchmark_results: dict) -> None:
+    """Prints the time, throughput and peak memory of every stage of every workload."""
+    for workload_name, workload_result in benchmark_results.items():
+        print(f'{workload_name}: {workload_result["sets"]} sets, {workload_result["subranges"]} subranges, '
+              f'{workload_result["data_file_bytes"]} bytes, '
+              f'{workload_result["intersection_subranges"]} subranges in the intersection')
+        for stage_name in BENCHMARK_STAGES:
+            throughput = workload_result['throughput'][stage_name]
+            print(f'    {stage_name:<14}{workload_result["seconds"][stage_name] * 1000:>10.2f} ms'
+                  f'{throughput or 0:>16.0f} items/s'
+                  f'{workload_result["peak_memory_bytes"][stage_name] / 2 ** 20:>10.2f} MB')
+
+
+def main():
+    """The script generates the synthetic workloads, times every stage of the analysis on them
+    and compares the results with the baseline file. The exit code is 1 if any regression is found,
+    2 if there is no baseline file or any workload is not in it (nothing to compare with)."""
+    arg_parser = ArgumentParser(description='Benchmarks MathSetsAnalyser on the synthetic workloads.')
+    arg_parser.add_argument('--scale', choices=WORKLOAD_SCALES, default='small',
+                            help='the number of math sets and ranges per math set (default: small)')
+    arg_parser.add_argument('--sets', type=int, help='the number of math sets (overrides the scale)')
+    arg_parser.add_argument('--ranges', type=int, help='the number of ranges per math set (overrides the scale)')
+    arg_parser.add_argument('--shapes', nargs='+', choices=WORKLOAD_SHAPES, default=list(WORKLOAD_SHAPES))
+    arg_parser.add_argument('--formats', nargs='+', choices=DATA_FORMATS, default=['JSON', 'TXT', 'XML'])
+    arg_parser.add_argument('--points', type=int, default=10000, help='the number of math points (default: 10000)')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='the runs of every stage, the best is taken')
+    arg_parser.add_argument('--baseline', default=DEFAULT_BASELINE_FILE, help='the file of the baseline results')
+    arg_parser.add_argument('--update-baseline', action='store_true',
+                            help='store the results as the baseline instead of comparing with it')
+    arg_parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                            help='the allowed slowdown relative to the baseline (default: 0.25)')
+    arg_parser.add_argument('--output', help='the JSON file of the results')
+    args = arg_parser.parse_args()
+
+    sets_number, ranges_per_set = WORKLOAD_SCALES[args.scale]
+    benchmark_results = run_benchmarks(args.shapes, args.formats, args.sets or sets_number,
+                                       args.ranges or ranges_per_set, args.points, args.repeat)
+    print_benchmark_results(benchmark_results)
+    if args.output:
+        with open(args.output, 'w') as file_to_write:
+            json_dump(benchmark_results, file_to_write, indent=4)
+
+    if args.update_baseline:
+        baseline = load_baseline(args.baseline) or dict()
+        baseline.update(benchmark_results)
+        with open(args.baseline, 'w') as file_to_write:
+            json_dump(baseline, file_to_write, indent=4)
+        print(f'The baseline is updated: {args.baseline}')
+        return
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f'NO BASELINE: {args.baseline} is not found, run with --update-baseline to store the results')
+        raise SystemExit(2)
+    regressions = compare_with_baseline(benchmark_results, baseline, args.tolerance)
+    for workload_name, measure, baseline_value, current_value in regressions:
+        print(f'REGRESSION {workload_name} {measure}: {baseline_value:.6g} -> {current_value:.6g}')
+    workloads_without_baseline = get_workloads_without_baseline(benchmark_results, baseline)
+    for workload_name in workloads_without_baseline:
+        print(f'NO BASELINE {workload_name}: the workload is not in {args.baseline}')
+    if regressions:
+        raise SystemExit(1)
+    if workloads_without_baseline:
+        raise SystemExit(2)
+    print('No regressions found.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+from argparse import ArgumentParser
+from os.path import splitext
+
+from math_analyser import convert_data_file_to_bin
+
+
+def main():
+    """The script converts JSON / TXT / XML data file to BIN data file,
+    which is read by "run_math_sets_analyser" without parsing (format = BIN in the section [input]).
+    The format of the data file is determined by its extension, unless it is given by --format."""
+    argument_parser = ArgumentParser(description='Converts the data file with initial math sets to BIN format.')
+    argument_parser.add_argument('data_file', help='path to JSON / TXT / XML data file')
+    argument_parser.add_argument('bin_file', help='path to the created BIN data file')
+    argument_parser.add_argument('--format', dest='data_format', help='format of the data file: JSON, TXT or XML')
+    arguments = argument_parser.parse_args()
+
+    data_format = arguments.data_format or splitext(arguments.data_file)[1][1:]
+    try:
+        math_sets_number = convert_data_file_to_bin(arguments.data_file, data_format, arguments.bin_file)
+    except Exception:
+        print('Error! Converting the data file raised an exception:')
+        raise
+    else:
+        print(f'Converted {math_sets_number} math sets to "{arguments.bin_file}".')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,36 @@
+from .interval_set import IntervalSet
+from .analyser_service import AnalyserService, start_analyser_server
 from .config_data import ConfigFileData, parse_configuration_file
-from .format_math_ranges import (format_math_ranges,
-                                 get_endpoints_of_two_math_ranges,
-                                 remove_duplicate_endpoints)
+from .coverage_sweep import COVERAGE_MODES, determine_coverage_by_sweep_line
+from .dynamic_intersection import DynamicIntersection
+from .convert_data import convert_data_file_to_bin, write_bin_data_file
+from .external_intersection import determine_intersection_in_external_memory, trace_peak_memory
 from .get_initial_data import (get_initial_math_sets,
-                               verify_ini_math_sets,
+                               iter_initial_math_sets,
+                               read_initial_math_sets,
+                               get_math_points,
                                get_data_from_json_file,
+                               iter_data_from_json_file,
+                               iter_json_array,
                                get_data_from_txt_file,
-                               get_data_from_xml_file)
+                               iter_data_from_txt_file,
+                               get_data_from_xml_file,
+                               iter_data_from_xml_file,
+                               get_data_from_bin_file,
+                               iter_data_from_bin_file)
+from .input_cache import get_initial_math_sets_with_sidecar, read_initial_math_sets_with_sidecar
+from .math_set_parser import parse_math_set
 from .math_sets_analyser import (determine_intersection_of_ini_math_ranges,
-                                 determine_closest_point_of_math_intersection)
+                                 determine_intersection_of_math_sets_stream,
+                                 determine_closest_point_of_math_intersection,
+                                 determine_closest_points_of_math_intersection)
+from .instrumentation import Instrumentation, NO_INSTRUMENTATION, profile_run
+from .numpy_backend import (NUMPY_IS_AVAILABLE,
+                            determine_intersection_with_numpy,
+                            determine_closest_point_with_numpy)
 from .output_data import output_script_data
+from .output_sink import OutputSink, choose_name_for_output_file
+from .parallel_intersection import determine_intersection_in_parallel, determine_intersection_by_domain_slices
+from .result_cache import ResultCache
+from .stabbing_index import StabbingIndex, determine_sets_of_math_points
+from .sweep_line import determine_intersection_by_sweep_line
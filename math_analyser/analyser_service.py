@@ -0,0 +1,169 @@
+from asyncio import IncompleteReadError, Server, get_running_loop, shield, start_server, start_unix_server
+from concurrent.futures import Executor
+from functools import partial
+from json import dumps as json_dumps
+from json import loads as json_loads
+from os import stat
+from os.path import abspath
+
+from errors import ConfigFileError, DataFileError, OutputDataError
+from math_analyser.get_initial_data import read_initial_math_sets, verify_math_point
+from math_analyser.interval_set import IntervalSet
+from math_analyser.math_sets_analyser import (determine_closest_point_of_math_intersection,
+                                              determine_closest_points_of_math_intersection)
+from math_analyser.sweep_line import determine_intersection_by_sweep_line
+
+DATA_FORMATS = ('JSON', 'TXT', 'XML', 'BIN')
+INLINE_POINTS_LIMIT = 1000
+HTTP_STATUSES = {200: '200 OK', 400: '400 Bad Request', 404: '404 Not Found', 405: '405 Method Not Allowed',
+                 500: '500 Internal Server Error'}
+
+
+class AnalyserService:
+    __slots__ = ['executor', 'datasets', 'loading_datasets']
+
+    def __init__(self, executor: Executor = None):
+        """Creates an object of the AnalyserService class, the async API of MathSetsAnalyser.
+        The intersections of the data files are kept in memory while the data files are unchanged
+        (the size and modification time of the data file are checked on every request).
+        The data file is read and analysed by the given executor (the default executor of the event loop if None),
+        the concurrent requests for the same data file wait for the same analysis."""
+        self.executor = executor
+        self.datasets = dict()
+        self.loading_datasets = dict()
+
+    async def determine_intersection(self, data_file: str, data_format: str) -> IntervalSet:
+        """Returns the intersection of the initial math sets of the data file ('INTS' mode)."""
+        data_format = data_format.upper()
+        if data_format not in DATA_FORMATS:
+            raise ConfigFileError(f'contains data that is not specified or is invalid: "format" {data_format}')
+        data_file = abspath(data_file)
+        try:
+            data_file_stat = stat(data_file)
+        except OSError:
+            raise DataFileError(f'not found in {data_file}')
+
+        dataset_key = (data_file, data_format)
+        dataset_version = (data_file_stat.st_size, data_file_stat.st_mtime_ns)
+        dataset = self.datasets.get(dataset_key)
+        if dataset is not None and dataset[0] == dataset_version:
+            return dataset[1]
+
+        loading_key = (dataset_key, dataset_version)
+        if loading_key not in self.loading_datasets:
+            self.loading_datasets[loading_key] = get_running_loop().create_task(
+                self.load_dataset(dataset_key, dataset_version))
+        return await shield(self.loading_datasets[loading_key])
+
+    async def load_dataset(self, dataset_key: tuple, dataset_version: tuple) -> IntervalSet:
+        """Determines the intersection of the data file by the executor and keeps it in memory."""
+        try:
+            math_intersection = await get_running_loop().run_in_executor(
+                self.executor, determine_intersection_of_data_file, *dataset_key)
+        finally:
+            del self.loading_datasets[(dataset_key, dataset_version)]
+        self.datasets[dataset_key] = (dataset_version, math_intersection)
+        return math_intersection
+
+    async def determine_closest_points(self, data_file: str, data_format: str, math_points: float | list) -> list:
+        """Returns the math point (or the closest endpoint(s) to it) for the given math point ('AFFL' mode),
+        or list of pairs (math point, result) for the given list of math points.
+        The large list of math points is answered by the executor."""
+        math_intersection = await self.determine_intersection(data_file, data_format)
+        if not isinstance(math_points, list):
+            return determine_closest_point_of_math_intersection(get_math_point(math_points), math_intersection)
+
+        math_points = [get_math_point(math_point) for math_point in math_points]
+        if len(math_points) <= INLINE_POINTS_LIMIT:
+            return determine_closest_points_of_math_intersection(math_points, math_intersection)
+        return await get_running_loop().run_in_executor(
+            self.executor, determine_closest_points_of_math_intersection, math_points, math_intersection)
+
+    def clear(self) -> None:
+        """Removes all intersections kept in memory."""
+        self.datasets.clear()
+
+
+def determine_intersection_of_data_file(data_file: str, data_format: str) -> IntervalSet:
+    """Returns the intersection of the initial math sets of the data file."""
+    return determine_intersection_by_sweep_line(read_initial_math_sets(data_file, data_format))
+
+
+def get_math_point(math_point: float) -> float:
+    """Returns the math point if it is a finite number, otherwise DataFileError is raised."""
+    if isinstance(math_point, bool) or not isinstance(math_point, int | float):
+        raise DataFileError(f'with math points contains invalid point: {math_point}')
+    return float(verify_math_point(math_point))
+
+
+async def start_analyser_server(service: AnalyserService, host: str = '127.0.0.1', port: int = 8765,
+                                unix_socket: str = None) -> Server:
+    """Starts HTTP server of the service on the given host and port or on the given Unix socket.
+    The requests are POST /ints with JSON object {"data_file": ..., "format": ...}
+    and POST /affl with the same object and "point": number or "points": [numbers].
+    The response is JSON object {"result": ...} with the result as it is written to TXT output file,
+    or {"error": ...} with the error status."""
+    connection_handler = partial(handle_http_connection, service)
+    if unix_socket is not None:
+        return await start_unix_server(connection_handler, path=unix_socket)
+    return await start_server(connection_handler, host, port)
+
+
+async def handle_http_connection(service: AnalyserService, reader: 'StreamReader object',
+                                 writer: 'StreamWriter object') -> None:
+    """Answers HTTP requests of the connection until it is closed, the keep-alive connections are supported."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            headers = dict()
+            while (header_line := await reader.readline()).strip():
+                header_name, separator, header_value = header_line.decode('latin-1').partition(':')
+                headers[header_name.strip().lower()] = header_value.strip()
+
+            try:
+                method, path, http_version = request_line.decode('latin-1').split()
+                request_body = await reader.readexactly(int(headers.get('content-length', 0)))
+            except ValueError:
+                status, response = 400, {'error': 'Invalid HTTP request'}
+                keep_alive = False
+            else:
+                status, response = await handle_request(service, method, path, request_body)
+                keep_alive = http_version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+            response_body = json_dumps(response).encode()
+            writer.write(f'HTTP/1.1 {HTTP_STATUSES[status]}\r\n'
+                         f'Content-Type: application/json\r\n'
+                         f'Content-Length: {len(response_body)}\r\n'
+                         f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode() + response_body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def handle_request(service: AnalyserService, method: str, path: str, request_body: bytes) -> tuple:
+    """Returns HTTP status and JSON response to the request of 'INTS' or 'AFFL' mode."""
+    if path not in ('/ints', '/affl'):
+        return 404, {'error': f'Unknown path {path}, /ints or /affl expected'}
+    if method != 'POST':
+        return 405, {'error': f'Method {method} is not allowed, POST expected'}
+    try:
+        request = json_loads(request_body)
+        if path == '/ints':
+            result = await service.determine_intersection(request['data_file'], request['format'])
+            result = result.to_list()
+        else:
+            math_points = request['points'] if 'points' in request else request['point']
+            result = await service.determine_closest_points(request['data_file'], request['format'], math_points)
+    except KeyError as err:
+        return 400, {'error': f'Request must contain {err}'}
+    except (ValueError, TypeError, ConfigFileError, DataFileError, OutputDataError) as err:
+        return 400, {'error': '\n'.join([str(err), *getattr(err, '__notes__', ())])}
+    except Exception as err:
+        return 500, {'error': f'The analysis raised an exception: {err!r}'}
+    return 200, {'result': str(result)}
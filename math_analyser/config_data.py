@@ -2,13 +2,19 @@ from configparser import ConfigParser
 from os.path import dirname, isdir, isfile, normpath, splitext
 
 from errors import ConfigFileError, DataFileError, OutputDataError
+from math_analyser.numpy_backend import NUMPY_IS_AVAILABLE
 
 PARSING_ERROR = 'contains data that is not specified or is invalid: '
+ANALYSIS_MODES = ('INTS', 'AFFL', 'UNION', 'COMPL', 'DIFF', 'COVER', 'DEPTH', 'STAB')
+POINT_MODES = ('AFFL', 'STAB')
 
 
 class ConfigFileData:
     def __init__(self, data_format, data_file, output_file_format,
-                 output_file_path, analysis_mode, math_point):
+                 output_file_path, analysis_mode, math_point, backend='python',
+                 points_format=None, points_file=None, cache_dir=None, cache_size=256, streaming=False,
+                 workers=1, partition='sets', metrics_file=None, profile_file=None, memory_limit=None,
+                 cover_k=None, sidecar=False, sidecar_dir=None):
         """Creates an object of the ConfigData class,
         assigns values to the main script parameters from a configuration file."""
         self.data_format = data_format.upper()
@@ -16,27 +22,138 @@ class ConfigFileData:
         self.output_file_format = output_file_format.lower()
         self.output_file_path = output_file_path
         self.analysis_mode = analysis_mode.upper()
+        self.analysis_modes = tuple(dict.fromkeys(self.analysis_mode.replace(',', ' ').split()))
         self.math_point = math_point
+        self.cover_k = cover_k
+        self.backend = backend.upper()
+        self.points_format = points_format.upper() if points_format else points_format
+        self.points_file = points_file
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.streaming = streaming
+        self.workers = workers
+        self.partition = partition.upper()
+        self.metrics_file = metrics_file
+        self.profile_file = profile_file
+        self.memory_limit = memory_limit
+        self.sidecar = sidecar
+        self.sidecar_dir = sidecar_dir
 
     def verify_config_data(self) -> None:
         """Validates configuration data.
-        The data file type, output file type, analysis mode,
-        and math point value (only for 'AFFL' mode) are checked for correctness.
+        The data file type, output file type, analysis mode, backend, streaming, number of workers, partition,
+        memory limit, cache size, sidecar cache of the data file, metrics and profile files,
+        and math point value or file with math points (only for 'AFFL' and 'STAB' modes),
+        and the number of covering math sets k (only for 'COVER' mode) are checked for correctness.
+        Several analysis modes may be given separated by commas, the cache, streaming, memory limit, workers
+        and NumPy backend are supported by the single 'INTS' or 'AFFL' mode only.
+        The memory limit and streaming read the math sets one by one by themselves, so they cannot be combined
+        with each other, with the workers, the NumPy backend or the sidecar cache of the data file.
         The data file and output file directory are checked for existence.
         If the check fails, an appropriate exception will be raised."""
-        if self.analysis_mode == 'AFFL':
+        if not self.analysis_modes or not set(self.analysis_modes).issubset(ANALYSIS_MODES):
+            raise ConfigFileError(f'{PARSING_ERROR}"mode" in the section [general]')
+
+        if set(POINT_MODES).intersection(self.analysis_modes) and self.points_file is not None:
+            self.math_point = None
+            if self.points_format not in ('JSON', 'TXT'):
+                raise ConfigFileError(f'{PARSING_ERROR}"format" in the section [points]')
+            if not self.points_file:
+                raise ConfigFileError(f'{PARSING_ERROR}"path" in the section [points]')
+            points_file_path, points_file_type = splitext(self.points_file)
+            if points_file_type and points_file_type[1:] != self.points_format.lower():
+                raise ConfigFileError(f'{PARSING_ERROR}"format" and "path" in the section [points]')
+            if not isfile(normpath(self.points_file)):
+                raise DataFileError(f'with math points not found in {self.points_file}')
+        elif set(POINT_MODES).intersection(self.analysis_modes):
             if not self.math_point or self.math_point == float('-inf') or self.math_point == float('inf'):
                 raise ConfigFileError(f'{PARSING_ERROR}"point" in the section [general]')
             try:
                 self.math_point = float(self.math_point)
             except Exception:
                 raise ConfigFileError(f'{PARSING_ERROR}"point" in the section [general]')
-        elif self.analysis_mode == 'INTS':
-            self.math_point = None
         else:
-            raise ConfigFileError(f'{PARSING_ERROR}"mode" in the section [general]')
+            self.math_point = None
+
+        if 'COVER' in self.analysis_modes:
+            try:
+                self.cover_k = int(self.cover_k)
+            except Exception:
+                raise ConfigFileError(f'{PARSING_ERROR}"k" in the section [general]')
+            if self.cover_k < 1:
+                raise ConfigFileError(f'{PARSING_ERROR}"k" in the section [general]')
+
+        if self.backend not in ('PYTHON', 'NUMPY'):
+            raise ConfigFileError(f'{PARSING_ERROR}"backend" in the section [engine]')
+        if self.backend == 'NUMPY' and not NUMPY_IS_AVAILABLE:
+            raise ConfigFileError(f'{PARSING_ERROR}"backend" in the section [engine], NumPy is not installed')
+
+        if isinstance(self.streaming, str):
+            if self.streaming.lower() not in ConfigParser.BOOLEAN_STATES:
+                raise ConfigFileError(f'{PARSING_ERROR}"streaming" in the section [engine]')
+            self.streaming = ConfigParser.BOOLEAN_STATES[self.streaming.lower()]
+
+        try:
+            self.workers = int(self.workers)
+        except Exception:
+            raise ConfigFileError(f'{PARSING_ERROR}"workers" in the section [engine]')
+        if self.workers < 1:
+            raise ConfigFileError(f'{PARSING_ERROR}"workers" in the section [engine]')
+        if self.partition not in ('SETS', 'DOMAIN'):
+            raise ConfigFileError(f'{PARSING_ERROR}"partition" in the section [engine]')
+        if self.memory_limit is not None:
+            try:
+                self.memory_limit = int(self.memory_limit)
+            except Exception:
+                raise ConfigFileError(f'{PARSING_ERROR}"memory_limit" in the section [engine]')
+            if self.memory_limit <= 0:
+                raise ConfigFileError(f'{PARSING_ERROR}"memory_limit" in the section [engine]')
+
+        if self.cache_dir is not None:
+            try:
+                self.cache_size = int(self.cache_size)
+            except Exception:
+                raise ConfigFileError(f'{PARSING_ERROR}"size" in the section [cache]')
+            if not self.cache_dir or self.cache_size <= 0:
+                raise ConfigFileError(f'{PARSING_ERROR}"path" and "size" in the section [cache]')
+
+        if isinstance(self.sidecar, str):
+            if self.sidecar.lower() not in ConfigParser.BOOLEAN_STATES:
+                raise ConfigFileError(f'{PARSING_ERROR}"sidecar" in the section [input]')
+            self.sidecar = ConfigParser.BOOLEAN_STATES[self.sidecar.lower()]
+        if self.sidecar_dir == '':
+            raise ConfigFileError(f'{PARSING_ERROR}"sidecar_dir" in the section [input]')
+        if self.sidecar_dir is not None:
+            self.sidecar = True
 
-        if self.data_format not in ('JSON', 'TXT', 'XML'):
+        if self.analysis_modes not in (('INTS',), ('AFFL',)):
+            engine_options = {'"path" in the section [cache]': self.cache_dir is not None,
+                              '"streaming" in the section [engine]': self.streaming,
+                              '"memory_limit" in the section [engine]': self.memory_limit is not None,
+                              '"workers" in the section [engine]': self.workers > 1,
+                              '"backend" in the section [engine]': self.backend != 'PYTHON'}
+            for engine_option, is_given in engine_options.items():
+                if is_given:
+                    raise ConfigFileError(f'{PARSING_ERROR}{engine_option}, '
+                                          f'it is supported by the single INTS or AFFL mode only')
+        if self.memory_limit is not None or self.streaming:
+            reading_option = '"memory_limit"' if self.memory_limit is not None else '"streaming"'
+            engine_options = {'"streaming" in the section [engine]': (self.memory_limit is not None
+                                                                      and self.streaming),
+                              '"workers" in the section [engine]': self.workers > 1,
+                              '"backend" in the section [engine]': self.backend != 'PYTHON',
+                              '"sidecar" in the section [input]': self.sidecar}
+            for engine_option, is_given in engine_options.items():
+                if is_given:
+                    raise ConfigFileError(f'{PARSING_ERROR}{engine_option}, '
+                                          f'it cannot be combined with {reading_option} in the section [engine]')
+
+        if self.metrics_file == '':
+            raise ConfigFileError(f'{PARSING_ERROR}"path" in the section [metrics]')
+        if self.profile_file == '':
+            raise ConfigFileError(f'{PARSING_ERROR}"profile" in the section [metrics]')
+
+        if self.data_format not in ('JSON', 'TXT', 'XML', 'BIN'):
             raise ConfigFileError(f'{PARSING_ERROR}"format" in the section [input]')
 
         input_file_path, input_file_type = splitext(self.data_file)
@@ -81,10 +198,70 @@ class ConfigFileData:
         """Returns the analysis mode."""
         return self.analysis_mode
 
+    def get_cover_k(self) -> int:
+        """Returns the number of math sets that must cover the result of 'COVER' mode."""
+        return self.cover_k
+
+    def get_analysis_modes(self) -> tuple:
+        """Returns the analysis modes of the run in the order they are given."""
+        return self.analysis_modes
+
     def get_math_point(self) -> float:
         """Returns the math point value."""
         return self.math_point
 
+    def get_points_format(self) -> str:
+        """Returns the format of the file with math points."""
+        return self.points_format
+
+    def get_points_file(self) -> str:
+        """Returns the path to the file with math points, None if the single math point is given."""
+        return self.points_file
+
+    def get_cache_dir(self) -> str:
+        """Returns the path to the cache directory, None if the cache is not used."""
+        return self.cache_dir
+
+    def get_cache_size(self) -> int:
+        """Returns the size limit of the cache directory in megabytes."""
+        return self.cache_size
+
+    def get_streaming(self) -> bool:
+        """Returns True if the data file is read and folded set by set."""
+        return self.streaming
+
+    def get_workers(self) -> int:
+        """Returns the number of worker processes for the intersection of the initial math sets."""
+        return self.workers
+
+    def get_partition(self) -> str:
+        """Returns the way the work is split between the workers: by math sets or by slices of the number line."""
+        return self.partition
+
+    def get_memory_limit(self) -> int:
+        """Returns the memory limit of the intersection in megabytes, None if the math sets are kept in memory."""
+        return self.memory_limit
+
+    def get_sidecar(self) -> bool:
+        """Returns True if the parsed math sets of the data file are kept in the sidecar file for the next runs."""
+        return self.sidecar
+
+    def get_sidecar_dir(self) -> str:
+        """Returns the directory of the sidecar files, None if the sidecar file is kept next to the data file."""
+        return self.sidecar_dir
+
+    def get_metrics_file(self) -> str:
+        """Returns the path to JSON file with the metrics of the run, None if the metrics are not written."""
+        return self.metrics_file
+
+    def get_profile_file(self) -> str:
+        """Returns the path to the cProfile statistics of the run, None if the run is not profiled."""
+        return self.profile_file
+
+    def get_backend(self) -> str:
+        """Returns the backend of the math sets analysis."""
+        return self.backend
+
 
 def parse_configuration_file(input_file: str) -> ConfigFileData:
     """Checks for the presence of 'config.ini', if the file is not found ConfigFileNotFoundError will be raised.
@@ -102,10 +279,24 @@ def parse_configuration_file(input_file: str) -> ConfigFileData:
 
         config_parameters = {'analysis_mode': section_general.get('mode'),
                              'math_point': section_general.getfloat('point'),
+                             'cover_k': section_general.get('k'),
                              'data_format': section_input.get('format'),
                              'data_file': section_input.get('path'),
                              'output_file_format': section_output.get('format'),
-                             'output_file_path': section_output.get('path')}
+                             'output_file_path': section_output.get('path'),
+                             'backend': data_from_config_ini.get('engine', 'backend', fallback='python'),
+                             'points_format': data_from_config_ini.get('points', 'format', fallback=None),
+                             'points_file': data_from_config_ini.get('points', 'path', fallback=None),
+                             'cache_dir': data_from_config_ini.get('cache', 'path', fallback=None),
+                             'cache_size': data_from_config_ini.get('cache', 'size', fallback=256),
+                             'streaming': data_from_config_ini.get('engine', 'streaming', fallback=False),
+                             'workers': data_from_config_ini.get('engine', 'workers', fallback=1),
+                             'partition': data_from_config_ini.get('engine', 'partition', fallback='sets'),
+                             'memory_limit': data_from_config_ini.get('engine', 'memory_limit', fallback=None),
+                             'sidecar': section_input.get('sidecar', fallback=False),
+                             'sidecar_dir': section_input.get('sidecar_dir', fallback=None),
+                             'metrics_file': data_from_config_ini.get('metrics', 'path', fallback=None),
+                             'profile_file': data_from_config_ini.get('metrics', 'profile', fallback=None)}
     except KeyError as err:
         raise ConfigFileError(f'{PARSING_ERROR}section [{err}]')
     except ValueError:
@@ -0,0 +1,41 @@
+from collections.abc import Iterable
+
+from errors import DataFileError
+from math_analyser.get_initial_data import (BIN_FILE_HEADER, BIN_FILE_MAGIC,
+                                            iter_data_from_json_file,
+                                            iter_data_from_txt_file,
+                                            iter_data_from_xml_file)
+from math_analyser.interval_set import to_interval_set
+
+TEXT_DATA_READERS = {'JSON': iter_data_from_json_file,
+                     'TXT': iter_data_from_txt_file,
+                     'XML': iter_data_from_xml_file}
+
+
+def convert_data_file_to_bin(data_file: str, data_format: str, bin_file: str) -> int:
+    """Converts JSON / TXT / XML data file to BIN data file, the math sets are parsed and validated once
+    and are read later without parsing. The math sets are converted one by one while the data file is read.
+    Returns the number of the converted math sets."""
+    data_format = data_format.upper()
+    if data_format not in TEXT_DATA_READERS:
+        raise DataFileError(f'format {data_format} cannot be converted, JSON / TXT / XML expected')
+    try:
+        with open(data_file) as file_to_read:
+            return write_bin_data_file(TEXT_DATA_READERS[data_format](file_to_read), bin_file)
+    except Exception as err:
+        err.add_note('Data File Converting Error')
+        raise
+
+
+def write_bin_data_file(ini_math_sets: Iterable, bin_file: str) -> int:
+    """Writes the math sets to BIN data file: the header (magic bytes and number of math sets)
+    followed by the math sets packed by IntervalSet.to_bytes(). Returns the number of the written math sets."""
+    math_sets_number = 0
+    with open(bin_file, 'wb') as file_to_write:
+        file_to_write.write(BIN_FILE_HEADER.pack(BIN_FILE_MAGIC, math_sets_number))
+        for math_set in ini_math_sets:
+            file_to_write.write(to_interval_set(math_set).to_bytes())
+            math_sets_number += 1
+        file_to_write.seek(0)
+        file_to_write.write(BIN_FILE_HEADER.pack(BIN_FILE_MAGIC, math_sets_number))
+    return math_sets_number
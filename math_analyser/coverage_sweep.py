@@ -0,0 +1,169 @@
+from errors import DataFileError
+from math_analyser.interval_set import (INT_END_FLAG, INT_START_FLAG, INTERVAL_NOTATION_FLAG, OPEN_END_FLAG,
+                                        OPEN_START_FLAG, POINT_FLAG, IntervalSet, to_interval_set)
+from math_analyser.sweep_line import merge_math_ranges
+
+COVERAGE_MODES = ('INTS', 'UNION', 'COMPL', 'DIFF', 'COVER', 'DEPTH')
+
+
+def determine_coverage_by_sweep_line(ini_math_sets: list, analysis_modes: tuple, cover_k: int = 1) -> dict:
+    """Determines the results of the given analysis modes in a single sweep over the sorted endpoints
+    of the initial math sets. The coverage (the number of math sets covering the endpoint or the math range
+    between two neighbouring endpoints) is counted for all math sets and for the first math set.
+    The analysis modes:
+        INTS    the intersection of all math sets, the same as determine_intersection_by_sweep_line()
+        UNION   the union of all math sets
+        COMPL   the complement of the union (the gaps between the math sets and the infinite parts of the line)
+        DIFF    the difference of the first math set and the union of the other math sets
+        COVER   the math ranges covered by at least cover_k math sets
+        DEPTH   the coverage depth of the whole number line: list of pairs (math range or math point, depth),
+                the neighbouring math ranges and endpoints of the same depth are joined
+    The results of UNION, COMPL, DIFF and COVER modes are the largest math ranges, the math range of the complement
+    and of the difference does not include its endpoints if they belong to the removed math sets,
+    so the math ranges of COMPL, DIFF and DEPTH modes are written in the interval notation ([0, 5), see Interval).
+    Returns the dictionary {analysis mode: IntervalSet with sorted math sub ranges (list for DEPTH mode)}.
+    All results are determined in O(N log N) for N endpoints, the sorting of the endpoints is the longest part.
+    If there are no math sets, DataFileError is raised."""
+    if not ini_math_sets:
+        raise DataFileError('No data in file')
+    all_endpoints = set()
+    int_endpoints = set()
+    range_starts = dict()
+    range_ends = dict()
+    first_set_ranges = list()
+    for set_index, math_set in enumerate(ini_math_sets):
+        merged_ranges = merge_math_ranges(to_interval_set(math_set), all_endpoints, int_endpoints)
+        if set_index == 0:
+            first_set_ranges = merged_ranges
+        for start, end in merged_ranges:
+            range_starts[start] = range_starts.get(start, 0) + 1
+            range_ends[end] = range_ends.get(end, 0) + 1
+    sets_number = len(ini_math_sets)
+    first_starts = {start: 1 for start, end in first_set_ranges}
+    first_ends = {end: 1 for start, end in first_set_ranges}
+
+    unit_rules = {'UNION': lambda coverage, first_coverage: coverage > 0,
+                  'COMPL': lambda coverage, first_coverage: coverage == 0,
+                  'DIFF': lambda coverage, first_coverage: first_coverage > 0 and coverage == first_coverage,
+                  'COVER': lambda coverage, first_coverage: coverage >= cover_k}
+    merged_modes = [analysis_mode for analysis_mode in analysis_modes if analysis_mode in unit_rules]
+    results = {analysis_mode: IntervalSet() for analysis_mode in analysis_modes}
+    runs = {analysis_mode: MergedRun(results[analysis_mode], int_endpoints, analysis_mode in ('COMPL', 'DIFF'))
+            for analysis_mode in merged_modes}
+    depth_run = DepthRun(int_endpoints) if 'DEPTH' in analysis_modes else None
+
+    endpoints = sorted(all_endpoints)
+    if endpoints and endpoints[0] != float('-inf'):
+        for analysis_mode in merged_modes:
+            runs[analysis_mode].add_unit(float('-inf'), endpoints[0], False, unit_rules[analysis_mode](0, 0))
+        if depth_run is not None:
+            depth_run.add_unit(float('-inf'), endpoints[0], False, 0)
+
+    previous_range_added = False
+    range_coverage = first_range_coverage = 0
+    for index, endpoint in enumerate(endpoints):
+        point_coverage = range_coverage + range_starts.get(endpoint, 0)
+        range_coverage = point_coverage - range_ends.get(endpoint, 0)
+        first_point_coverage = first_range_coverage + first_starts.get(endpoint, 0)
+        first_range_coverage = first_point_coverage - first_ends.get(endpoint, 0)
+        next_endpoint = endpoints[index + 1] if index < len(endpoints) - 1 else float('inf')
+
+        if 'INTS' in results:
+            range_added = range_coverage == sets_number and index < len(endpoints) - 1
+            start_flag = INT_START_FLAG if endpoint in int_endpoints else 0
+            if point_coverage == sets_number and not previous_range_added and not range_added:
+                results['INTS'].append(endpoint, endpoint,
+                                       POINT_FLAG | start_flag | (INT_END_FLAG if start_flag else 0))
+            if range_added:
+                results['INTS'].append(endpoint, next_endpoint,
+                                       start_flag | (INT_END_FLAG if next_endpoint in int_endpoints else 0))
+            previous_range_added = range_added
+
+        for analysis_mode in merged_modes:
+            unit_rule, run = unit_rules[analysis_mode], runs[analysis_mode]
+            run.add_unit(endpoint, endpoint, True, unit_rule(point_coverage, first_point_coverage))
+            if endpoint != float('inf'):
+                run.add_unit(endpoint, next_endpoint, False, unit_rule(range_coverage, first_range_coverage))
+        if depth_run is not None:
+            depth_run.add_unit(endpoint, endpoint, True, point_coverage)
+            if endpoint != float('inf'):
+                depth_run.add_unit(endpoint, next_endpoint, False, range_coverage)
+
+    for run in runs.values():
+        run.close()
+    if depth_run is not None:
+        results['DEPTH'] = depth_run.get_depths()
+    return results
+
+
+class MergedRun:
+    __slots__ = ['math_result', 'int_endpoints', 'interval_notation', 'run_start', 'run_end', 'single_point',
+                 'open_start', 'open_end']
+
+    def __init__(self, math_result: IntervalSet, int_endpoints: set, interval_notation: bool = False):
+        """Creates an object of the MergedRun class, it joins the neighbouring units (endpoints and math ranges
+        between them) included in the result into the largest math ranges of the result.
+        The run that starts (ends) with the math range unit does not include its start (end) endpoint,
+        it is marked by the open flags, the math ranges are written in the interval notation if it is given."""
+        self.math_result = math_result
+        self.int_endpoints = int_endpoints
+        self.interval_notation = interval_notation
+        self.run_start = None
+        self.run_end = None
+        self.single_point = False
+        self.open_start = self.open_end = False
+
+    def add_unit(self, unit_start: float, unit_end: float, is_point: bool, is_included: bool) -> None:
+        """Adds the next unit to the current run if it is included in the result, otherwise closes the run."""
+        if not is_included:
+            self.close()
+        elif self.run_start is None:
+            self.run_start, self.run_end, self.single_point = unit_start, unit_end, is_point
+            self.open_start = self.open_end = not is_point
+        else:
+            self.run_end, self.single_point, self.open_end = unit_end, False, not is_point
+
+    def close(self) -> None:
+        """Appends the current run to the result as the math point or the math range."""
+        if self.run_start is None:
+            return
+        start_flag = INT_START_FLAG if self.run_start in self.int_endpoints else 0
+        if self.single_point:
+            self.math_result.append(self.run_start, self.run_start,
+                                    POINT_FLAG | start_flag | (INT_END_FLAG if start_flag else 0))
+        else:
+            self.math_result.append(self.run_start, self.run_end,
+                                    start_flag | (INT_END_FLAG if self.run_end in self.int_endpoints else 0)
+                                    | (OPEN_START_FLAG if self.open_start else 0)
+                                    | (OPEN_END_FLAG if self.open_end else 0)
+                                    | (INTERVAL_NOTATION_FLAG if self.interval_notation else 0))
+        self.run_start = self.run_end = None
+
+
+class DepthRun(MergedRun):
+    __slots__ = ['run_depth', 'depths']
+
+    def __init__(self, int_endpoints: set):
+        """Creates an object of the DepthRun class, it joins the neighbouring units of the same coverage depth
+        into the largest math ranges and keeps the depth of every math range."""
+        super().__init__(IntervalSet(), int_endpoints, True)
+        self.run_depth = None
+        self.depths = list()
+
+    def add_unit(self, unit_start: float, unit_end: float, is_point: bool, depth: int) -> None:
+        """Adds the next unit to the current run if it has the same depth, otherwise starts the new run."""
+        if depth != self.run_depth:
+            self.close()
+            self.run_depth = depth
+        super().add_unit(unit_start, unit_end, is_point, True)
+
+    def close(self) -> None:
+        """Appends the current run and its depth to the result."""
+        if self.run_start is not None:
+            self.depths.append(self.run_depth)
+        super().close()
+
+    def get_depths(self) -> list:
+        """Closes the current run and returns the list of pairs (math range or math point, coverage depth)."""
+        self.close()
+        return list(zip(self.math_result.iter_math_ranges(), self.depths))
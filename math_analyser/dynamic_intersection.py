@@ -0,0 +1,222 @@
+from collections.abc import Iterable, Iterator
+from random import random
+
+from math_analyser.interval_set import INT_END_FLAG, INT_START_FLAG, POINT_FLAG, IntervalSet, to_interval_set
+from math_analyser.sweep_line import merge_math_ranges
+
+POINT_UNIT = 0
+RANGE_UNIT = 1
+
+
+class DynamicIntersection:
+    __slots__ = ['root', 'endpoint_counts', 'int_endpoint_counts', 'active_sets', 'next_set_id']
+
+    def __init__(self, coordinates: Iterable = ()):
+        """Creates an object of the DynamicIntersection class, the intersection of the math sets
+        that are added and removed one by one without the full recalculation.
+        The known endpoints split the number line into units: every endpoint and the math range after it
+        (up to the next endpoint). The units are kept in the treap ordered by (endpoint, POINT_UNIT / RANGE_UNIT),
+        every node keeps how many math sets cover its unit, the unit belongs to the intersection
+        if it is covered by all math sets.
+        Adding or removing the math set costs O(log n) expected per its endpoint: the new endpoint splits
+        the math range unit it falls into, and the endpoint of no added math set is removed with its units.
+        The given coordinates are added as the known endpoints in advance."""
+        self.root = None
+        self.endpoint_counts = dict()
+        self.int_endpoint_counts = dict()
+        self.active_sets = dict()
+        self.next_set_id = 0
+        for coordinate in coordinates:
+            self.insert_endpoint(coordinate)
+
+    def add_set(self, math_set: IntervalSet | list) -> int:
+        """Adds the math set to the intersection and returns its id for remove_set()."""
+        endpoints, int_endpoints = set(), set()
+        merged_ranges = merge_math_ranges(to_interval_set(math_set), endpoints, int_endpoints)
+        set_id = self.next_set_id
+        self.next_set_id += 1
+        self.active_sets[set_id] = (merged_ranges, endpoints, int_endpoints)
+        for endpoint in endpoints:
+            self.insert_endpoint(endpoint)
+            self.endpoint_counts[endpoint] += 1
+        for endpoint in int_endpoints:
+            self.int_endpoint_counts[endpoint] = self.int_endpoint_counts.get(endpoint, 0) + 1
+        for start, end in merged_ranges:
+            self.add_to_units(start, end, 1)
+        return set_id
+
+    def remove_set(self, set_id: int) -> None:
+        """Removes the math set with the given id from the intersection, KeyError is raised if it is not added.
+        The endpoints of no other added math set are removed from the treap, so it does not grow under churn."""
+        merged_ranges, endpoints, int_endpoints = self.active_sets.pop(set_id)
+        for start, end in merged_ranges:
+            self.add_to_units(start, end, -1)
+        for endpoint in int_endpoints:
+            self.int_endpoint_counts[endpoint] -= 1
+            if not self.int_endpoint_counts[endpoint]:
+                del self.int_endpoint_counts[endpoint]
+        for endpoint in endpoints:
+            self.endpoint_counts[endpoint] -= 1
+            if not self.endpoint_counts[endpoint]:
+                self.delete_endpoint(endpoint)
+
+    def current_intersection(self) -> IntervalSet:
+        """Returns IntervalSet with sorted math sub ranges of the current intersection,
+        it is the same as determine_intersection_by_sweep_line() of the added math sets.
+        Only the units covered by all math sets are visited, the math ranges are split by the endpoints
+        of the added math sets only."""
+        math_intersection = IntervalSet()
+        run_start = range_start = None
+        range_covered = False
+        for unit in iter_covered_units(self.root, len(self.active_sets)):
+            if unit is None:
+                range_covered = False
+                continue
+            endpoint, unit_type = unit
+            if unit_type == RANGE_UNIT:
+                range_covered = True
+                continue
+            if not range_covered:
+                self.append_single_point(math_intersection, run_start, range_start)
+                run_start = range_start = endpoint
+            elif self.endpoint_counts[endpoint]:
+                math_intersection.append(range_start, endpoint,
+                                         (INT_START_FLAG if range_start in self.int_endpoint_counts else 0)
+                                         | (INT_END_FLAG if endpoint in self.int_endpoint_counts else 0))
+                range_start = endpoint
+            range_covered = False
+        self.append_single_point(math_intersection, run_start, range_start)
+        return math_intersection
+
+    def __len__(self) -> int:
+        return len(self.active_sets)
+
+    def insert_endpoint(self, endpoint: float) -> None:
+        """Adds the endpoint to the treap if it is unknown: the math range unit it falls into is split
+        into the math range before the endpoint, the endpoint and the math range after it,
+        the new units are covered by the same math sets."""
+        if endpoint in self.endpoint_counts:
+            return
+        self.endpoint_counts[endpoint] = 0
+        before, after = split_units(self.root, (endpoint, POINT_UNIT))
+        coverage = get_last_coverage(before)
+        self.root = merge_units(merge_units(before, CoverageNode((endpoint, POINT_UNIT), coverage)),
+                                merge_units(CoverageNode((endpoint, RANGE_UNIT), coverage), after))
+
+    def delete_endpoint(self, endpoint: float) -> None:
+        """Removes the endpoint of no added math set and its units from the treap,
+        the math ranges before and after it are covered by the same math sets, so they are joined."""
+        del self.endpoint_counts[endpoint]
+        before, rest = split_units(self.root, (endpoint, POINT_UNIT))
+        endpoint_units, after = split_units(rest, (endpoint, RANGE_UNIT + 1))
+        self.root = merge_units(before, after)
+
+    def add_to_units(self, start: float, end: float, value: int) -> None:
+        """Adds the value (1 or -1) to the coverage of the units from the start endpoint to the end endpoint."""
+        before, rest = split_units(self.root, (start, POINT_UNIT))
+        covered_units, after = split_units(rest, (end, RANGE_UNIT))
+        covered_units.add_coverage(value)
+        self.root = merge_units(merge_units(before, covered_units), after)
+
+    def append_single_point(self, math_intersection: IntervalSet, run_start: float, range_start: float) -> None:
+        """Appends the run of the covered units to the intersection as the math point,
+        if no math range of the run is appended (the run is a single endpoint)."""
+        if run_start is not None and run_start == range_start:
+            math_intersection.append(run_start, run_start,
+                                     POINT_FLAG | (INT_START_FLAG | INT_END_FLAG
+                                                   if run_start in self.int_endpoint_counts else 0))
+
+
+class CoverageNode:
+    __slots__ = ['unit', 'priority', 'left', 'right', 'coverage', 'max_coverage', 'pending_add']
+
+    def __init__(self, unit: tuple, coverage: int):
+        """Creates an object of the CoverageNode class, the node of the treap of units.
+        The coverage of the node and the maximum coverage of its subtree include all added values,
+        the value added to the whole subtree is kept in pending_add until it is pushed to the children."""
+        self.unit = unit
+        self.priority = random()
+        self.left = None
+        self.right = None
+        self.coverage = coverage
+        self.max_coverage = coverage
+        self.pending_add = 0
+
+    def add_coverage(self, value: int) -> None:
+        """Adds the value to the coverage of every unit of the subtree."""
+        self.coverage += value
+        self.max_coverage += value
+        self.pending_add += value
+
+    def push(self) -> None:
+        """Pushes the value added to the whole subtree to the children."""
+        if self.pending_add:
+            if self.left is not None:
+                self.left.add_coverage(self.pending_add)
+            if self.right is not None:
+                self.right.add_coverage(self.pending_add)
+            self.pending_add = 0
+
+    def update(self) -> None:
+        """Recalculates the maximum coverage of the subtree after its children are changed."""
+        self.max_coverage = self.coverage
+        if self.left is not None and self.left.max_coverage > self.max_coverage:
+            self.max_coverage = self.left.max_coverage
+        if self.right is not None and self.right.max_coverage > self.max_coverage:
+            self.max_coverage = self.right.max_coverage
+
+
+def split_units(node: CoverageNode, unit: tuple) -> tuple:
+    """Splits the treap into the treaps of the units before the given unit and of the rest units."""
+    if node is None:
+        return None, None
+    node.push()
+    if node.unit < unit:
+        node.right, after = split_units(node.right, unit)
+        node.update()
+        return node, after
+    before, node.left = split_units(node.left, unit)
+    node.update()
+    return before, node
+
+
+def merge_units(before: CoverageNode, after: CoverageNode) -> CoverageNode:
+    """Merges two treaps, all units of the first one are before the units of the second one."""
+    if before is None:
+        return after
+    if after is None:
+        return before
+    if before.priority > after.priority:
+        before.push()
+        before.right = merge_units(before.right, after)
+        before.update()
+        return before
+    after.push()
+    after.left = merge_units(before, after.left)
+    after.update()
+    return after
+
+
+def get_last_coverage(node: CoverageNode) -> int:
+    """Returns the coverage of the last unit of the treap, 0 if the treap is empty.
+    The last unit is the math range after the last endpoint, nothing covers it if it is after all endpoints."""
+    coverage = 0
+    while node is not None:
+        node.push()
+        coverage = node.coverage
+        node = node.right
+    return coverage
+
+
+def iter_covered_units(node: CoverageNode, coverage: int) -> Iterator:
+    """Yields the sorted units covered by the given number of math sets, None is yielded instead of
+    the units covered by fewer math sets (every subtree with a smaller maximum coverage is skipped at once)."""
+    if node is None or not coverage:
+        return
+    if node.max_coverage < coverage:
+        yield None
+        return
+    node.push()
+    yield from iter_covered_units(node.left, coverage)
+    yield node.unit if node.coverage >= coverage else None
+    yield from iter_covered_units(node.right, coverage)
@@ -0,0 +1,163 @@
+from collections.abc import Iterable, Iterator
+from heapq import merge as heapq_merge
+from itertools import islice
+from os import remove as remove_file
+from struct import Struct
+from tempfile import NamedTemporaryFile
+from tracemalloc import get_traced_memory, is_tracing
+from tracemalloc import start as start_tracing
+from tracemalloc import stop as stop_tracing
+
+from errors import DataFileError
+from math_analyser.interval_set import INT_END_FLAG, INT_START_FLAG, POINT_FLAG, IntervalSet
+from math_analyser.sweep_line import merge_math_ranges
+
+ENDPOINT_EVENT = Struct('<dB')
+RANGE_START_EVENT = 1
+RANGE_END_EVENT = 2
+INT_ENDPOINT_EVENT = 4
+EVENT_MEMORY_SIZE = 128  # the event tuple, its float and its place in the list of the run
+MAX_MERGED_RUNS = 128
+RUN_READ_SIZE = 2 ** 16
+
+
+def determine_intersection_in_external_memory(ini_math_sets: Iterable, memory_limit: int,
+                                              temp_dir: str = None) -> IntervalSet:
+    """Determines the intersection of the initial math sets that do not fit in memory together.
+    The math sets are taken one by one (for example, from iter_initial_math_sets()), the endpoint events
+    of every math set (range starts, range ends and all its endpoints) are collected in memory
+    until they take about memory_limit bytes, then they are sorted and spilled to a temporary file (run).
+    The runs are merged by the k-way merge (at most MAX_MERGED_RUNS at once) and the merged stream is swept
+    the same way as in determine_intersection_by_sweep_line(), so only the events of one run are kept in memory.
+    The result is the same as the one of determine_intersection_by_sweep_line().
+    Returns IntervalSet with sorted math sub ranges, it is empty if there is no intersection."""
+    run_events_limit = max(1, memory_limit // EVENT_MEMORY_SIZE)
+    run_files = list()
+    sets_number = 0
+    try:
+        run_events = list()
+        for math_set in ini_math_sets:
+            sets_number += 1
+            run_events.extend(get_endpoint_events(math_set))
+            if len(run_events) >= run_events_limit:
+                run_files.append(spill_run(run_events, temp_dir))
+                run_events = list()
+        if sets_number == 0:
+            raise DataFileError('No data in file')
+        run_events.sort()
+
+        while len(run_files) > MAX_MERGED_RUNS:
+            merged_runs = run_files[:MAX_MERGED_RUNS]
+            run_files = run_files[MAX_MERGED_RUNS:]
+            run_files.append(merge_runs(merged_runs, temp_dir))
+        return sweep_endpoint_events(heapq_merge(iter(run_events), *map(iter_run, run_files)), sets_number)
+    finally:
+        for run_file in run_files:
+            remove_file(run_file)
+
+
+def get_endpoint_events(math_set: IntervalSet) -> list:
+    """Returns the list of endpoint events of the math set: (endpoint, event flags) for every its endpoint.
+    The merged math ranges of one math set are disjoint,
+    so every endpoint starts and ends one math range at most."""
+    endpoints, int_endpoints = set(), set()
+    merged_ranges = merge_math_ranges(math_set, endpoints, int_endpoints)
+    endpoint_events = dict.fromkeys(endpoints, 0)
+    for endpoint in int_endpoints:
+        endpoint_events[endpoint] = INT_ENDPOINT_EVENT
+    for start, end in merged_ranges:
+        endpoint_events[start] |= RANGE_START_EVENT
+        endpoint_events[end] |= RANGE_END_EVENT
+    return list(endpoint_events.items())
+
+
+def spill_run(run_events: list, temp_dir: str = None) -> str:
+    """Sorts the endpoint events and writes them to the temporary file, returns its path."""
+    run_events.sort()
+    return write_run(run_events, temp_dir)
+
+
+def write_run(run_events: Iterable, temp_dir: str = None) -> str:
+    """Writes the sorted endpoint events to the temporary file, returns its path."""
+    with NamedTemporaryFile('wb', suffix='.run', dir=temp_dir, delete=False) as run_file:
+        run_events = iter(run_events)
+        while events_chunk := list(islice(run_events, RUN_READ_SIZE // ENDPOINT_EVENT.size)):
+            run_file.write(b''.join(ENDPOINT_EVENT.pack(*endpoint_event) for endpoint_event in events_chunk))
+    return run_file.name
+
+
+def merge_runs(run_files: list, temp_dir: str = None) -> str:
+    """Merges the runs into one run and removes them, returns the path of the merged run."""
+    try:
+        return write_run(heapq_merge(*map(iter_run, run_files)), temp_dir)
+    finally:
+        for run_file in run_files:
+            remove_file(run_file)
+
+
+def iter_run(run_file: str) -> Iterator:
+    """Yields the endpoint events of the run, the run file is read by blocks."""
+    with open(run_file, 'rb') as file_to_read:
+        while events_block := file_to_read.read(RUN_READ_SIZE - RUN_READ_SIZE % ENDPOINT_EVENT.size):
+            yield from ENDPOINT_EVENT.iter_unpack(events_block)
+
+
+def sweep_endpoint_events(endpoint_events: Iterable, sets_number: int) -> IntervalSet:
+    """Sweeps the sorted endpoint events and returns math sub ranges covered by all math sets.
+    The events of the same endpoint are grouped, the math range after the endpoint is added
+    when the next endpoint is known, so only two endpoints are kept at once (see sweep_endpoints()).
+    Nothing is covered after the last endpoint, so the math range is never left open."""
+    math_intersection = IntervalSet()
+    previous_range_added = False
+    pending_start = None
+    for endpoint, point_coverage, range_coverage, is_int in iter_endpoint_coverage(endpoint_events):
+        start_flag = INT_START_FLAG if is_int else 0
+        if pending_start is not None:
+            math_intersection.append(pending_start[0], endpoint, pending_start[1] | (INT_END_FLAG if is_int else 0))
+            pending_start = None
+
+        range_added = range_coverage == sets_number
+        if point_coverage == sets_number and not previous_range_added and not range_added:
+            math_intersection.append(endpoint, endpoint,
+                                     POINT_FLAG | start_flag | (INT_END_FLAG if start_flag else 0))
+        if range_added:
+            pending_start = (endpoint, start_flag)
+        previous_range_added = range_added
+    return math_intersection
+
+
+def iter_endpoint_coverage(endpoint_events: Iterable) -> Iterator:
+    """Yields (endpoint, coverage of the endpoint, coverage of the range after it, endpoint is "int")
+    for every distinct endpoint of the sorted endpoint events."""
+    range_coverage = 0
+    current_endpoint = None
+    range_starts = range_ends = int_events = 0
+    for endpoint, event_flags in endpoint_events:
+        if endpoint != current_endpoint:
+            if current_endpoint is not None:
+                point_coverage = range_coverage + range_starts
+                range_coverage = point_coverage - range_ends
+                yield current_endpoint, point_coverage, range_coverage, int_events
+            current_endpoint = endpoint
+            range_starts = range_ends = int_events = 0
+        range_starts += event_flags & RANGE_START_EVENT
+        range_ends += (event_flags & RANGE_END_EVENT) >> 1
+        int_events |= event_flags & INT_ENDPOINT_EVENT
+    if current_endpoint is not None:
+        point_coverage = range_coverage + range_starts
+        yield current_endpoint, point_coverage, point_coverage - range_ends, int_events
+
+
+def trace_peak_memory(determine_intersection: 'Callable object', *args) -> tuple:
+    """Returns the result of the function and the peak of the memory allocated while it runs
+    (traced by tracemalloc)."""
+    was_tracing = is_tracing()
+    if not was_tracing:
+        start_tracing()
+    try:
+        memory_before = get_traced_memory()[0]
+        result = determine_intersection(*args)
+        return result, get_traced_memory()[1] - memory_before
+    finally:
+        if not was_tracing:
+            stop_tracing()
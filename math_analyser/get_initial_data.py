@@ -1,26 +1,49 @@
-from json import load as json_load
+from array import array
+from collections.abc import Iterator
+from json import JSONDecodeError, JSONDecoder
+from math import isfinite
+from mmap import ACCESS_READ, mmap
+from re import compile as re_compile
+from struct import Struct
 
-from bs4 import BeautifulSoup
+from lxml.etree import XMLSyntaxError, iterparse
 
 from errors import DataFileError
+from math_analyser.interval_set import SERIALIZATION_HEADER, IntervalSet
+from math_analyser.math_set_parser import parse_math_set
+
+JSON_WHITESPACE_PATTERN = re_compile(r'[ \t\n\r]*')
+JSON_DELIMITERS = (' ', '\t', '\n', '\r', ',', ']')
+
+BIN_FILE_HEADER = Struct('<4sQ')
+BIN_FILE_MAGIC = b'MSAB'
+PACKED_SUBRANGE_SIZE = 17  # float64 start, float64 end and uint8 flags
 
 
 def get_initial_math_sets(config_data: 'ConfigData object') -> list:
-    """Defines type of the data file and returns the initial data as the list of objects MathSet class.
+    """Defines type of the data file and returns the initial data as the list of objects IntervalSet class.
     If the data is invalid or cannot be determined, a DataGettingError is raised."""
-    data_file_path = config_data.get_data_file()
-    data_format = config_data.get_data_format()
+    return read_initial_math_sets(config_data.get_data_file(), config_data.get_data_format())
+
+
+def read_initial_math_sets(data_file_path: str, data_format: str) -> list:
+    """Returns the initial data of the data file of the given format (JSON / TXT / XML / BIN)
+    as the list of objects IntervalSet class, the same as get_initial_math_sets()."""
     try:
-        with open(data_file_path) as file_to_read:
+        with open(data_file_path, 'rb' if data_format == 'BIN' else 'r') as file_to_read:
             if data_format == 'JSON':
                 ini_math_sets = get_data_from_json_file(file_to_read)
             elif data_format == 'TXT':
                 ini_math_sets = get_data_from_txt_file(file_to_read)
             elif data_format == 'XML':
                 ini_math_sets = get_data_from_xml_file(file_to_read)
+            elif data_format == 'BIN':
+                ini_math_sets = get_data_from_bin_file(file_to_read)
             else:
                 assert False, ('Internal error! define_data_source_and_get_data()'
-                               '\ndata_format not JSON / TXT / XML')
+                               '\ndata_format not JSON / TXT / XML / BIN')
+        if not ini_math_sets:
+            raise DataFileError('No data in file')
     except Exception as err:
         err.add_note('Initial Data Getting Error')
         raise
@@ -28,79 +51,270 @@ def get_initial_math_sets(config_data: 'ConfigData object') -> list:
         return ini_math_sets
 
 
+def iter_initial_math_sets(config_data: 'ConfigData object') -> Iterator[IntervalSet]:
+    """Defines type of the data file and yields the initial math sets one by one while the data file is read,
+    so the whole data is never kept in memory. The data file is closed when the generator is closed.
+    If the data is invalid or cannot be determined, a DataGettingError is raised,
+    DataFileError is raised at the end of the data file if it contains no math sets."""
+    data_file_path = config_data.get_data_file()
+    data_format = config_data.get_data_format()
+    try:
+        with open(data_file_path, 'rb' if data_format == 'BIN' else 'r') as file_to_read:
+            if data_format == 'JSON':
+                ini_math_sets = iter_data_from_json_file(file_to_read)
+            elif data_format == 'TXT':
+                ini_math_sets = iter_data_from_txt_file(file_to_read)
+            elif data_format == 'XML':
+                ini_math_sets = iter_data_from_xml_file(file_to_read)
+            elif data_format == 'BIN':
+                ini_math_sets = iter_data_from_bin_file(file_to_read)
+            else:
+                assert False, ('Internal error! iter_initial_math_sets()'
+                               '\ndata_format not JSON / TXT / XML / BIN')
+            math_set = None
+            for math_set in ini_math_sets:
+                yield math_set
+            if math_set is None:
+                raise DataFileError('No data in file')
+    except Exception as err:
+        err.add_note('Initial Data Getting Error')
+        raise
+
+
 def get_data_from_json_file(input_data: '_io.TextIOWrapper object') -> list:
     """Returns initial math sets from JSON file."""
-    ini_math_sets = list()
-    for math_ranges in json_load(input_data):
-        math_ranges = eval(math_ranges)
-        verify_ini_math_sets(math_ranges)
-        ini_math_sets.append(math_ranges)
-    return ini_math_sets
+    return list(iter_data_from_json_file(input_data))
+
+
+def iter_data_from_json_file(input_data: '_io.TextIOWrapper object') -> Iterator[IntervalSet]:
+    """Yields initial math sets from JSON file as soon as every element of the JSON array is read."""
+    for element_number, math_ranges in enumerate(iter_json_array(input_data), 1):
+        yield parse_math_set_with_location(math_ranges, f'Element {element_number} of the JSON array')
+
+
+def iter_json_array(input_data: '_io.TextIOWrapper object', chunk_size: int = 2 ** 16) -> Iterator:
+    """Yields elements of the JSON array one by one while the file is read by chunks of the given size,
+    so only the current chunk and the current element are kept in memory.
+    If the element does not fit into the buffer, the size of every next chunk is doubled until it fits,
+    so the large element is decoded again only O(log n) times and the reading stays linear.
+    If the file does not contain a valid JSON array, DataFileError is raised."""
+    decoder = JSONDecoder()
+    buffer = ''
+    position = 0
+
+    def read_chunk(read_size: int = chunk_size) -> bool:
+        """Drops the processed part of the buffer and adds the next chunk, returns False at the end of the file.
+        The buffer is not changed at the end of the file, so the offsets in it stay valid."""
+        nonlocal buffer, position
+        chunk = input_data.read(read_size)
+        if not chunk:
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def get_next_char() -> str:
+        """Skips whitespaces and returns the next character of the file, an empty string at the end of the file."""
+        nonlocal position
+        while True:
+            position = JSON_WHITESPACE_PATTERN.match(buffer, position).end()
+            if position < len(buffer):
+                return buffer[position]
+            if not read_chunk():
+                return ''
+
+    if get_next_char() != '[':
+        raise DataFileError('must contain a JSON array')
+    position += 1
+    if get_next_char() == ']':
+        return
+
+    while True:
+        get_next_char()
+        read_size = chunk_size
+        while True:
+            try:
+                element, element_end = decoder.raw_decode(buffer, position)
+            except JSONDecodeError as err:
+                if read_chunk(read_size):
+                    read_size *= 2
+                    continue
+                raise DataFileError(f'contains invalid JSON: {err}')
+            next_char = buffer[element_end:element_end + 1]
+            if next_char in JSON_DELIMITERS:
+                break
+            if read_chunk(read_size):
+                read_size *= 2
+                continue
+            if next_char:
+                raise DataFileError(f'contains invalid JSON: "," or "]" expected, got "{next_char}"')
+            break
+        position = element_end
+        yield element
+
+        separator = get_next_char()
+        if separator == ']':
+            position += 1
+            if get_next_char():
+                raise DataFileError('contains invalid JSON: extra data after the array')
+            return
+        elif separator != ',':
+            raise DataFileError(f'contains invalid JSON: "," or "]" expected, got "{separator}"')
+        position += 1
 
 
 def get_data_from_txt_file(input_data: '_io.TextIOWrapper object') -> list:
     """Returns initial math sets from TXT file."""
-    ini_math_sets = list()
-    for math_ranges in input_data.readlines():
-        math_ranges = eval(math_ranges)
-        verify_ini_math_sets(math_ranges)
-        ini_math_sets.append(math_ranges)
-    return ini_math_sets
+    return list(iter_data_from_txt_file(input_data))
+
+
+def iter_data_from_txt_file(input_data: '_io.TextIOWrapper object') -> Iterator[IntervalSet]:
+    """Yields initial math sets from TXT file line by line, every line is validated as soon as it is read."""
+    for line_number, math_ranges in enumerate(input_data, 1):
+        yield parse_math_set_with_location(math_ranges, f'Line {line_number} of the TXT file')
 
 
 def get_data_from_xml_file(input_data: '_io.TextIOWrapper object') -> list:
     """Returns initial math sets from XML file."""
-    data_xml = input_data.read()
-    bs_object = BeautifulSoup(data_xml, 'lxml')
-    all_math_ranges = bs_object.find_all('value')
-    ini_math_sets = list()
-    for line in all_math_ranges:
-        math_ranges = line.get_text()
-        math_ranges = eval(math_ranges)
-        verify_ini_math_sets(math_ranges)
-        ini_math_sets.append(math_ranges)
-    return ini_math_sets
-
-
-def verify_ini_math_sets(input_ranges: list) -> None:
-    """Validates input math set. There are two kinds of invalid data.
-    Invalid syntax:
-        - math set is not presented as a "list"
-        - math range not specified as "tuple"
-        - math range does not consist of two endpoints
-        - math point is not specified as "int" or "float"
-
-    Invalid math range:
-        - the presence of any ranges, if ("-inf", "+inf") is given
-        - invalid semi-infinite or numeric math range (start point is not less than the end point)
-    If the check fails, DataGettingError is raised."""
-    if not input_ranges:
+    return list(iter_data_from_xml_file(input_data))
+
+
+def iter_data_from_xml_file(input_data: '_io.TextIOWrapper object') -> Iterator[IntervalSet]:
+    """Yields initial math sets from XML file as soon as every <value> element is parsed,
+    the tag name is not case-sensitive (<VALUE> and <Value> are the same element).
+    Processed elements are removed from the tree, so the memory does not grow with the file size.
+    The XML file must be well-formed (one root element, escaped "&" and "<"), otherwise DataFileError is raised
+    when the invalid part is reached."""
+    value_number = 0
+    xml_events = iterparse(getattr(input_data, 'buffer', input_data), huge_tree=True)
+    while True:
+        try:
+            event, element = next(xml_events)
+        except StopIteration:
+            return
+        except XMLSyntaxError as err:
+            raise DataFileError(f'contains invalid XML: {err}')
+        if not isinstance(element.tag, str) or element.tag.lower() != 'value':
+            continue
+        value_number += 1
+        math_ranges = ''.join(element.itertext())
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+        yield parse_math_set_with_location(math_ranges, f'Value {value_number} of the XML file')
+
+
+def get_data_from_bin_file(input_data: '_io.BufferedReader object', offset: int = 0) -> list:
+    """Returns initial math sets from BIN file."""
+    return list(iter_data_from_bin_file(input_data, offset))
+
+
+def iter_data_from_bin_file(input_data: '_io.BufferedReader object', offset: int = 0) -> Iterator[IntervalSet]:
+    """Yields initial math sets from BIN file created by convert_data_file_to_bin().
+    The file is a header (magic bytes and number of math sets) followed by the math sets
+    packed by IntervalSet.to_bytes().
+    The file is memory-mapped and every math set is copied into its arrays at once, the math sets are not parsed.
+    The BIN data may start at the given offset of the file (for example, after the header of the sidecar cache)."""
+    try:
+        data_map = mmap(input_data.fileno(), 0, access=ACCESS_READ)
+    except ValueError:
         raise DataFileError('No data in file')
 
-    elif not isinstance(input_ranges, list):
-        raise DataFileError(f'Math set is not represented as a list of ranges and points:\n{input_ranges}')
-
-    for subrange in input_ranges:
-        if subrange == (float('-inf'), float('inf')) and len(input_ranges) != 1:
-            raise DataFileError(f'Math set must not contain any ranges if '
-                                f'(float(\'-inf\'), float(\'inf\')) is given:\t{input_ranges}')
-        
-        elif not isinstance(subrange, tuple) and not isinstance(subrange, int) and not isinstance(subrange, float):
-            raise DataFileError(f'Math ranges and math points must be given '
-                                f'as "tuple" and "int"("float"):\n{input_ranges}')
-
-        elif isinstance(subrange, tuple) and len(subrange) != 2:
-            raise DataFileError(f'Math range must contain two endpoints::\n\t{input_ranges}')
-
-        elif isinstance(subrange, tuple):
-            endpoint_1, endpoint_2 = subrange
-            if (endpoint_2 == float('-inf')
-                    or endpoint_1 == float('inf')
-                    or isinstance(endpoint_1, str)
-                    or isinstance(endpoint_2, str)):
-                raise DataFileError(f'Semi-infinite math range must be given as'
-                                    f' (float(\'-inf\'), 12) or (23, float(\'inf\'):\n{input_ranges}')
-
-            elif endpoint_1 >= endpoint_2:
-                raise DataFileError(f'Start point in the math set must be less '
-                                    f'than the end point:\n{input_ranges}')
+    with data_map, memoryview(data_map) as file_view, file_view[offset:] as data_view:
+        if len(data_view) < BIN_FILE_HEADER.size:
+            raise DataFileError('is not a BIN data file')
+        magic, math_sets_number = BIN_FILE_HEADER.unpack_from(data_view)
+        if magic != BIN_FILE_MAGIC:
+            raise DataFileError('is not a BIN data file')
+        if not math_sets_number:
+            raise DataFileError('No data in file')
+
+        offset = BIN_FILE_HEADER.size
+        for set_number in range(1, math_sets_number + 1):
+            math_set, offset = unpack_math_set_with_location(data_view, offset, f'Set {set_number} of the BIN file')
+            yield math_set
+        if offset != len(data_view):
+            raise DataFileError('contains extra data after the last math set')
+
+
+def unpack_math_set_with_location(data_view: memoryview, offset: int, location: str) -> tuple:
+    """Returns the math set packed at the given offset of BIN file and the offset of the next math set,
+    the location in the data file is added to the raised error."""
+    math_set, set_end = None, offset
+    if len(data_view) - offset >= SERIALIZATION_HEADER.size:
+        magic, subranges_number = SERIALIZATION_HEADER.unpack_from(data_view, offset)
+        set_end = offset + SERIALIZATION_HEADER.size + PACKED_SUBRANGE_SIZE * subranges_number
+        with data_view[offset:set_end] as set_view:
+            try:
+                math_set = IntervalSet.from_bytes(set_view)
+            except ValueError:
+                pass
+    if math_set is None:
+        err = DataFileError('contains a damaged math set')
+        err.add_note(location)
+        raise err
+    if not math_set:
+        err = DataFileError('No data in file')
+        err.add_note(location)
+        raise err
+    return math_set, set_end
+
+
+def parse_math_set_with_location(math_ranges: str, location: str) -> IntervalSet:
+    """Returns the parsed and validated math set, the location in the data file is added to the raised error."""
+    try:
+        return parse_math_set(math_ranges)
+    except DataFileError as err:
+        err.add_note(location)
+        raise
+
+
+def get_math_points(config_data: 'ConfigData object') -> array:
+    """Defines type of the file with math points and returns the math points as array('d') in the file order.
+    If the data is invalid, a DataFileError is raised."""
+    points_file_path = config_data.get_points_file()
+    points_format = config_data.get_points_format()
+    try:
+        with open(points_file_path) as file_to_read:
+            if points_format == 'JSON':
+                math_points = get_points_from_json_file(file_to_read)
+            elif points_format == 'TXT':
+                math_points = get_points_from_txt_file(file_to_read)
+            else:
+                assert False, ('Internal error! get_math_points()'
+                               '\npoints_format not JSON / TXT')
+    except Exception as err:
+        err.add_note('Math Points Getting Error')
+        raise
+    else:
+        return math_points
+
+
+def get_points_from_json_file(input_data: '_io.TextIOWrapper object') -> array:
+    """Returns math points from JSON file, the file contains an array of numbers."""
+    math_points = array('d')
+    for math_point in iter_json_array(input_data):
+        if isinstance(math_point, bool) or not isinstance(math_point, int | float):
+            raise DataFileError(f'with math points contains invalid point: {math_point}')
+        math_points.append(verify_math_point(math_point))
+    return math_points
+
+
+def get_points_from_txt_file(input_data: '_io.TextIOWrapper object') -> array:
+    """Returns math points from TXT file, the points are separated by whitespaces or line breaks."""
+    math_points = array('d')
+    for line in input_data:
+        for math_point in line.split():
+            try:
+                math_points.append(verify_math_point(float(math_point)))
+            except ValueError:
+                raise DataFileError(f'with math points contains invalid point: {math_point}')
+    return math_points
+
+
+def verify_math_point(math_point: float) -> float:
+    """Returns the math point if it is a finite number, otherwise DataFileError is raised."""
+    if not isfinite(math_point):
+        raise DataFileError(f'with math points contains invalid point: {math_point}')
+    return math_point
+
@@ -0,0 +1,126 @@
+from hashlib import file_digest, sha256
+from os import makedirs, stat
+from os.path import abspath, basename, dirname, splitext
+from os.path import join as os_path_join
+from struct import Struct
+
+from errors import DataFileError
+from math_analyser.get_initial_data import (BIN_FILE_HEADER, BIN_FILE_MAGIC, get_data_from_bin_file,
+                                            read_initial_math_sets)
+from math_analyser.result_cache import write_atomically
+
+SIDECAR_HEADER = Struct('<4s8sQq32s')  # magic, data format, size, mtime (ns) and SHA-256 of the data file
+SIDECAR_MAGIC = b'MSAS'
+SIDECAR_EXTENSION = '.msas'
+
+
+def get_initial_math_sets_with_sidecar(config_data: 'ConfigData object') -> list:
+    """Returns the initial math sets of the data file, the same as get_initial_math_sets().
+    If the sidecar cache is enabled, the math sets parsed and validated by the previous run
+    are loaded from the sidecar file, otherwise the data file is parsed and the sidecar file is written."""
+    if not config_data.get_sidecar():
+        return read_initial_math_sets(config_data.get_data_file(), config_data.get_data_format())
+    return read_initial_math_sets_with_sidecar(config_data.get_data_file(), config_data.get_data_format(),
+                                               config_data.get_sidecar_dir())
+
+
+def read_initial_math_sets_with_sidecar(data_file: str, data_format: str, sidecar_dir: str = None) -> list:
+    """Returns the initial math sets of the data file, they are loaded from the sidecar file if it is valid.
+    The sidecar file is valid if the size of the data file is the same and either the modification time
+    or SHA-256 hash of the content is the same (the hash is calculated only if the modification time is changed).
+    The sidecar file is BIN data file (see convert_data_file_to_bin()) with the header describing the data file,
+    it is kept next to the data file or in the given directory. BIN data file is read without the sidecar."""
+    if data_format == 'BIN':
+        return read_initial_math_sets(data_file, data_format)
+    sidecar_file = get_sidecar_path(data_file, data_format, sidecar_dir)
+    data_file_stat = stat(data_file)
+    content_hash = None
+    sidecar_header = read_sidecar_header(sidecar_file)
+    if (sidecar_header is not None
+            and sidecar_header[1] == data_format.encode()
+            and sidecar_header[2] == data_file_stat.st_size):
+        if sidecar_header[3] != data_file_stat.st_mtime_ns:
+            content_hash = get_content_hash(data_file)
+        if content_hash is None or content_hash == sidecar_header[4]:
+            ini_math_sets = load_sidecar(sidecar_file)
+            if ini_math_sets is not None:
+                if content_hash is not None:
+                    update_sidecar_header(sidecar_file, data_format, data_file_stat, content_hash)
+                return ini_math_sets
+
+    if content_hash is None:
+        content_hash = get_content_hash(data_file)
+    ini_math_sets = read_initial_math_sets(data_file, data_format)
+    try:
+        store_sidecar(sidecar_file, ini_math_sets, data_format, data_file_stat, content_hash)
+    except OSError:
+        pass
+    return ini_math_sets
+
+
+def get_sidecar_path(data_file: str, data_format: str, sidecar_dir: str = None) -> str:
+    """Returns the path to the sidecar file of the data file: the hidden file next to the data file
+    (the format is added to the name unless it is the extension of the data file: ".data file.json.msas"),
+    or the file named by the hash of the data file path in the sidecar directory."""
+    if sidecar_dir is None:
+        sidecar_name = basename(data_file)
+        if splitext(sidecar_name)[1].lower() != f'.{data_format.lower()}':
+            sidecar_name = f'{sidecar_name}.{data_format.lower()}'
+        return os_path_join(dirname(abspath(data_file)), f'.{sidecar_name}{SIDECAR_EXTENSION}')
+    data_file_hash = sha256(abspath(data_file).encode()).hexdigest()
+    return os_path_join(sidecar_dir, f'{data_file_hash}.{data_format.lower()}{SIDECAR_EXTENSION}')
+
+
+def get_content_hash(data_file: str) -> bytes:
+    """Returns SHA-256 hash of the content of the data file."""
+    with open(data_file, 'rb') as file_to_hash:
+        return file_digest(file_to_hash, 'sha256').digest()
+
+
+def read_sidecar_header(sidecar_file: str) -> tuple | None:
+    """Returns the header of the sidecar file: (magic, data format, size, mtime, hash of the data file),
+    or None if the sidecar file is not found or is not a sidecar file."""
+    try:
+        with open(sidecar_file, 'rb') as file_to_read:
+            sidecar_header = SIDECAR_HEADER.unpack(file_to_read.read(SIDECAR_HEADER.size))
+    except (OSError, ValueError):
+        return None
+    if sidecar_header[0] != SIDECAR_MAGIC:
+        return None
+    return sidecar_header[0], sidecar_header[1].rstrip(b'\0'), *sidecar_header[2:]
+
+
+def load_sidecar(sidecar_file: str) -> list | None:
+    """Returns the math sets of the sidecar file, or None if the sidecar file is damaged."""
+    try:
+        with open(sidecar_file, 'rb') as file_to_read:
+            return get_data_from_bin_file(file_to_read, SIDECAR_HEADER.size)
+    except (OSError, DataFileError):
+        return None
+
+
+def store_sidecar(sidecar_file: str, ini_math_sets: list, data_format: str,
+                  data_file_stat: 'os.stat_result object', content_hash: bytes) -> None:
+    """Writes the math sets to the sidecar file with the header describing the data file.
+    The sidecar file is written atomically (see write_atomically()) and replaces the previous one at once,
+    the directory of the sidecar file is created if it does not exist."""
+    makedirs(dirname(sidecar_file), exist_ok=True)
+    write_atomically(sidecar_file, b''.join([pack_sidecar_header(data_format, data_file_stat, content_hash),
+                                             BIN_FILE_HEADER.pack(BIN_FILE_MAGIC, len(ini_math_sets)),
+                                             *(math_set.to_bytes() for math_set in ini_math_sets)]))
+
+
+def update_sidecar_header(sidecar_file: str, data_format: str,
+                          data_file_stat: 'os.stat_result object', content_hash: bytes) -> None:
+    """Saves the new modification time of the unchanged data file, so its hash is not calculated again."""
+    try:
+        with open(sidecar_file, 'r+b') as file_to_write:
+            file_to_write.write(pack_sidecar_header(data_format, data_file_stat, content_hash))
+    except OSError:
+        pass
+
+
+def pack_sidecar_header(data_format: str, data_file_stat: 'os.stat_result object', content_hash: bytes) -> bytes:
+    """Returns the header of the sidecar file describing the data file."""
+    return SIDECAR_HEADER.pack(SIDECAR_MAGIC, data_format.encode(), data_file_stat.st_size,
+                               data_file_stat.st_mtime_ns, content_hash)
@@ -0,0 +1,123 @@
+from cProfile import Profile
+from collections.abc import Callable
+from contextlib import contextmanager, nullcontext
+from json import dump as json_dump
+from threading import Lock
+from time import perf_counter
+
+from math_analyser.interval_set import POINT_FLAG
+
+NO_SPAN = nullcontext()
+PROFILE_LOCK = Lock()
+
+
+class Instrumentation:
+    __slots__ = ['callback', 'spans', 'counters']
+
+    enabled = True
+
+    def __init__(self, callback: Callable = None):
+        """Creates an object of the Instrumentation class, the collector of the run metrics:
+        timing spans of the stages and counters (math sets, ranges, endpoints, result size).
+        Every finished span and every counted value is also passed to the callback (if it is given)
+        as callback(kind, name, value), the kind is 'span' (the value is seconds) or 'counter'."""
+        self.callback = callback
+        self.spans = list()
+        self.counters = dict()
+
+    def span(self, stage_name: str) -> 'Span object':
+        """Returns the context manager that measures the time of the stage."""
+        return Span(self, stage_name)
+
+    def add_span(self, stage_name: str, seconds: float) -> None:
+        """Saves the time of the finished stage."""
+        self.spans.append((stage_name, seconds))
+        if self.callback is not None:
+            self.callback('span', stage_name, seconds)
+
+    def count(self, counter_name: str, value: int) -> None:
+        """Adds the value to the counter."""
+        self.counters[counter_name] = self.counters.get(counter_name, 0) + value
+        if self.callback is not None:
+            self.callback('counter', counter_name, value)
+
+    def count_math_sets(self, ini_math_sets: list) -> None:
+        """Counts the math sets, their math ranges (math points included) and endpoints."""
+        self.count('sets', len(ini_math_sets))
+        self.count('ranges', sum(len(math_set) for math_set in ini_math_sets))
+        self.count('endpoints', sum(2 * len(math_set) - sum(flags & POINT_FLAG for flags in math_set.flags)
+                                    for math_set in ini_math_sets))
+
+    def get_metrics(self) -> dict:
+        """Returns the metrics of the run: the spans in the order they are finished,
+        the total time of every stage and the counters."""
+        stage_seconds = dict()
+        for stage_name, seconds in self.spans:
+            stage_seconds[stage_name] = stage_seconds.get(stage_name, 0) + seconds
+        return {'spans': [{'stage': stage_name, 'seconds': seconds} for stage_name, seconds in self.spans],
+                'stage_seconds': stage_seconds,
+                'counters': dict(self.counters)}
+
+    def write_metrics(self, metrics_file: str) -> None:
+        """Writes the metrics of the run to JSON file."""
+        with open(metrics_file, 'w') as file_to_write:
+            json_dump(self.get_metrics(), file_to_write, indent=4)
+
+
+class DisabledInstrumentation(Instrumentation):
+    __slots__ = []
+
+    enabled = False
+
+    def __init__(self):
+        """Creates an object of the DisabledInstrumentation class, the instrumentation that collects nothing.
+        Its spans are the same shared empty context manager, so the disabled instrumentation costs one call."""
+        super().__init__()
+
+    def span(self, stage_name: str) -> nullcontext:
+        return NO_SPAN
+
+    def count(self, counter_name: str, value: int) -> None:
+        pass
+
+    def count_math_sets(self, ini_math_sets: list) -> None:
+        pass
+
+
+class Span:
+    __slots__ = ['instrumentation', 'stage_name', 'start_time']
+
+    def __init__(self, instrumentation: Instrumentation, stage_name: str):
+        """Creates an object of the Span class, the context manager that measures the time of the stage."""
+        self.instrumentation = instrumentation
+        self.stage_name = stage_name
+        self.start_time = None
+
+    def __enter__(self) -> 'Span':
+        self.start_time = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.instrumentation.add_span(self.stage_name, perf_counter() - self.start_time)
+
+
+NO_INSTRUMENTATION = DisabledInstrumentation()
+
+
+@contextmanager
+def profile_run(profile_file: str = None):
+    """Returns the context manager that profiles the code inside it with cProfile
+    and dumps the statistics to the given file (it can be read by pstats.Stats).
+    Only one profiler can be active in the process, so the profiled runs of several threads wait for each other.
+    Nothing is profiled if the file is not given."""
+    if profile_file is None:
+        yield
+        return
+    with PROFILE_LOCK:
+        profiler = Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(profile_file)
@@ -0,0 +1,162 @@
+from array import array
+from collections.abc import Iterator
+from struct import Struct
+from sys import byteorder
+
+POINT_FLAG = 1
+INT_START_FLAG = 2
+INT_END_FLAG = 4
+OPEN_START_FLAG = 8
+OPEN_END_FLAG = 16
+INTERVAL_NOTATION_FLAG = 32
+
+SERIALIZATION_HEADER = Struct('<4sQ')
+SERIALIZATION_MAGIC = b'MSAI'
+
+
+class IntervalSet:
+    __slots__ = ['starts', 'ends', 'flags']
+
+    def __init__(self, starts: array = None, ends: array = None, flags: array = None):
+        """Creates an object of the IntervalSet class, a normalized math set sorted by start endpoints.
+        Start and end endpoints are stored in array('d'), the math point is stored as a range with equal endpoints.
+        Flags of every subrange are stored in array('B'):
+            POINT_FLAG      the subrange is a math point
+            INT_START_FLAG  the start endpoint was given as "int"
+            INT_END_FLAG    the end endpoint was given as "int"
+            OPEN_START_FLAG the start endpoint does not belong to the math range
+            OPEN_END_FLAG   the end endpoint does not belong to the math range
+            INTERVAL_NOTATION_FLAG  the math range is written in the interval notation (see Interval)
+        """
+        self.starts = array('d') if starts is None else starts
+        self.ends = array('d') if ends is None else ends
+        self.flags = array('B') if flags is None else flags
+
+    @classmethod
+    def from_math_ranges(cls, math_ranges: list) -> 'IntervalSet':
+        """Returns IntervalSet object with the math ranges and math points of the legacy math set
+        (list of "tuple" ranges and "int"("float") points), [None] is converted to the empty IntervalSet."""
+        subranges = list()
+        for subrange in math_ranges:
+            if isinstance(subrange, tuple):
+                start, end = subrange
+                flags = ((INT_START_FLAG if isinstance(start, int) else 0)
+                         | (INT_END_FLAG if isinstance(end, int) else 0))
+                subranges.append((start, end, flags))
+            elif subrange is not None:
+                flags = POINT_FLAG | (INT_START_FLAG | INT_END_FLAG if isinstance(subrange, int) else 0)
+                subranges.append((subrange, subrange, flags))
+        subranges.sort()
+
+        interval_set = cls()
+        for start, end, flags in subranges:
+            interval_set.append(start, end, flags)
+        return interval_set
+
+    def append(self, start: float, end: float, flags: int) -> None:
+        """Adds the subrange to the end of the math set, the subrange must not start before the last one."""
+        self.starts.append(start)
+        self.ends.append(end)
+        self.flags.append(flags)
+
+    def get_hull(self) -> tuple | None:
+        """Returns the minimum and the maximum endpoints of the math set or None if the math set is empty."""
+        if not self.starts:
+            return None
+        return self.starts[0], max(self.ends)
+
+    def to_list(self) -> list:
+        """Returns the legacy math set: sorted list of "tuple" ranges and "int"("float") points,
+        endpoints given as "int" are converted back. Returns [None] if the math set is empty."""
+        return list(self.iter_math_ranges()) or [None]
+
+    def iter_math_ranges(self) -> Iterator:
+        """Yields "tuple" ranges and "int"("float") points of the legacy math set one by one,
+        the math range with INTERVAL_NOTATION_FLAG is yielded as Interval (it is equal to the "tuple" range)."""
+        for start, end, flags in zip(self.starts, self.ends, self.flags):
+            if flags & INT_START_FLAG:
+                start = int(start)
+            if flags & POINT_FLAG:
+                yield start
+                continue
+            if flags & INT_END_FLAG:
+                end = int(end)
+            if flags & INTERVAL_NOTATION_FLAG:
+                yield Interval(start, end, flags & OPEN_START_FLAG, flags & OPEN_END_FLAG)
+            else:
+                yield start, end
+
+    def to_bytes(self) -> bytes:
+        """Returns the math set packed as a header (magic bytes and number of subranges)
+        followed by little-endian float64 start and end endpoints and uint8 flags."""
+        starts, ends = self.starts, self.ends
+        if byteorder == 'big':
+            starts, ends = array('d', starts), array('d', ends)
+            starts.byteswap()
+            ends.byteswap()
+        return b''.join((SERIALIZATION_HEADER.pack(SERIALIZATION_MAGIC, len(self)),
+                         starts.tobytes(), ends.tobytes(), self.flags.tobytes()))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'IntervalSet':
+        """Returns IntervalSet object unpacked from the data created by IntervalSet.to_bytes().
+        If the data is not a packed math set, ValueError is raised."""
+        if len(data) < SERIALIZATION_HEADER.size:
+            raise ValueError('Data is not a packed math set')
+        magic, subranges_number = SERIALIZATION_HEADER.unpack_from(data)
+        ends_offset = SERIALIZATION_HEADER.size + 8 * subranges_number
+        flags_offset = ends_offset + 8 * subranges_number
+        if magic != SERIALIZATION_MAGIC or len(data) != flags_offset + subranges_number:
+            raise ValueError('Data is not a packed math set')
+
+        interval_set = cls()
+        interval_set.starts.frombytes(data[SERIALIZATION_HEADER.size:ends_offset])
+        interval_set.ends.frombytes(data[ends_offset:flags_offset])
+        interval_set.flags.frombytes(data[flags_offset:])
+        if byteorder == 'big':
+            interval_set.starts.byteswap()
+            interval_set.ends.byteswap()
+        return interval_set
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, IntervalSet):
+            return self.starts == other.starts and self.ends == other.ends and self.flags == other.flags
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'IntervalSet({self.to_list()})'
+
+
+class Interval(tuple):
+    def __new__(cls, start: int | float, end: int | float, open_start: int, open_end: int) -> 'Interval':
+        """Creates an object of the Interval class, the "tuple" range (start, end) that is written
+        in the interval notation: [0, 5] is closed, (0, 5) is open, [0, 5) and (0, 5] are half-open.
+        The infinite endpoint never belongs to the math range."""
+        interval = super().__new__(cls, (start, end))
+        interval.open_start = bool(open_start) or start == float('-inf')
+        interval.open_end = bool(open_end) or end == float('inf')
+        return interval
+
+    def __getnewargs__(self) -> tuple:
+        return *self, self.open_start, self.open_end
+
+    def __repr__(self) -> str:
+        start, end = self
+        return f'{"(" if self.open_start else "["}{start!r}, {end!r}{")" if self.open_end else "]"}'
+
+
+def to_interval_set(math_set: 'IntervalSet | list') -> IntervalSet:
+    """Returns the inputted IntervalSet object or converts the legacy math set to IntervalSet."""
+    if isinstance(math_set, IntervalSet):
+        return math_set
+    return IntervalSet.from_math_ranges(math_set)
+
+
+def get_endpoint(value: float, is_int: int) -> int | float:
+    """Returns the endpoint as "int" if it was given as "int"."""
+    return int(value) if is_int else value
@@ -0,0 +1,149 @@
+from array import array
+from math import isinf
+from re import compile as re_compile
+
+from errors import DataFileError
+from math_analyser.interval_set import INT_END_FLAG, INT_START_FLAG, POINT_FLAG, IntervalSet
+
+DIGITS = r'\d(?:_?\d)*'
+RADIX_NUMBER = r'0(?:[xX](?:_?[\da-fA-F])+|[oO](?:_?[0-7])+|[bB](?:_?[01])+)'
+NUMBER = rf'[-+]?(?:{RADIX_NUMBER}|(?:{DIGITS}(?:\.(?:{DIGITS})?)?|\.{DIGITS})(?:[eE][-+]?{DIGITS})?)'
+FLOAT_CALL = rf'float\(\s*(?:\'[^\'\\]*\'|"[^"\\]*"|{NUMBER})\s*\)'
+ENDPOINT = rf'{NUMBER}|{FLOAT_CALL}'
+
+LIST_START_PATTERN = re_compile(r'\s*\[')
+LIST_END_PATTERN = re_compile(r'\s*\]\s*$')
+TEXT_END_PATTERN = re_compile(r'\s*$')
+ELEMENT_PATTERN = re_compile(rf'\s*(?:\(\s*({ENDPOINT})\s*,\s*({ENDPOINT})\s*,?\s*\)'
+                             rf'|\(\s*({ENDPOINT})\s*\)|({ENDPOINT}))\s*(,|\])')
+RADIX_PREFIX_PATTERN = re_compile(r'[-+]?0[xXoObB]')
+RANGE_PATTERN = re_compile(r'\s*\(([^()]*)\)')
+
+INFINITY = float('inf')
+
+
+def parse_math_set(math_set_text: str) -> IntervalSet:
+    """Parses the math set given as a list of ranges and points,
+    for example "[(float('-inf'), -41), -18, (51, 62.01)]", and returns it as IntervalSet.
+    The math set is validated while it is parsed: it must be a list of math ranges given as "tuple"
+    of two endpoints and math points given as "int" ("float").
+    Only numbers and float('...') are allowed, the data is never evaluated.
+    If the check fails, DataFileError with the position (1-based) of the invalid element is raised."""
+    if not isinstance(math_set_text, str):
+        raise DataFileError(f'Math set is not represented as a list of ranges and points:\n{math_set_text}')
+    if not math_set_text.strip():
+        raise DataFileError('No data in file')
+
+    list_start = LIST_START_PATTERN.match(math_set_text)
+    if not list_start:
+        raise DataFileError(f'Math set is not represented as a list of ranges and points:\n{math_set_text}')
+    if LIST_END_PATTERN.match(math_set_text, list_start.end()):
+        raise DataFileError('No data in file')
+
+    subranges = list()
+    position = list_start.end()
+    while True:
+        element = ELEMENT_PATTERN.match(math_set_text, position)
+        if not element:
+            raise_syntax_error(math_set_text, position)
+
+        start_text, end_text, bracketed_point_text, point_text, separator = element.groups()
+        if bracketed_point_text is not None:
+            point_text = bracketed_point_text
+        if point_text is not None:
+            point, is_int = parse_endpoint(point_text, math_set_text, position)
+            subranges.append((point, point, POINT_FLAG | (INT_START_FLAG | INT_END_FLAG if is_int else 0)))
+        else:
+            start, start_is_int = parse_endpoint(start_text, math_set_text, position)
+            end, end_is_int = parse_endpoint(end_text, math_set_text, position)
+            verify_math_range(start, end, math_set_text, position)
+            subranges.append((start, end,
+                              (INT_START_FLAG if start_is_int else 0) | (INT_END_FLAG if end_is_int else 0)))
+
+        position = element.end()
+        if separator == ']':
+            if not TEXT_END_PATTERN.match(math_set_text, position):
+                raise_syntax_error(math_set_text, position)
+            break
+        if LIST_END_PATTERN.match(math_set_text, position):
+            break
+
+    if len(subranges) > 1 and any(start == -INFINITY and end == INFINITY for start, end, flags in subranges):
+        raise DataFileError(f'Math set must not contain any ranges if '
+                            f'(float(\'-inf\'), float(\'inf\')) is given:\t{math_set_text}')
+    return build_interval_set(subranges)
+
+
+def parse_endpoint(endpoint_text: str, math_set_text: str, position: int) -> tuple:
+    """Returns the endpoint value and True if it is given as "int".
+    Numbers are given as Python literals: with digit separators (1_000) and hexadecimal, octal or binary integers.
+    The number out of the float range (1e400 or the integer with 400 digits) is rejected."""
+    if endpoint_text.startswith('float'):
+        value_text = endpoint_text[endpoint_text.index('(') + 1:endpoint_text.rindex(')')].strip()
+        try:
+            if value_text[0] in '\'"':
+                value = float(value_text[1:-1])
+            else:
+                value = float(parse_endpoint(value_text, math_set_text, position)[0])
+        except ValueError:
+            raise DataFileError(f'Math ranges and math points must be given as "tuple" and "int"("float"), '
+                                f'invalid value at position {get_element_position(math_set_text, position)}:'
+                                f'\n{math_set_text}')
+        if value != value:
+            raise DataFileError(f'Math point must not be NaN, '
+                                f'invalid value at position {get_element_position(math_set_text, position)}:'
+                                f'\n{math_set_text}')
+        return value, False
+    if RADIX_PREFIX_PATTERN.match(endpoint_text):
+        value, is_int = int(endpoint_text, 0), True
+    elif '.' in endpoint_text or 'e' in endpoint_text or 'E' in endpoint_text:
+        value, is_int = float(endpoint_text), False
+    else:
+        value, is_int = int(endpoint_text), True
+    try:
+        if isinf(value):
+            raise OverflowError
+    except OverflowError:
+        raise DataFileError(f'Math point must be a finite number (infinity is given as float(\'inf\')), '
+                            f'invalid value at position {get_element_position(math_set_text, position)}:'
+                            f'\n{math_set_text}')
+    return value, is_int
+
+
+def verify_math_range(start: float, end: float, math_set_text: str, position: int) -> None:
+    """Validates math range: semi-infinite range must be given as (float('-inf'), 12) or (23, float('inf')),
+    the start point must be less than the end point."""
+    if end == -INFINITY or start == INFINITY:
+        raise DataFileError(f'Semi-infinite math range must be given as (float(\'-inf\'), 12) '
+                            f'or (23, float(\'inf\'), '
+                            f'invalid range at position {get_element_position(math_set_text, position)}:'
+                            f'\n{math_set_text}')
+    elif start >= end:
+        raise DataFileError(f'Start point in the math set must be less than the end point, '
+                            f'invalid range at position {get_element_position(math_set_text, position)}:'
+                            f'\n{math_set_text}')
+
+
+def raise_syntax_error(math_set_text: str, position: int) -> None:
+    """Raises DataFileError with the reason and position of the invalid math set element."""
+    math_range = RANGE_PATTERN.match(math_set_text, position)
+    if math_range and math_range.group(1).rstrip().rstrip(',').count(',') != 1:
+        raise DataFileError(f'Math range must contain two endpoints, '
+                            f'invalid range at position {get_element_position(math_set_text, position)}:'
+                            f'\n\t{math_set_text}')
+    raise DataFileError(f'Math ranges and math points must be given as "tuple" and "int"("float"), '
+                        f'invalid syntax at position {get_element_position(math_set_text, position)}:'
+                        f'\n{math_set_text}')
+
+
+def get_element_position(math_set_text: str, position: int) -> int:
+    """Returns 1-based position of the first non-whitespace character of the element."""
+    return len(math_set_text) - len(math_set_text[position:].lstrip()) + 1
+
+
+def build_interval_set(subranges: list) -> IntervalSet:
+    """Returns IntervalSet with the parsed subranges sorted by their endpoints."""
+    subranges.sort()
+    return IntervalSet(array('d', [start for start, end, flags in subranges]),
+                       array('d', [end for start, end, flags in subranges]),
+                       array('B', [flags for start, end, flags in subranges]))
@@ -1,135 +1,137 @@
-from bisect import bisect_left
+from bisect import bisect_right
+from collections.abc import Iterable
 
-from math_analyser import format_math_ranges, get_endpoints_of_two_math_ranges, remove_duplicate_endpoints
+from errors import DataFileError
 
+from math_analyser.interval_set import INT_END_FLAG, INT_START_FLAG, IntervalSet, get_endpoint, to_interval_set
+from math_analyser.sweep_line import determine_intersection_by_sweep_line
 
-def determine_intersection_of_ini_math_ranges(ini_math_sets: list, set_index: int, math_intersection: list) -> list:
-    """Recursive function to determine the intersection of the initial math sets by comparing all sets step by step.
+
+def determine_intersection_of_ini_math_ranges(ini_math_sets: list, set_index: int = 0,
+                                              math_intersection: IntervalSet | list = None) -> IntervalSet:
+    """Determines the intersection of the initial math sets by folding them one by one in a loop.
     Function arguments are
     - list of initial math sets;
-    - index of math set;
-    - result of the previous math sets comparison.
-    On initial run, the function gets a list of math sets, index 0, and an empty list.
-    Returns list of math sub ranges."""
-    if len(ini_math_sets) == 1:
-        math_intersection = determine_intersection_of_two_math_ranges(ini_math_sets[0], list())
-        return sorted(list(math_intersection), key=sorting_criterion)
-
-    elif set_index == 0:
-        math_intersection = determine_intersection_of_two_math_ranges(ini_math_sets[0], ini_math_sets[1])
+    - index of the first math set to fold, 0 by default;
+    - result of the previous math sets comparison, None (or an empty list) if there is no previous result.
+    Firstly, the hulls of the math sets are compared, the intersection is empty if any math set is empty
+    or the hulls do not overlap.
+    Then math sets are folded from the most selective (narrowest hull, fewest ranges) to the least one,
+    the fold stops as soon as the intersection becomes empty.
+    Returns IntervalSet with sorted math sub ranges, it is empty if there is no intersection.
+    If there are no math sets, DataFileError is raised."""
+    math_sets = [to_interval_set(math_set) for math_set in ini_math_sets[set_index:]]
+    if math_intersection:
+        math_sets.append(to_interval_set(math_intersection))
+    if not math_sets:
+        raise DataFileError('No data in file')
+
+    math_sets_hulls = [math_set.get_hull() for math_set in math_sets]
+    if None in math_sets_hulls or (max(hull_start for hull_start, hull_end in math_sets_hulls)
+            > min(hull_end for hull_start, hull_end in math_sets_hulls)):
+        return IntervalSet()
+
+    math_sets = [math_set for hull, math_set in sorted(zip(math_sets_hulls, math_sets), key=selectivity_criterion)]
+    if len(math_sets) == 1:
+        return determine_intersection_of_two_math_ranges(math_sets[0], list())
+
+    math_intersection = determine_intersection_of_two_math_ranges(math_sets[0], math_sets[1])
+    for math_set in math_sets[2:]:
         if not math_intersection:
-            return [None]
-        return determine_intersection_of_ini_math_ranges(ini_math_sets, set_index + 2, list(math_intersection))
-
-    elif set_index < len(ini_math_sets):
-        math_intersection = determine_intersection_of_two_math_ranges(math_intersection, ini_math_sets[set_index])
+            break
+        math_intersection = determine_intersection_of_two_math_ranges(math_intersection, math_set)
+    return math_intersection
+
+
+def determine_intersection_of_math_sets_stream(ini_math_sets: Iterable) -> IntervalSet:
+    """Determines the intersection of the initial math sets by folding them one by one in the order they are read,
+    so only the running intersection is kept in memory.
+    The math sets are not read any further as soon as the intersection becomes empty.
+    Returns IntervalSet with sorted math sub ranges, it is empty if there is no intersection."""
+    math_intersection = None
+    for math_set in ini_math_sets:
+        if not to_interval_set(math_set):
+            return IntervalSet()
+        if math_intersection is None:
+            math_intersection = determine_intersection_of_two_math_ranges(math_set, list())
+        else:
+            math_intersection = determine_intersection_of_two_math_ranges(math_intersection, math_set)
         if not math_intersection:
-            return [None]
-        return determine_intersection_of_ini_math_ranges(ini_math_sets, set_index + 1, list(math_intersection))
+            break
+    if math_intersection is None:
+        raise DataFileError('No data in file')
+    return math_intersection
 
-    else:
-        math_intersection = remove_duplicate_endpoints(set(math_intersection))
-        return sorted(list(math_intersection), key=sorting_criterion)
+
+def selectivity_criterion(hull_and_math_set: tuple) -> tuple:
+    """Returns the width of the math set hull and the number of its subranges,
+    the narrowest math set with the fewest subranges is the most selective one."""
+    (hull_start, hull_end), math_set = hull_and_math_set
+    return hull_end - hull_start, len(math_set)
 
 
-def determine_intersection_of_two_math_ranges(range_1: list, range_2: list) -> set:
+def determine_intersection_of_two_math_ranges(range_1: IntervalSet | list,
+                                               range_2: IntervalSet | list) -> IntervalSet:
     """Returns math intersection of two math ranges."""
     if not range_2:
-        math_ranges_endpoints = get_endpoints_of_two_math_ranges(range_1, list())
-        range_1_formatted = format_math_ranges(range_1, math_ranges_endpoints)
-        return remove_duplicate_endpoints(set(range_1_formatted))
-
-    math_ranges_endpoints = get_endpoints_of_two_math_ranges(range_1, range_2)
-    range_1_formatted = format_math_ranges(range_1, math_ranges_endpoints)
-    range_2_formatted = format_math_ranges(range_2, math_ranges_endpoints)
-    return remove_duplicate_endpoints(range_1_formatted.intersection(range_2_formatted))
+        return determine_intersection_by_sweep_line([range_1])
+    return determine_intersection_by_sweep_line([range_1, range_2])
 
 
-def sorting_criterion(input_subrange):
-    """Returns the starting endpoint for a numeric math range,
-    or the numeric endpoint for a semi-infinite math range and a number for a math point."""
-    if isinstance(input_subrange, tuple):
-        return input_subrange[0]
+def closest_point_of_two_ranges(point: float, left_endpoint: int | float, right_endpoint: int | float) -> list:
+    """Returns the closest endpoint(s) of two neighbouring subranges (or range points) to a math point."""
+    if round(abs(point - left_endpoint), 3) < round(abs(point - right_endpoint), 3):
+        return [left_endpoint]
+    elif round(abs(point - left_endpoint), 3) == round(abs(point - right_endpoint), 3):
+        return [left_endpoint, right_endpoint]
     else:
-        return input_subrange
+        return [right_endpoint]
 
 
-def start_point(subrange: tuple | float) -> float:
-    """Returns the start (left) endpoint of a subrange or the range point itself."""
-    if isinstance(subrange, tuple):
-        return subrange[0]
-    else:
-        return subrange
-
-
-def end_point(subrange: tuple | float) -> float:
-    """Returns the end (right) endpoint of a subrange or the range point itself."""
-    if isinstance(subrange, tuple):
-        return subrange[1]
-    else:
-        return subrange
-
-
-def closest_point_of_two_ranges(point: float, range_1: tuple | float, range_2: tuple | float) -> list:
-    """Returns the closest endpoint(s) of a subrange (or range point) to a math point."""
-    if round(abs(point - end_point(range_1)), 3) < round(abs(point - start_point(range_2)), 3):
-        return [end_point(range_1)]
-    elif round(abs(point - end_point(range_1)), 3) == round(abs(point - start_point(range_2)), 3):
-        return [end_point(range_1), start_point(range_2)]
-    else:
-        return [start_point(range_2)]
-
-
-def determine_closest_point_of_math_intersection(math_point: float, math_intersection: list) -> list:
+def determine_closest_point_of_math_intersection(math_point: float, math_intersection: IntervalSet | list) -> list:
     """Returns a math point if it is at the intersection of the initial math ranges
     or the closest endpoint(s) to the math point."""
-    if not math_intersection or math_intersection == [None]:
+    math_intersection = to_interval_set(math_intersection)
+    if not math_intersection:
         return [None]
 
-    all_endpoints = list()
-    for endpoint in math_intersection:
-        if isinstance(endpoint, tuple):
-            if endpoint[0] == float('-inf'):
-                all_endpoints.append(endpoint[1])
-            else:
-                all_endpoints.append(endpoint[0])
-        else:
-            all_endpoints.append(endpoint)
-
-    index = bisect_left(all_endpoints, math_point)
-
-    if index == 0:
-        subrange = math_intersection[0]
-        if (math_point == subrange or
-                (math_point >= start_point(subrange) and math_point <= end_point(subrange))):
-            return [math_point]
-        return [start_point(subrange)]
-
-    elif index > len(math_intersection) - 1:
-        subrange = math_intersection[-1]
-        if (math_point == subrange or
-                (math_point >= start_point(subrange) and math_point <= end_point(subrange))):
-            return [math_point]
-        elif math_point > end_point(subrange):
-            return [end_point(subrange)]
-        elif len(math_intersection) > 1:
-            subrange = math_intersection[-2]
-            if (math_point == subrange or
-                    (math_point >= start_point(subrange) and math_point <= end_point(subrange))):
-                return [math_point]
-            return closest_point_of_two_ranges(math_point, math_intersection[-2], math_intersection[-1])
-
-    else:
-        subrange = math_intersection[index]
-
-        if (math_point == subrange or
-                (math_point >= start_point(subrange) and math_point <= end_point(subrange))):
-            return [math_point]
-
-        elif len(math_intersection) > 1:
-            subrange = math_intersection[index - 1]
-            if (math_point == subrange or
-                    (math_point >= start_point(subrange) and math_point <= end_point(subrange))):
-                return [math_point]
-
-            return closest_point_of_two_ranges(math_point, math_intersection[index - 1], math_intersection[index])
+    index = bisect_right(math_intersection.starts, math_point) - 1
+    return closest_point_of_subrange(math_point, math_intersection, index)
+
+
+def determine_closest_points_of_math_intersection(math_points: list, math_intersection: IntervalSet | list) -> list:
+    """Returns list of pairs (math point, result) in the order of the inputted math points,
+    the result is the same as the one of determine_closest_point_of_math_intersection().
+    Math points are sorted and walked along the sorted intersection at once,
+    so every answer costs amortized O(1) instead of a binary search."""
+    math_intersection = to_interval_set(math_intersection)
+    if not math_intersection:
+        return [(math_point, [None]) for math_point in math_points]
+
+    starts = math_intersection.starts
+    closest_points = [None] * len(math_points)
+    index = -1
+    for point_index in sorted(range(len(math_points)), key=math_points.__getitem__):
+        math_point = math_points[point_index]
+        while index < len(starts) - 1 and starts[index + 1] <= math_point:
+            index += 1
+        closest_points[point_index] = (math_point, closest_point_of_subrange(math_point, math_intersection, index))
+    return closest_points
+
+
+def closest_point_of_subrange(math_point: float, math_intersection: IntervalSet, index: int) -> list:
+    """Returns a math point if it belongs to the subrange with the given index
+    or the closest endpoint(s) of the neighbouring subranges to the math point.
+    The index is the one of the last subrange that starts at or before the math point,
+    -1 if there is no such one."""
+    starts, ends, flags = math_intersection.starts, math_intersection.ends, math_intersection.flags
+    if index >= 0 and math_point <= ends[index]:
+        return [math_point]
+
+    if index < 0:
+        return [get_endpoint(starts[0], flags[0] & INT_START_FLAG)]
+    elif index == len(starts) - 1:
+        return [get_endpoint(ends[index], flags[index] & INT_END_FLAG)]
+    return closest_point_of_two_ranges(math_point,
+                                       get_endpoint(ends[index], flags[index] & INT_END_FLAG),
+                                       get_endpoint(starts[index + 1], flags[index + 1] & INT_START_FLAG))
@@ -0,0 +1,85 @@
+from array import array
+
+from errors import DataFileError
+from math_analyser.interval_set import INT_END_FLAG, INT_START_FLAG, POINT_FLAG, IntervalSet, to_interval_set
+from math_analyser.math_sets_analyser import closest_point_of_subrange
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_IS_AVAILABLE = np is not None
+
+
+def determine_intersection_with_numpy(ini_math_sets: list) -> IntervalSet:
+    """Determines the intersection of all initial math sets with vectorized NumPy operations (NumPy is required).
+    All endpoints are sorted once and replaced by their ranks, the overlapping ranges of every math set are merged,
+    then the coverage of every endpoint and of every range between two neighbouring endpoints
+    is calculated as a cumulative sum.
+    The result is the same as the one of determine_intersection_by_sweep_line().
+    Returns IntervalSet with sorted math sub ranges, it is empty if there is no intersection.
+    If there are no math sets, DataFileError is raised."""
+    if not ini_math_sets:
+        raise DataFileError('No data in file')
+    ini_math_sets = [to_interval_set(math_set) for math_set in ini_math_sets]
+    starts = np.concatenate([np.frombuffer(math_set.starts, dtype=np.float64) for math_set in ini_math_sets])
+    ends = np.concatenate([np.frombuffer(math_set.ends, dtype=np.float64) for math_set in ini_math_sets])
+    flags = np.concatenate([np.frombuffer(math_set.flags, dtype=np.uint8) for math_set in ini_math_sets])
+    set_indexes = np.repeat(np.arange(len(ini_math_sets)),
+                            [len(math_set) for math_set in ini_math_sets])
+
+    endpoints, endpoint_ranks = np.unique(np.concatenate((starts, ends)), return_inverse=True)
+    start_ranks = endpoint_ranks[:len(starts)]
+    end_ranks = endpoint_ranks[len(starts):]
+    int_endpoints = np.zeros(len(endpoints), dtype=bool)
+    int_endpoints[start_ranks[(flags & INT_START_FLAG) != 0]] = True
+    int_endpoints[end_ranks[(flags & INT_END_FLAG) != 0]] = True
+
+    merged_starts, merged_ends = merge_ranked_math_ranges(start_ranks, end_ranks, set_indexes, len(endpoints))
+
+    point_coverage = np.cumsum(np.bincount(merged_starts, minlength=len(endpoints) + 1)
+                               - np.bincount(merged_ends + 1, minlength=len(endpoints) + 1))[:len(endpoints)]
+    range_coverage = np.cumsum(np.bincount(merged_starts, minlength=len(endpoints))
+                               - np.bincount(merged_ends, minlength=len(endpoints)))
+    range_added = range_coverage == len(ini_math_sets)
+    range_added[-1] = False
+    point_added = point_coverage == len(ini_math_sets)
+    point_added &= ~range_added
+    point_added[1:] &= ~range_added[:-1]
+
+    result_ranks = np.flatnonzero(point_added | range_added)
+    result_end_ranks = np.where(range_added[result_ranks], result_ranks + 1, result_ranks)
+    result_flags = (np.where(point_added[result_ranks], POINT_FLAG, 0)
+                    | np.where(int_endpoints[result_ranks], INT_START_FLAG, 0)
+                    | np.where(int_endpoints[result_end_ranks], INT_END_FLAG, 0)).astype(np.uint8)
+    return IntervalSet(array('d', endpoints[result_ranks].tobytes()),
+                       array('d', endpoints[result_end_ranks].tobytes()),
+                       array('B', result_flags.tobytes()))
+
+
+def merge_ranked_math_ranges(start_ranks: 'np.ndarray', end_ranks: 'np.ndarray',
+                             set_indexes: 'np.ndarray', ranks_number: int) -> tuple:
+    """Merges overlapping and adjacent ranges (points) of every math set, the ranges of each math set are sorted.
+    Ranks of every math set are shifted above the ranks of the previous one,
+    so the running maximum of end ranks does not pass from one math set to the next.
+    Returns arrays of start and end ranks of the merged ranges."""
+    shift = set_indexes * ranks_number
+    running_end_ranks = np.maximum.accumulate(end_ranks + shift)
+    range_is_first = np.ones(len(start_ranks), dtype=bool)
+    range_is_first[1:] = start_ranks[1:] + shift[1:] > running_end_ranks[:-1]
+    first_ranges = np.flatnonzero(range_is_first)
+    return start_ranks[first_ranges], np.maximum.reduceat(end_ranks, first_ranges)
+
+
+def determine_closest_point_with_numpy(math_point: float, math_intersection: IntervalSet | list) -> list:
+    """Returns a math point if it is at the intersection of the initial math ranges
+    or the closest endpoint(s) to the math point, the subrange is searched with numpy.searchsorted().
+    The result is the same as the one of determine_closest_point_of_math_intersection()."""
+    math_intersection = to_interval_set(math_intersection)
+    if not math_intersection:
+        return [None]
+
+    starts = np.frombuffer(math_intersection.starts, dtype=np.float64)
+    index = int(np.searchsorted(starts, math_point, side='right')) - 1
+    return closest_point_of_subrange(math_point, math_intersection, index)
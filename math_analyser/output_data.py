@@ -1,33 +1,44 @@
-from json import dump as json_dump
+from functools import cache
+from itertools import islice
+from json import dumps as json_dumps
 
-from os.path import abspath, dirname, isfile, splitext
+from os.path import abspath, dirname
 from os.path import join as os_path_join
+from xml.sax.saxutils import escape as xml_escape
 
 from chameleon import PageTemplateLoader
 
 from errors import OutputDataError
+from math_analyser.interval_set import IntervalSet
+from math_analyser.output_sink import OutputSink
 
+TEMPLATE_LOADER = PageTemplateLoader(os_path_join(abspath(dirname(__file__)), 'templates'))
+XML_TEMPLATE_MARKER = 'MATH_SETS_ANALYSER_OUTPUT_DATA'
+OUTPUT_CHUNK_SIZE = 4096
 
-def output_script_data(config_data: 'ConfigData object', output_data: list):
+
+def output_script_data(config_data: 'ConfigData object', output_data: IntervalSet | list,
+                       output_file_path: str = None):
     """Generates the output file with the inputted title and data.
-    The file type and path are determined from the inputted ConfigData object."""
+    IntervalSet object is converted to the list of math ranges and math points.
+    The data is written piece by piece through the buffered file, so the whole result is never kept as one string,
+    the file content is the same as the one of str(output_data) written at once.
+    The output file appears at once when it is written completely (see OutputSink).
+    The file type and path are determined from the inputted ConfigData object,
+    the path may be given instead (for example, for one of several results of the run)."""
     output_file_format = config_data.get_output_file_format()
-    output_file_path = config_data.get_output_file_path()
-    output_data = str(output_data)
+    if output_file_path is None:
+        output_file_path = config_data.get_output_file_path()
     try:
-        output_file_path = choose_name_for_output_file(output_file_format, output_file_path)
-        with open(output_file_path, 'w') as file_to_write:
+        with OutputSink(output_file_format, output_file_path) as file_to_write:
             if output_file_format == 'json':
-                json_dump(output_data, file_to_write)
+                write_json_output(file_to_write, output_data)
 
             elif output_file_format == 'txt':
-                file_to_write.write(output_data)
+                write_txt_output(file_to_write, output_data)
 
             elif output_file_format == 'xml':
-                template = PageTemplateLoader(os_path_join(abspath(dirname(__file__)), 'templates'))
-                tmpl = template['output_temp.pt']
-                data_for_xml = tmpl(output_data=output_data)
-                file_to_write.write(data_for_xml)
+                write_xml_output(file_to_write, output_data)
 
             else:
                 assert False, ('Internal error! output_script_data()'
@@ -36,14 +47,53 @@ def output_script_data(config_data: 'ConfigData object', output_data: list):
         raise OutputDataError(f'could not be generated in {output_file_path}\n{err}')
 
 
-def choose_name_for_output_file(file_format: str, file_path: str) -> str:
-    """Returns name of the output file, if the file with inputted name already exists then
-    the output file will be renamed, "({num})" will be added to its name (for example: output_file(1).txt)."""
-    temp_file_path = splitext(file_path)[0]
-    if isfile(f'{temp_file_path}.{file_format}'):
-        num = 1
-        while isfile(f'{temp_file_path}({num}).{file_format}'):
-            num += 1
-        return f'{temp_file_path}({num}).{file_format}'
+def write_json_output(file_to_write: '_io.TextIOWrapper object', output_data: IntervalSet | list) -> None:
+    """Writes the output data as JSON string, the same as json.dump(str(output_data))."""
+    file_to_write.write('"')
+    for output_piece in iter_output_pieces(output_data):
+        file_to_write.write(json_dumps(output_piece)[1:-1])
+    file_to_write.write('"')
+
+
+def write_txt_output(file_to_write: '_io.TextIOWrapper object', output_data: IntervalSet | list) -> None:
+    """Writes the output data as text, the same as str(output_data)."""
+    for output_piece in iter_output_pieces(output_data):
+        file_to_write.write(output_piece)
+
+
+def write_xml_output(file_to_write: '_io.TextIOWrapper object', output_data: IntervalSet | list) -> None:
+    """Writes the output data into the XML template, the same as the template rendered with str(output_data)."""
+    template_prefix, template_suffix = get_xml_template_parts()
+    file_to_write.write(template_prefix)
+    for output_piece in iter_output_pieces(output_data):
+        file_to_write.write(xml_escape(output_piece))
+    file_to_write.write(template_suffix)
+
+
+@cache
+def get_xml_template_parts() -> tuple:
+    """Returns the parts of the XML template before and after the output data.
+    The template is loaded and rendered once with the marker instead of the output data."""
+    rendered_template = TEMPLATE_LOADER['output_temp.pt'](output_data=XML_TEMPLATE_MARKER)
+    template_prefix, template_suffix = rendered_template.split(XML_TEMPLATE_MARKER)
+    return template_prefix, template_suffix
+
+
+def iter_output_pieces(output_data: IntervalSet | list) -> 'Iterator[str]':
+    """Yields the text of the output data piece by piece, the joined pieces are equal to str(output_data).
+    Every piece contains up to OUTPUT_CHUNK_SIZE math ranges (math points, results),
+    IntervalSet is converted to math ranges and math points while it is written, the empty one is [None]."""
+    if isinstance(output_data, IntervalSet):
+        output_items = output_data.iter_math_ranges() if output_data else iter([None])
+    elif isinstance(output_data, list):
+        output_items = iter(output_data)
     else:
-        return f'{temp_file_path}.{file_format}'
+        yield str(output_data)
+        return
+
+    yield '['
+    separator = ''
+    while output_chunk := list(islice(output_items, OUTPUT_CHUNK_SIZE)):
+        yield separator + ', '.join(map(repr, output_chunk))
+        separator = ', '
+    yield ']'
@@ -0,0 +1,91 @@
+from os import O_CREAT, O_EXCL, O_WRONLY, close, link, replace, scandir
+from os import open as os_open
+from os import remove as remove_file
+from os.path import abspath, basename, dirname, splitext
+from os.path import join as os_path_join
+from re import compile as re_compile
+from re import escape as re_escape
+from secrets import token_hex
+
+OUTPUT_BUFFER_SIZE = 2 ** 20
+
+
+class OutputSink:
+    __slots__ = ['file_format', 'file_path', 'output_file_path', 'temp_file_path', 'temp_file']
+
+    def __init__(self, file_format: str, file_path: str):
+        """Creates an object of the OutputSink class, the context manager that returns the buffered text file.
+        The data is written to a temporary file in the output directory, when the context is left
+        the file gets the free name chosen by choose_name_for_output_file() at once, so the partial file
+        is never visible and the parallel runs never write to the same file.
+        If the writing fails, the temporary file is removed. The name of the output file is in output_file_path."""
+        self.file_format = file_format
+        self.file_path = file_path
+        self.output_file_path = None
+        self.temp_file_path = None
+        self.temp_file = None
+
+    def __enter__(self) -> '_io.TextIOWrapper object':
+        output_file_name = basename(splitext(self.file_path)[0])
+        self.temp_file_path = os_path_join(dirname(abspath(self.file_path)),
+                                           f'.{output_file_name}.{token_hex(8)}.tmp')
+        self.temp_file = open(os_open(self.temp_file_path, O_WRONLY | O_CREAT | O_EXCL, 0o666),
+                              'w', buffering=OUTPUT_BUFFER_SIZE)
+        return self.temp_file
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            self.temp_file.close()
+            if exc_type is None:
+                self.output_file_path = publish_output_file(self.temp_file_path, self.file_format, self.file_path)
+        finally:
+            try:
+                remove_file(self.temp_file_path)
+            except FileNotFoundError:
+                pass
+
+
+def publish_output_file(temp_file_path: str, file_format: str, file_path: str) -> str:
+    """Gives the written temporary file the free name of the output file and returns the name.
+    The name is taken by the hard link, which fails if the name has been taken by another run meanwhile.
+    If the hard links are not supported, the name is created exclusively and replaced by the temporary file."""
+    while True:
+        output_file_path = choose_name_for_output_file(file_format, file_path)
+        try:
+            link(temp_file_path, output_file_path)
+        except FileExistsError:
+            continue
+        except OSError:
+            try:
+                close(os_open(output_file_path, O_WRONLY | O_CREAT | O_EXCL, 0o666))
+            except FileExistsError:
+                continue
+            replace(temp_file_path, output_file_path)
+        return output_file_path
+
+
+def choose_name_for_output_file(file_format: str, file_path: str) -> str:
+    """Returns name of the output file, if the file with inputted name already exists then
+    the output file will be renamed, "({num})" will be added to its name (for example: output_file(1).txt).
+    The smallest free number is chosen by a single scan of the output directory,
+    any directory entry with the name (not only the file) makes the name taken."""
+    temp_file_path = splitext(file_path)[0]
+    output_file_name = basename(temp_file_path)
+    numbered_name_pattern = re_compile(rf'{re_escape(output_file_name)}\(([1-9]\d*)\)'
+                                       rf'{re_escape(f".{file_format}")}')
+
+    output_file_exists = False
+    used_numbers = set()
+    with scandir(dirname(temp_file_path) or '.') as dir_entries:
+        for dir_entry in dir_entries:
+            if dir_entry.name == f'{output_file_name}.{file_format}':
+                output_file_exists = True
+            elif numbered_name := numbered_name_pattern.fullmatch(dir_entry.name):
+                used_numbers.add(int(numbered_name.group(1)))
+
+    if not output_file_exists:
+        return f'{temp_file_path}.{file_format}'
+    num = 1
+    while num in used_numbers:
+        num += 1
+    return f'{temp_file_path}({num}).{file_format}'
@@ -0,0 +1,163 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import accumulate
+from math import isfinite
+
+from math_analyser.interval_set import INT_END_FLAG, INT_START_FLAG, POINT_FLAG, IntervalSet, to_interval_set
+from math_analyser.sweep_line import determine_intersection_by_sweep_line
+
+CHUNKS_PER_WORKER = 4
+SAMPLES_PER_SLICE = 32
+
+
+def determine_intersection_in_parallel(ini_math_sets: list, workers: int,
+                                       determine_intersection: Callable = determine_intersection_by_sweep_line
+                                       ) -> IntervalSet:
+    """Determines the intersection of the initial math sets in the pool of worker processes.
+    The math sets are split into chunks, the intersection of every chunk is determined by a worker
+    with the given function (the sweep line by default, it must be picklable).
+    The partial results are intersected in pairs as soon as they are ready, until one result is left.
+    As soon as any partial result is empty, the waiting chunks are cancelled and the empty intersection is returned.
+    The result is the same as the one of determine_intersection_by_sweep_line().
+    Returns IntervalSet with sorted math sub ranges, it is empty if there is no intersection."""
+    math_sets = [to_interval_set(math_set) for math_set in ini_math_sets]
+    if workers <= 1 or len(math_sets) < 2:
+        return determine_intersection(math_sets)
+
+    math_sets_hulls = [math_set.get_hull() for math_set in math_sets]
+    if None in math_sets_hulls or (max(hull_start for hull_start, hull_end in math_sets_hulls)
+            > min(hull_end for hull_start, hull_end in math_sets_hulls)):
+        return IntervalSet()
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending_results = {executor.submit(determine_intersection, math_sets_chunk)
+                           for math_sets_chunk in split_math_sets(math_sets, workers * CHUNKS_PER_WORKER)}
+        partial_results = list()
+        while pending_results:
+            ready_results, pending_results = wait(pending_results, return_when=FIRST_COMPLETED)
+            for ready_result in ready_results:
+                partial_result = ready_result.result()
+                if not partial_result:
+                    return IntervalSet()
+                partial_results.append(partial_result)
+            while len(partial_results) > 1:
+                pending_results.add(executor.submit(determine_intersection,
+                                                    [partial_results.pop(), partial_results.pop()]))
+        return partial_results[0]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def split_math_sets(math_sets: list, chunks_number: int) -> list:
+    """Returns list of chunks of the math sets, the chunks are balanced by the number of subranges."""
+    chunk_size = sum(len(math_set) for math_set in math_sets) / chunks_number
+    math_sets_chunks = [list()]
+    chunk_subranges = 0
+    for math_set in math_sets:
+        if chunk_subranges >= chunk_size:
+            math_sets_chunks.append(list())
+            chunk_subranges = 0
+        math_sets_chunks[-1].append(math_set)
+        chunk_subranges += len(math_set)
+    return math_sets_chunks
+
+
+def determine_intersection_by_domain_slices(ini_math_sets: list, workers: int,
+                                            determine_intersection: Callable = determine_intersection_by_sweep_line
+                                            ) -> IntervalSet:
+    """Determines the intersection of the initial math sets in the pool of worker processes
+    by splitting the number line into slices, it suits a few math sets with many subranges each.
+    The split points are chosen from the sampled endpoints of the math sets, so the slice boundaries
+    do not add new endpoints. Every math set is clipped to every slice, the slices are intersected
+    by the workers with the given function (the sweep line by default, it must be picklable),
+    then the results are concatenated in the order of the slices.
+    The result is the same as the one of determine_intersection_of_ini_math_ranges().
+    Returns IntervalSet with sorted math sub ranges, it is empty if there is no intersection."""
+    math_sets = [to_interval_set(math_set) for math_set in ini_math_sets]
+    if workers <= 1 or not math_sets:
+        return determine_intersection(math_sets)
+
+    math_sets_hulls = [math_set.get_hull() for math_set in math_sets]
+    if None in math_sets_hulls or (max(hull_start for hull_start, hull_end in math_sets_hulls)
+            > min(hull_end for hull_start, hull_end in math_sets_hulls)):
+        return IntervalSet()
+
+    split_points = choose_split_points(math_sets, workers * CHUNKS_PER_WORKER)
+    if not split_points:
+        return determine_intersection(math_sets)
+    slices_bounds = list(zip([float('-inf')] + split_points, split_points + [float('inf')]))
+    running_max_ends = [list(accumulate(math_set.ends, max)) for math_set in math_sets]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        slices_results = list()
+        for slice_start, slice_end in slices_bounds:
+            slice_math_sets = list()
+            for math_set, math_set_max_ends in zip(math_sets, running_max_ends):
+                first_index = bisect_left(math_set_max_ends, slice_start)
+                last_index = bisect_right(math_set.starts, slice_end)
+                if first_index >= last_index:
+                    break
+                slice_math_sets.append(IntervalSet(math_set.starts[first_index:last_index],
+                                                   math_set.ends[first_index:last_index],
+                                                   math_set.flags[first_index:last_index]))
+            else:
+                slices_results.append(executor.submit(determine_intersection_of_slice, slice_math_sets,
+                                                      slice_start, slice_end, determine_intersection))
+        return concatenate_slices_results([slice_result.result() for slice_result in slices_results])
+
+
+def choose_split_points(math_sets: list, slices_number: int) -> list:
+    """Returns sorted finite split points of the number line, they are chosen from the sampled start endpoints
+    of the math sets, so every slice contains about the same number of subranges."""
+    samples_number = slices_number * SAMPLES_PER_SLICE
+    sampling_step = max(1, sum(len(math_set) for math_set in math_sets) // samples_number)
+    samples = sorted(start for math_set in math_sets
+                     for start in math_set.starts[::sampling_step] if isfinite(start))
+    split_points = sorted({samples[index * len(samples) // slices_number] for index in range(1, slices_number)}
+                          if samples else set())
+    return split_points
+
+
+def determine_intersection_of_slice(math_sets: list, slice_start: float, slice_end: float,
+                                    determine_intersection: Callable) -> IntervalSet:
+    """Clips the math sets to the slice of the number line [slice_start, slice_end] and returns their intersection.
+    The subranges crossing the slice boundary are cut at it, the subranges outside the slice are dropped."""
+    clipped_math_sets = list()
+    for math_set in math_sets:
+        clipped_math_set = IntervalSet()
+        for start, end, flags in zip(math_set.starts, math_set.ends, math_set.flags):
+            if end < slice_start or start > slice_end:
+                continue
+            if start < slice_start:
+                start, flags = slice_start, flags & ~INT_START_FLAG
+            if end > slice_end:
+                end, flags = slice_end, flags & ~INT_END_FLAG
+            if start == end:
+                flags |= POINT_FLAG
+            clipped_math_set.append(start, end, flags)
+        clipped_math_sets.append(clipped_math_set)
+    return determine_intersection(clipped_math_sets)
+
+
+def concatenate_slices_results(slices_results: list) -> IntervalSet:
+    """Returns the intersection joined from the intersections of the neighbouring slices.
+    The slices share their boundary endpoint, so the math point at the boundary is added only once
+    and it is dropped if it is the endpoint of the math range of the neighbouring slice."""
+    math_intersection = IntervalSet()
+    for slice_result in slices_results:
+        if not slice_result:
+            continue
+        first_index = 0
+        if math_intersection and math_intersection.ends[-1] == slice_result.starts[0]:
+            if slice_result.flags[0] & POINT_FLAG:
+                first_index = 1
+            elif math_intersection.flags[-1] & POINT_FLAG:
+                math_intersection.starts.pop()
+                math_intersection.ends.pop()
+                math_intersection.flags.pop()
+        math_intersection.starts.extend(slice_result.starts[first_index:])
+        math_intersection.ends.extend(slice_result.ends[first_index:])
+        math_intersection.flags.extend(slice_result.flags[first_index:])
+    return math_intersection
@@ -0,0 +1,146 @@
+from hashlib import file_digest
+from json import dumps as json_dumps
+from json import load as json_load
+from os import makedirs, replace, scandir, stat, utime
+from os import remove as remove_file
+from os.path import abspath, basename, dirname
+from os.path import join as os_path_join
+from tempfile import NamedTemporaryFile
+
+from math_analyser.interval_set import IntervalSet
+
+CACHE_ENTRY_EXTENSION = '.msa'
+CACHE_INDEX_FILE = 'index.json'
+
+
+class ResultCache:
+    __slots__ = ['cache_dir', 'max_size', 'is_enabled']
+
+    def __init__(self, cache_dir: str, max_size: int):
+        """Creates an object of the ResultCache class, the directory with computed math intersections.
+        Every intersection is stored in a separate file, its name is the hash of the data file content and format.
+        The total size of the stored files is limited by max_size (in bytes),
+        the least recently used files are removed first.
+        If the directory cannot be created, the cache is disabled: nothing is loaded or stored."""
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        try:
+            makedirs(cache_dir, exist_ok=True)
+            self.is_enabled = True
+        except OSError:
+            self.is_enabled = False
+
+    def get_key(self, data_file: str, data_format: str) -> str | None:
+        """Returns the cache key of the data file: its format and SHA-256 hash of its content.
+        The hash is saved in the cache index with the size and modification time of the data file,
+        so the unchanged data file is not read again. Returns None if the cache is disabled."""
+        if not self.is_enabled:
+            return None
+        data_file = abspath(data_file)
+        data_file_stat = stat(data_file)
+        cache_index = self.read_index()
+        indexed_file = cache_index.get(data_file)
+        if (indexed_file
+                and indexed_file['size'] == data_file_stat.st_size
+                and indexed_file['mtime'] == data_file_stat.st_mtime_ns):
+            content_hash = indexed_file['hash']
+        else:
+            with open(data_file, 'rb') as file_to_hash:
+                content_hash = file_digest(file_to_hash, 'sha256').hexdigest()
+            cache_index[data_file] = {'size': data_file_stat.st_size,
+                                      'mtime': data_file_stat.st_mtime_ns,
+                                      'hash': content_hash}
+            self.write_index(cache_index)
+        return f'{data_format.lower()}-{content_hash}'
+
+    def load(self, key: str | None) -> IntervalSet | None:
+        """Returns the math intersection stored with the given key or None if it is not found or is damaged.
+        The access time of the found entry is updated."""
+        if not self.is_enabled:
+            return None
+        entry_path = self.get_entry_path(key)
+        try:
+            with open(entry_path, 'rb') as entry_file:
+                math_intersection = IntervalSet.from_bytes(entry_file.read())
+            utime(entry_path)
+        except (OSError, ValueError):
+            return None
+        return math_intersection
+
+    def store(self, key: str | None, math_intersection: IntervalSet) -> None:
+        """Saves the math intersection with the given key, then evicts the least recently used entries
+        if the cache size exceeds the limit. The cache is skipped if it cannot be written."""
+        if not self.is_enabled:
+            return
+        try:
+            write_atomically(self.get_entry_path(key), math_intersection.to_bytes())
+            self.evict_entries()
+        except OSError:
+            pass
+
+    def evict_entries(self) -> None:
+        """Removes the least recently used entries until the total size of the cache fits the limit.
+        Then the data files whose hash has no entry left are removed from the cache index,
+        so the index does not grow without bound."""
+        cache_entries = list()
+        with scandir(self.cache_dir) as dir_entries:
+            for dir_entry in dir_entries:
+                if dir_entry.name.endswith(CACHE_ENTRY_EXTENSION):
+                    entry_stat = dir_entry.stat()
+                    cache_entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, dir_entry.path))
+
+        cache_size = sum(entry_size for entry_mtime, entry_size, entry_path in cache_entries)
+        stored_hashes = set()
+        for entry_mtime, entry_size, entry_path in sorted(cache_entries):
+            if cache_size <= self.max_size:
+                stored_hashes.add(basename(entry_path)[:-len(CACHE_ENTRY_EXTENSION)].partition('-')[2])
+                continue
+            try:
+                remove_file(entry_path)
+            except FileNotFoundError:
+                pass
+            cache_size -= entry_size
+        self.prune_index(stored_hashes)
+
+    def prune_index(self, stored_hashes: set) -> None:
+        """Removes the data files whose hash is not in the given stored hashes from the cache index."""
+        cache_index = self.read_index()
+        pruned_index = {data_file: indexed_file for data_file, indexed_file in cache_index.items()
+                        if isinstance(indexed_file, dict) and indexed_file.get('hash') in stored_hashes}
+        if len(pruned_index) != len(cache_index):
+            self.write_index(pruned_index)
+
+    def read_index(self) -> dict:
+        """Returns the cache index: size, modification time and content hash of every known data file."""
+        try:
+            with open(os_path_join(self.cache_dir, CACHE_INDEX_FILE)) as index_file:
+                cache_index = json_load(index_file)
+        except (OSError, ValueError):
+            return dict()
+        return cache_index if isinstance(cache_index, dict) else dict()
+
+    def write_index(self, cache_index: dict) -> None:
+        """Saves the cache index, the cache index is skipped if it cannot be written."""
+        try:
+            write_atomically(os_path_join(self.cache_dir, CACHE_INDEX_FILE), json_dumps(cache_index).encode())
+        except OSError:
+            pass
+
+    def get_entry_path(self, key: str) -> str:
+        """Returns the path to the cache entry with the given key."""
+        return os_path_join(self.cache_dir, f'{key}{CACHE_ENTRY_EXTENSION}')
+
+
+def write_atomically(file_path: str, data: bytes) -> None:
+    """Writes the data to a temporary file in the same directory and renames it,
+    so the partial file is never visible. The temporary file is removed if it cannot be written or renamed."""
+    temp_file = NamedTemporaryFile('wb', dir=dirname(abspath(file_path)), suffix='.tmp', delete=False)
+    try:
+        with temp_file:
+            temp_file.write(data)
+        replace(temp_file.name, file_path)
+    finally:
+        try:
+            remove_file(temp_file.name)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,185 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from math import isinf
+
+from math_analyser.interval_set import to_interval_set
+from math_analyser.sweep_line import merge_math_ranges
+
+SETS_PER_CHECKPOINT_STEP = 64
+
+
+class StabbingIndex:
+    __slots__ = ['endpoints', 'boundary_offsets', 'boundary_sets', 'checkpoint_step', 'checkpoint_masks',
+                 'set_endpoints', 'sets_number']
+
+    def __init__(self, ini_math_sets: list):
+        """Creates an object of the StabbingIndex class, the index of the initial math sets by the point.
+        The sorted endpoints of the merged math ranges split the number line into units: every endpoint
+        and every math range between two neighbouring endpoints. Every endpoint keeps only the math sets
+        that start (the index of the math set) or end (~index) at it, the bitmap of the math sets covering
+        the units (the bit number is the index of the math set in the data file) is stored at every
+        checkpoint_step-th endpoint only. The step is sets_number / 64 endpoints, so the bitmaps take
+        about 8 bytes per endpoint, and the bitmap of any unit is restored from the checkpoint before it
+        by replaying at most checkpoint_step endpoints.
+        Every query finds the unit of the point by the binary search.
+        The sorted endpoints of every math set are kept for search_nearest_sets()."""
+        self.sets_number = len(ini_math_sets)
+        boundaries = dict()
+        self.set_endpoints = list()
+        for set_index, math_set in enumerate(ini_math_sets):
+            set_endpoints = array('d')
+            for start, end in merge_math_ranges(to_interval_set(math_set), set(), set()):
+                boundaries.setdefault(start, list()).append(set_index)
+                boundaries.setdefault(end, list()).append(~set_index)
+                set_endpoints.extend((start, end))
+            self.set_endpoints.append(set_endpoints)
+
+        self.endpoints = sorted(boundaries)
+        self.boundary_offsets = array('Q', [0])
+        self.boundary_sets = array('q')
+        for endpoint in self.endpoints:
+            self.boundary_sets.extend(boundaries[endpoint])
+            self.boundary_offsets.append(len(self.boundary_sets))
+
+        self.checkpoint_step = max(1, -(-self.sets_number // SETS_PER_CHECKPOINT_STEP))
+        self.checkpoint_masks = list()
+        range_mask = 0
+        for index in range(len(self.endpoints)):
+            if index % self.checkpoint_step == 0:
+                self.checkpoint_masks.append(range_mask)
+            start_mask, end_mask = self.get_boundary_masks(index)
+            range_mask = (range_mask | start_mask) & ~end_mask
+        if len(self.endpoints) % self.checkpoint_step == 0:
+            self.checkpoint_masks.append(range_mask)
+
+    def get_boundary_masks(self, index: int) -> tuple:
+        """Returns the bitmaps of the math sets that start and that end at the endpoint with the given index."""
+        start_mask = end_mask = 0
+        for set_index in self.boundary_sets[self.boundary_offsets[index]:self.boundary_offsets[index + 1]]:
+            if set_index >= 0:
+                start_mask |= 1 << set_index
+            else:
+                end_mask |= 1 << ~set_index
+        return start_mask, end_mask
+
+    def get_range_mask(self, index: int) -> int:
+        """Returns the bitmap of the math sets covering the math range before the endpoint with the given index
+        (after the last endpoint if the index is the number of endpoints).
+        The bitmap of the nearest checkpoint before it is updated by the math sets starting and ending after it."""
+        checkpoint = index // self.checkpoint_step
+        range_mask = self.checkpoint_masks[checkpoint]
+        for boundary_index in range(checkpoint * self.checkpoint_step, index):
+            start_mask, end_mask = self.get_boundary_masks(boundary_index)
+            range_mask = (range_mask | start_mask) & ~end_mask
+        return range_mask
+
+    def get_sets_mask(self, math_point: float) -> int:
+        """Returns the bitmap of the math sets containing the math point."""
+        index = bisect_left(self.endpoints, math_point)
+        if index < len(self.endpoints) and self.endpoints[index] == math_point:
+            return self.get_range_mask(index) | self.get_boundary_masks(index)[0]
+        return self.get_range_mask(index)
+
+    def sets_containing(self, math_point: float) -> list:
+        """Returns the sorted list of indices of the math sets containing the math point, O(log n + k)."""
+        return get_set_indices(self.get_sets_mask(math_point))
+
+    def sets_excluding(self, math_point: float) -> list:
+        """Returns the sorted list of indices of the math sets that do not contain the math point."""
+        return get_set_indices(~self.get_sets_mask(math_point) & ((1 << self.sets_number) - 1))
+
+    def nearest_sets(self, math_point: float, count: int = 1) -> list:
+        """Returns the list of pairs (index of the math set, distance) for the count math sets
+        that do not contain the math point and are the nearest to it, sorted by the distance.
+        The math sets at the same distance as the last one are also returned.
+        The endpoints are walked from the math point in both directions, the first met endpoint
+        of the math set not containing the point is the nearest one. The walk is limited by the number
+        of math sets: if the endpoints of the math sets containing the point are in the way,
+        the rest math sets are searched by search_nearest_sets(), so O(n log r) at most."""
+        found_mask = self.get_sets_mask(math_point)
+        left_index = bisect_left(self.endpoints, math_point) - 1
+        right_index = bisect_right(self.endpoints, math_point)
+        nearest_sets = list()
+        walked_endpoints = 0
+        while left_index >= 0 or right_index < len(self.endpoints):
+            if walked_endpoints == self.sets_number:
+                return self.search_nearest_sets(math_point, count, found_mask, nearest_sets)
+            walked_endpoints += 1
+            left_distance = right_distance = float('inf')
+            if left_index >= 0:
+                left_distance = math_point - self.endpoints[left_index]
+            if right_index < len(self.endpoints):
+                right_distance = self.endpoints[right_index] - math_point
+            if left_distance <= right_distance:
+                distance, index = left_distance, left_index
+                left_index -= 1
+            else:
+                distance, index = right_distance, right_index
+                right_index += 1
+            if isinf(distance) or len(nearest_sets) >= count and distance > nearest_sets[-1][1]:
+                break
+            start_mask, end_mask = self.get_boundary_masks(index)
+            new_sets_mask = (start_mask | end_mask) & ~found_mask
+            found_mask |= new_sets_mask
+            nearest_sets.extend((set_index, distance) for set_index in get_set_indices(new_sets_mask))
+        return nearest_sets
+
+    def search_nearest_sets(self, math_point: float, count: int, found_mask: int, nearest_sets: list) -> list:
+        """Adds the math sets that are not in the found bitmap to the nearest math sets found by the walk.
+        The nearest finite endpoint of every such math set is found by the binary search in its sorted endpoints,
+        they are not nearer than the walked endpoints."""
+        nearest_candidates = list()
+        for set_index in get_set_indices(~found_mask & ((1 << self.sets_number) - 1)):
+            distance = get_distance_to_endpoints(self.set_endpoints[set_index], math_point)
+            if not isinf(distance):
+                nearest_candidates.append((distance, set_index))
+        for distance, set_index in sorted(nearest_candidates):
+            if len(nearest_sets) >= count and distance > nearest_sets[-1][1]:
+                break
+            nearest_sets.append((set_index, distance))
+        return nearest_sets
+
+    def sets_containing_points(self, math_points: list) -> list:
+        """Returns list of pairs (math point, indices of the math sets containing it)
+        in the order of the inputted math points."""
+        return [(math_point, self.sets_containing(math_point)) for math_point in math_points]
+
+    def nearest_sets_of_points(self, math_points: list, count: int = 1) -> list:
+        """Returns list of pairs (math point, nearest math sets not containing it, see nearest_sets())
+        in the order of the inputted math points."""
+        return [(math_point, self.nearest_sets(math_point, count)) for math_point in math_points]
+
+    def __len__(self) -> int:
+        return self.sets_number
+
+
+def get_distance_to_endpoints(endpoints: array, math_point: float) -> float:
+    """Returns the distance from the math point to the nearest finite endpoint of the sorted endpoints,
+    inf if there is no finite endpoint."""
+    index = bisect_left(endpoints, math_point)
+    distance = float('inf')
+    if index and not isinf(endpoints[index - 1]):
+        distance = math_point - endpoints[index - 1]
+    if index < len(endpoints) and not isinf(endpoints[index]):
+        distance = min(distance, endpoints[index] - math_point)
+    return distance
+
+
+def get_set_indices(sets_mask: int) -> list:
+    """Returns the sorted list of indices of the math sets of the bitmap, the set bits are visited only."""
+    set_indices = list()
+    while sets_mask:
+        lowest_bit = sets_mask & -sets_mask
+        set_indices.append(lowest_bit.bit_length() - 1)
+        sets_mask ^= lowest_bit
+    return set_indices
+
+
+def determine_sets_of_math_points(math_points: float | list, stabbing_index: StabbingIndex) -> tuple | list:
+    """Returns the math sets containing the math point and the nearest math sets not containing it:
+    (indices of the math sets containing the point, [(index of the nearest math set, distance), ...]),
+    or list of (math point, containing math sets, nearest math sets) for the given list of math points."""
+    if not isinstance(math_points, list):
+        return stabbing_index.sets_containing(math_points), stabbing_index.nearest_sets(math_points)
+    return [(math_point, stabbing_index.sets_containing(math_point), stabbing_index.nearest_sets(math_point))
+            for math_point in math_points]
@@ -0,0 +1,74 @@
+from errors import DataFileError
+from math_analyser.interval_set import INT_END_FLAG, INT_START_FLAG, POINT_FLAG, IntervalSet, to_interval_set
+
+
+def determine_intersection_by_sweep_line(ini_math_sets: list) -> IntervalSet:
+    """Determines the intersection of all initial math sets in a single sweep over their sorted endpoints.
+    Every endpoint of every math set is sorted once, then the coverage counter is updated at each endpoint.
+    A math range between two neighbouring endpoints (or an endpoint itself) belongs to the intersection
+    if it is covered by all initial math sets.
+    The result is the same as the one of determine_intersection_of_ini_math_ranges().
+    Returns IntervalSet with sorted math sub ranges, it is empty if there is no intersection.
+    If there are no math sets, DataFileError is raised."""
+    if not ini_math_sets:
+        raise DataFileError('No data in file')
+    all_endpoints = set()
+    int_endpoints = set()
+    range_starts = dict()
+    range_ends = dict()
+    for math_set in ini_math_sets:
+        for start, end in merge_math_ranges(to_interval_set(math_set), all_endpoints, int_endpoints):
+            range_starts[start] = range_starts.get(start, 0) + 1
+            range_ends[end] = range_ends.get(end, 0) + 1
+
+    return sweep_endpoints(sorted(all_endpoints), int_endpoints, range_starts, range_ends, len(ini_math_sets))
+
+
+def merge_math_ranges(math_set: IntervalSet, all_endpoints: set, int_endpoints: set) -> list:
+    """Returns sorted list of disjoint closed math ranges covering the inputted math set,
+    math point is represented as a range with equal endpoints.
+    Overlapping and adjacent math ranges (points) of the math set are merged.
+    All endpoints of the math set are added to the inputted set,
+    endpoints given as "int" are added to int_endpoints."""
+    all_endpoints.update(math_set.starts)
+    all_endpoints.update(math_set.ends)
+
+    merged_ranges = list()
+    for start, end, flags in zip(math_set.starts, math_set.ends, math_set.flags):
+        if flags & INT_START_FLAG:
+            int_endpoints.add(start)
+        if flags & INT_END_FLAG:
+            int_endpoints.add(end)
+
+        if merged_ranges and start <= merged_ranges[-1][1]:
+            if end > merged_ranges[-1][1]:
+                merged_ranges[-1] = (merged_ranges[-1][0], end)
+        else:
+            merged_ranges.append((start, end))
+    return merged_ranges
+
+
+def sweep_endpoints(endpoints: list, int_endpoints: set,
+                    range_starts: dict, range_ends: dict, sets_number: int) -> IntervalSet:
+    """Sweeps the sorted endpoints and returns math sub ranges covered by the given number of math sets.
+    The math range between two neighbouring endpoints is covered by the ranges opened before it,
+    the endpoint is also covered by the ranges that start at it.
+    The endpoint is added to the result only if it is not an endpoint of any resulting math range."""
+    math_intersection = IntervalSet()
+    previous_range_added = False
+    range_coverage = 0
+    for index, endpoint in enumerate(endpoints):
+        point_coverage = range_coverage + range_starts.get(endpoint, 0)
+        range_coverage = point_coverage - range_ends.get(endpoint, 0)
+
+        range_added = range_coverage == sets_number and index < len(endpoints) - 1
+        start_flag = INT_START_FLAG if endpoint in int_endpoints else 0
+        if point_coverage == sets_number and not previous_range_added and not range_added:
+            math_intersection.append(endpoint, endpoint,
+                                     POINT_FLAG | start_flag | (INT_END_FLAG if start_flag else 0))
+        if range_added:
+            end = endpoints[index + 1]
+            math_intersection.append(endpoint, end,
+                                     start_flag | (INT_END_FLAG if end in int_endpoints else 0))
+        previous_range_added = range_added
+    return math_intersection
@@ -0,0 +1,167 @@
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from json import dump as json_dump
+from os import cpu_count, scandir
+from os.path import isdir, normcase, realpath
+from time import perf_counter
+
+import run_math_sets_analyser as run_msa
+from math_analyser import parse_configuration_file
+
+
+def collect_config_files(paths: list) -> list:
+    """Returns the list of configuration files: the given files and all "*.ini" files of the given directories
+    (sorted by name) in the order they are given."""
+    config_files = list()
+    for path in paths:
+        if isdir(path):
+            with scandir(path) as dir_entries:
+                config_files.extend(sorted(dir_entry.path for dir_entry in dir_entries
+                                           if dir_entry.name.endswith('.ini') and dir_entry.is_file()))
+        else:
+            config_files.append(path)
+    return config_files
+
+
+def run_batch(config_files: list, workers: int) -> list:
+    """Runs MathSetsAnalyser for every configuration file with the pool of worker processes,
+    so the jobs are run in parallel on all CPU cores and every job has its own profiler.
+    The intersection of every data file is determined once and is passed to all configurations that use it,
+    the jobs without the shared intersection are started at once, the other ones as soon as their intersection
+    is ready. The failed job does not stop the other ones.
+    Returns the list of job summaries in the order of the configuration files:
+    configuration file, status ('OK' or 'FAILED'), error, time of getting the intersection and time of the job."""
+    jobs_summary = list()
+    jobs_config_data = list()
+    for config_file in config_files:
+        job_summary = {'config_file': config_file, 'status': 'OK', 'error': None,
+                       'data_seconds': None, 'job_seconds': None}
+        try:
+            jobs_config_data.append(parse_configuration_file(config_file))
+        except Exception as err:
+            job_summary.update(status='FAILED', error=get_error_message(err))
+            jobs_config_data.append(None)
+        jobs_summary.append(job_summary)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        intersections = dict()
+        for config_data in jobs_config_data:
+            if config_data is not None and uses_shared_intersection(config_data):
+                data_key = get_data_key(config_data)
+                if data_key not in intersections:
+                    intersections[data_key] = executor.submit(determine_shared_intersection, config_data)
+
+        jobs = list()
+        waiting_jobs = {intersection: list() for intersection in intersections.values()}
+        for job_summary, config_data in zip(jobs_summary, jobs_config_data):
+            if config_data is None:
+                continue
+            if uses_shared_intersection(config_data):
+                waiting_jobs[intersections[get_data_key(config_data)]].append((job_summary, config_data))
+            else:
+                jobs.append((job_summary, executor.submit(run_job, config_data)))
+
+        for intersection in as_completed(waiting_jobs):
+            shared_intersection = get_job_result(intersection)
+            for job_summary, config_data in waiting_jobs[intersection]:
+                jobs.append((job_summary, executor.submit(run_job, config_data, shared_intersection)))
+
+        for job_summary, job in jobs:
+            try:
+                job_summary.update(job.result())
+            except Exception as err:
+                job_summary.update(status='FAILED', error=get_error_message(err))
+    return jobs_summary
+
+
+def get_job_result(job: 'Future object') -> tuple:
+    """Returns the shared intersection determined by the worker process and the time spent on it,
+    the exception is returned instead of the intersection if the worker process failed."""
+    try:
+        return job.result()
+    except Exception as err:
+        return err, 0
+
+
+def uses_shared_intersection(config_data: 'ConfigData object') -> bool:
+    """Returns True if the job needs only the intersection of the data file ('INTS' or 'AFFL' mode),
+    the other modes read the data file by themselves."""
+    return config_data.get_analysis_modes() in (('INTS',), ('AFFL',))
+
+
+def get_data_key(config_data: 'ConfigData object') -> tuple:
+    """Returns the key of the data file, the configurations with the same key share the intersection."""
+    return normcase(realpath(config_data.get_data_file())), config_data.get_data_format()
+
+
+def determine_shared_intersection(config_data: 'ConfigData object') -> tuple:
+    """Returns the intersection of the initial math sets of the data file (or the raised exception)
+    and the time spent on it. It is run by the worker process, the result is passed back to the main one."""
+    start_time = perf_counter()
+    try:
+        math_intersection = run_msa.determine_initial_math_sets_intersection(config_data)
+    except Exception as err:
+        math_intersection = err
+    return math_intersection, perf_counter() - start_time
+
+
+def run_job(config_data: 'ConfigData object', shared_intersection: tuple = None) -> dict:
+    """Runs MathSetsAnalyser with the shared intersection of the initial math sets in the worker process,
+    the shared intersection is the result of determine_shared_intersection().
+    The job without the shared intersection reads the data file by itself.
+    Returns the summary of the job."""
+    start_time = perf_counter()
+    math_intersection = None
+    job_summary = {'data_seconds': None}
+    if shared_intersection is not None:
+        math_intersection, data_seconds = shared_intersection
+        job_summary['data_seconds'] = round(data_seconds, 6)
+    try:
+        if isinstance(math_intersection, Exception):
+            raise math_intersection
+        run_msa.main(config_data, math_intersection)
+    except Exception as err:
+        job_summary.update(status='FAILED', error=get_error_message(err))
+    job_summary['job_seconds'] = round(perf_counter() - start_time, 6)
+    return job_summary
+
+
+def get_error_message(err: Exception) -> str:
+    """Returns the error message with its notes."""
+    return '\n'.join([str(err), *getattr(err, '__notes__', ())])
+
+
+def write_batch_summary(summary_file: str, jobs_summary: list, total_seconds: float) -> None:
+    """Writes the batch summary to JSON file: the number of done and failed jobs, total time and job summaries."""
+    failed_jobs = sum(job_summary['status'] == 'FAILED' for job_summary in jobs_summary)
+    batch_summary = {'jobs': len(jobs_summary),
+                     'done': len(jobs_summary) - failed_jobs,
+                     'failed': failed_jobs,
+                     'total_seconds': round(total_seconds, 6),
+                     'results': jobs_summary}
+    with open(summary_file, 'w') as file_to_write:
+        json_dump(batch_summary, file_to_write, indent=4)
+
+
+def main():
+    """The script runs MathSetsAnalyser for many configuration files with the pool of worker processes.
+    The configuration files are given as paths to files or directories with "*.ini" files.
+    The summary with the status and timings of every job is written to JSON file."""
+    argument_parser = ArgumentParser(description='Runs MathSetsAnalyser for many configuration files.')
+    argument_parser.add_argument('paths', nargs='+', help='configuration files or directories with "*.ini" files')
+    argument_parser.add_argument('--workers', type=int, default=cpu_count() or 1,
+                                 help='number of worker processes')
+    argument_parser.add_argument('--summary', default='batch_summary.json', help='path to the summary file')
+    arguments = argument_parser.parse_args()
+
+    start_time = perf_counter()
+    jobs_summary = run_batch(collect_config_files(arguments.paths), arguments.workers)
+    write_batch_summary(arguments.summary, jobs_summary, perf_counter() - start_time)
+
+    failed_jobs = sum(job_summary['status'] == 'FAILED' for job_summary in jobs_summary)
+    print(f'Done {len(jobs_summary) - failed_jobs} of {len(jobs_summary)} jobs, '
+          f'the summary is written to "{arguments.summary}".')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,13 @@
+from contextlib import closing
 from pathlib import Path
 from os.path import join as os_path_join
+from os.path import splitext
 
 from math_analyser import *
 
 
-def main(script_config_data: 'ConfigData object'):
+def main(script_config_data: 'ConfigData object', math_intersection: IntervalSet = None,
+         metrics_callback: 'Callable object' = None):
     """Firstly, the script parses configuration data file (config.ini) and defines the main parameters:
         data file type
         path to data file
@@ -18,38 +21,193 @@ def main(script_config_data: 'ConfigData object'):
 
     The 'AFFL' mode checks  if a given point belongs to the math intersection,
     or determines the nearest endpoint(s) and outputs the result to a given file.
+
+    The 'UNION', 'COMPL' and 'DIFF' modes output the union of the math sets, its complement
+    and the difference of the first math set and the other ones.
+    The 'COVER' mode outputs the math ranges covered by at least k math sets,
+    the 'DEPTH' mode outputs the coverage depth of every region of the number line.
+    The 'STAB' mode outputs the math sets containing the predetermined point (points) and the nearest math sets
+    not containing it.
+    If several modes are given, the data file is read once, all results are determined by one sweep
+    and every result is written to its own file (see get_mode_output_file_path()).
+
+    If the intersection of the initial math sets is already determined (for example, by the batch runner),
+    it is used instead of reading the data file.
+
+    The timing of every stage and the counters of the run are passed to the metrics callback
+    and written to the metrics file (if any of them is given), the run is profiled if the profile file is given.
     """
-    if script_config_data.get_analysis_mode() == 'INTS':
-        process_mode_intersection(script_config_data)
-    elif script_config_data.get_analysis_mode() == 'AFFL':
-        process_mode_affiliation(script_config_data)
+    if metrics_callback is not None or script_config_data.get_metrics_file() is not None:
+        instrumentation = Instrumentation(metrics_callback)
     else:
-        assert False, ('Internal error! main()'
-                       '\nscript_config_data.get_analysis_mode() not INTS / AFFL')
+        instrumentation = NO_INSTRUMENTATION
+    with profile_run(script_config_data.get_profile_file()), instrumentation.span('run'):
+        if script_config_data.get_analysis_modes() == ('INTS',):
+            process_mode_intersection(script_config_data, math_intersection, instrumentation)
+        elif script_config_data.get_analysis_modes() == ('AFFL',):
+            process_mode_affiliation(script_config_data, math_intersection, instrumentation)
+        else:
+            process_several_modes(script_config_data, instrumentation)
+    if script_config_data.get_metrics_file() is not None:
+        instrumentation.write_metrics(script_config_data.get_metrics_file())
 
 
-def determine_initial_math_sets_intersection(script_config_data: 'ConfigData object') -> list:
-    """Returns sorted intersection of initial math sets."""
-    ini_math_sets = get_initial_math_sets(script_config_data)
-    math_sets_intersection = determine_intersection_of_ini_math_ranges(ini_math_sets,
-                                                                       0, list())
-    if not math_sets_intersection:
-        return [None]
+def determine_initial_math_sets_intersection(script_config_data: 'ConfigData object',
+                                             instrumentation: Instrumentation = NO_INSTRUMENTATION) -> IntervalSet:
+    """Returns sorted intersection of initial math sets, it is empty if there is no intersection.
+    If the cache directory is given, the intersection of the unchanged data file is loaded from the cache."""
+    if script_config_data.get_cache_dir() is None:
+        return calculate_initial_math_sets_intersection(script_config_data, instrumentation)
+
+    with instrumentation.span('cache_load'):
+        result_cache = ResultCache(script_config_data.get_cache_dir(),
+                                   script_config_data.get_cache_size() * 2 ** 20)
+        cache_key = result_cache.get_key(script_config_data.get_data_file(), script_config_data.get_data_format())
+        math_sets_intersection = result_cache.load(cache_key)
+    if math_sets_intersection is None:
+        math_sets_intersection = calculate_initial_math_sets_intersection(script_config_data, instrumentation)
+        with instrumentation.span('cache_store'):
+            result_cache.store(cache_key, math_sets_intersection)
     return math_sets_intersection
 
 
-def process_mode_intersection(script_config_data: 'ConfigData object'):
+def calculate_initial_math_sets_intersection(script_config_data: 'ConfigData object',
+                                             instrumentation: Instrumentation = NO_INSTRUMENTATION) -> IntervalSet:
+    """Gets initial math sets from the data file and calculates their intersection with the chosen backend.
+    In the streaming mode, the math sets are folded while the data file is read.
+    If more than one worker is given, chunks of the math sets (or slices of the number line)
+    are intersected in parallel processes.
+    If the memory limit is given, the endpoints of the math sets are sorted in external memory (temporary files),
+    while the metrics are collected, the peak of the memory allocated by the intersection is traced
+    and counted as 'peak_memory_bytes'.
+    The math sets are validated while they are parsed, so the span of getting them includes the verification."""
+    if script_config_data.get_memory_limit() is not None:
+        memory_limit = script_config_data.get_memory_limit() * 2 ** 20
+        with (instrumentation.span('external_memory_intersection'),
+              closing(iter_initial_math_sets(script_config_data)) as ini_math_sets):
+            if not instrumentation.enabled:
+                return determine_intersection_in_external_memory(ini_math_sets, memory_limit)
+            math_intersection, peak_memory = trace_peak_memory(determine_intersection_in_external_memory,
+                                                               ini_math_sets, memory_limit)
+        instrumentation.count('peak_memory_bytes', peak_memory)
+        return math_intersection
+
+    if script_config_data.get_streaming():
+        with (instrumentation.span('streaming_intersection'),
+              closing(iter_initial_math_sets(script_config_data)) as ini_math_sets):
+            return determine_intersection_of_math_sets_stream(ini_math_sets)
+
+    with instrumentation.span('get_initial_math_sets'):
+        ini_math_sets = get_initial_math_sets_with_sidecar(script_config_data)
+    instrumentation.count_math_sets(ini_math_sets)
+    with instrumentation.span('intersection'):
+        return determine_intersection_of_initial_math_sets(script_config_data, ini_math_sets)
+
+
+def determine_intersection_of_initial_math_sets(script_config_data: 'ConfigData object',
+                                                ini_math_sets: list) -> IntervalSet:
+    """Returns the intersection of the initial math sets with the backend, workers and partition
+    of the configuration."""
+    if script_config_data.get_backend() == 'NUMPY':
+        determine_intersection = determine_intersection_with_numpy
+    else:
+        determine_intersection = determine_intersection_by_sweep_line
+    if script_config_data.get_workers() > 1 and script_config_data.get_partition() == 'DOMAIN':
+        return determine_intersection_by_domain_slices(ini_math_sets, script_config_data.get_workers(),
+                                                       determine_intersection)
+    if script_config_data.get_workers() > 1:
+        return determine_intersection_in_parallel(ini_math_sets, script_config_data.get_workers(),
+                                                  determine_intersection)
+    return determine_intersection(ini_math_sets)
+
+
+def process_mode_intersection(script_config_data: 'ConfigData object', math_sets_intersection: IntervalSet = None,
+                              instrumentation: Instrumentation = NO_INSTRUMENTATION, output_file_path: str = None):
     """Determines and outputs file with the intersection of initial math sets."""
-    math_sets_intersection = determine_initial_math_sets_intersection(script_config_data)
-    output_script_data(script_config_data, math_sets_intersection)
+    if math_sets_intersection is None:
+        math_sets_intersection = determine_initial_math_sets_intersection(script_config_data, instrumentation)
+    instrumentation.count('result_size', len(math_sets_intersection))
+    with instrumentation.span('output_script_data'):
+        output_script_data(script_config_data, math_sets_intersection, output_file_path)
+
+
+def process_mode_affiliation(script_config_data: 'ConfigData object', math_intersection: IntervalSet = None,
+                             instrumentation: Instrumentation = NO_INSTRUMENTATION, output_file_path: str = None):
+    """Determines and outputs file with the nearest endpoint(s) to predetermined point.
+    If the file with math points is given, all points are answered at once against the same intersection."""
+    if math_intersection is None:
+        math_intersection = determine_initial_math_sets_intersection(script_config_data, instrumentation)
+    instrumentation.count('result_size', len(math_intersection))
+    if script_config_data.get_points_file() is not None:
+        with instrumentation.span('get_math_points'):
+            math_points = get_math_points(script_config_data)
+        instrumentation.count('points', len(math_points))
+        with instrumentation.span('closest_points'):
+            result_data = determine_closest_points_of_math_intersection(math_points, math_intersection)
+    elif script_config_data.get_backend() == 'NUMPY':
+        with instrumentation.span('closest_points'):
+            result_data = determine_closest_point_with_numpy(script_config_data.get_math_point(), math_intersection)
+    else:
+        with instrumentation.span('closest_points'):
+            result_data = determine_closest_point_of_math_intersection(script_config_data.get_math_point(),
+                                                                       math_intersection)
+    with instrumentation.span('output_script_data'):
+        output_script_data(script_config_data, result_data, output_file_path)
+
+
+def process_several_modes(script_config_data: 'ConfigData object',
+                          instrumentation: Instrumentation = NO_INSTRUMENTATION):
+    """Determines the results of all analysis modes by one sweep over the initial math sets
+    and outputs every result to its own file ('AFFL' mode uses the intersection of 'INTS' mode).
+    The stabbing index of the math sets is built for 'STAB' mode right after they are read."""
+    analysis_modes = script_config_data.get_analysis_modes()
+    with instrumentation.span('get_initial_math_sets'):
+        ini_math_sets = get_initial_math_sets_with_sidecar(script_config_data)
+    instrumentation.count_math_sets(ini_math_sets)
+    if 'STAB' in analysis_modes:
+        with instrumentation.span('stabbing_index'):
+            stabbing_index = StabbingIndex(ini_math_sets)
+
+    coverage_modes = tuple(analysis_mode for analysis_mode in COVERAGE_MODES
+                           if analysis_mode in analysis_modes
+                           or analysis_mode == 'INTS' and 'AFFL' in analysis_modes)
+    with instrumentation.span('coverage_sweep'):
+        results = determine_coverage_by_sweep_line(ini_math_sets, coverage_modes, script_config_data.get_cover_k())
+
+    for analysis_mode in analysis_modes:
+        output_file_path = get_mode_output_file_path(script_config_data, analysis_mode)
+        if analysis_mode == 'AFFL':
+            process_mode_affiliation(script_config_data, results['INTS'], instrumentation, output_file_path)
+        elif analysis_mode == 'STAB':
+            process_mode_stabbing(script_config_data, stabbing_index, instrumentation, output_file_path)
+        else:
+            process_mode_intersection(script_config_data, results[analysis_mode], instrumentation, output_file_path)
+
+
+def process_mode_stabbing(script_config_data: 'ConfigData object', stabbing_index: StabbingIndex,
+                          instrumentation: Instrumentation = NO_INSTRUMENTATION, output_file_path: str = None):
+    """Determines and outputs file with the math sets containing the predetermined point
+    and the nearest math sets not containing it. If the file with math points is given, all points are answered."""
+    if script_config_data.get_points_file() is not None:
+        with instrumentation.span('get_math_points'):
+            math_points = get_math_points(script_config_data).tolist()
+        instrumentation.count('points', len(math_points))
+    else:
+        math_points = script_config_data.get_math_point()
+    with instrumentation.span('stabbing_queries'):
+        result_data = determine_sets_of_math_points(math_points, stabbing_index)
+    with instrumentation.span('output_script_data'):
+        output_script_data(script_config_data, result_data, output_file_path)
 
 
-def process_mode_affiliation(script_config_data: 'ConfigData object'):
-    """Determines and outputs file with the nearest endpoint(s) to predetermined point."""
-    math_intersection = determine_initial_math_sets_intersection(script_config_data)
-    math_point = script_config_data.get_math_point()
-    result_data = determine_closest_point_of_math_intersection(math_point, math_intersection)
-    output_script_data(script_config_data, result_data)
+def get_mode_output_file_path(script_config_data: 'ConfigData object', analysis_mode: str) -> str:
+    """Returns the path to the output file of the analysis mode, it is the path of the configuration
+    if only one mode is given, otherwise the mode is added to the name (for example: output_file_union.txt)."""
+    output_file_path = script_config_data.get_output_file_path()
+    if len(script_config_data.get_analysis_modes()) == 1:
+        return output_file_path
+    output_file_name, output_file_type = splitext(output_file_path)
+    return f'{output_file_name}_{analysis_mode.lower()}{output_file_type}'
 
 
 if __name__ == '__main__':
@@ -0,0 +1,35 @@
+from argparse import ArgumentParser
+from asyncio import run as asyncio_run
+from concurrent.futures import ProcessPoolExecutor
+
+from math_analyser import AnalyserService, start_analyser_server
+
+
+async def serve(host: str, port: int, unix_socket: str, workers: int) -> None:
+    """Starts the service and serves the requests until the process is stopped."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        server = await start_analyser_server(AnalyserService(executor), host, port, unix_socket)
+        print(f'MathSetsAnalyser service is listening on {unix_socket or f"http://{host}:{port}"}')
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """The script runs MathSetsAnalyser as a long-running HTTP service on the local port or Unix socket.
+    The intersections of the data files are kept in memory, so the repeated requests are answered without
+    reading the data file again. The data files are read and analysed by the pool of worker processes."""
+    argument_parser = ArgumentParser(description='Runs MathSetsAnalyser as HTTP service.')
+    argument_parser.add_argument('--host', default='127.0.0.1', help='host to listen on')
+    argument_parser.add_argument('--port', type=int, default=8765, help='port to listen on')
+    argument_parser.add_argument('--unix', dest='unix_socket',
+                                 help='path to Unix socket to listen on instead of the port')
+    argument_parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    arguments = argument_parser.parse_args()
+    try:
+        asyncio_run(serve(arguments.host, arguments.port, arguments.unix_socket, arguments.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -6,7 +6,7 @@ from os.path import abspath, dirname
 from os.path import join as os_path_join
 from tempfile import TemporaryDirectory
 
-from bs4 import BeautifulSoup
+from lxml.etree import parse as parse_xml
 
 import run_math_sets_analyser as run_msa
 from math_analyser import parse_configuration_file
@@ -79,6 +79,21 @@ def create_config_file_for_affl_mode(input_file_path: str, input_data: dict) ->
         test_config_ini.write(config_file)
 
 
+def create_config_file_for_batch_affl_mode(input_file_path: str, input_data: dict) -> None:
+    """Creates at given path config file for AFFL mode with the file of math points."""
+    test_config_ini = ConfigParser()
+
+    test_config_ini['general'] = {'mode': 'AFFL'}
+    test_config_ini['input'] = {'format': input_data['data_format'],
+                                'path': input_data['data_file']}
+    test_config_ini['points'] = {'format': input_data['points_format'],
+                                 'path': input_data['points_file']}
+    test_config_ini['output'] = {'format': input_data['output_file_format'],
+                                 'path': input_data['output_file_path']}
+    with open(input_file_path, 'w') as config_file:
+        test_config_ini.write(config_file)
+
+
 def create_json_test_data_file(input_file: str, input_data: list) -> None:
     """Creates JSON data file at given path."""
     with open(input_file, 'w') as json_data_file:
@@ -101,12 +116,8 @@ def read_txt_file(input_file: str) -> str:
 
 def read_xml_file(input_file: str) -> str:
     """Returns dict object with data from inputted XML file."""
-    with open(input_file) as xml_file:
-        file_data = xml_file.read()
-    bs_object = BeautifulSoup(file_data, 'lxml')
-    output_xml_file = bs_object.find('outputdata')
-    file_data = output_xml_file.find('value').get_text()
-    return file_data
+    output_xml_file = parse_xml(input_file).getroot()
+    return output_xml_file.findtext('value')
 
 
 def ints_mode_using_temp_files(ini_math_sets: list) -> list:
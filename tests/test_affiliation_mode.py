@@ -1,4 +1,6 @@
-from math_analyser import determine_intersection_of_ini_math_ranges, determine_closest_point_of_math_intersection
+from math_analyser import (determine_intersection_of_ini_math_ranges,
+                           determine_closest_point_of_math_intersection,
+                           determine_closest_points_of_math_intersection)
 
 
 semi_infinite_math_sets = [[(-89, -61), (-12, float('inf'))],
@@ -117,3 +119,18 @@ def test_closest_endpoint_for_numeric_math_intersection():
                                                               numeric_math_intersection)
         assert result == test_result
 
+
+def test_closest_endpoints_for_batch_of_math_points():
+    """'AFFL' mode for the batch of unsorted math points gives the same results as for every single point."""
+    batch_math_points = math_points_2[::-1] + math_points_1
+    test_result = determine_closest_points_of_math_intersection(batch_math_points, numeric_math_intersection)
+    assert test_result == [(math_point,
+                            determine_closest_point_of_math_intersection(math_point, numeric_math_intersection))
+                           for math_point in batch_math_points]
+
+
+def test_batch_of_math_points_without_intersection():
+    """'AFFL' mode for the batch of math points and math sets without intersection."""
+    math_intersection = determine_intersection_of_ini_math_ranges(math_sets_without_intersection)
+    test_result = determine_closest_points_of_math_intersection([-1, 4], math_intersection)
+    assert test_result == [(-1, [None]), (4, [None])]
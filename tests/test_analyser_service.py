@@ -0,0 +1,71 @@
+from asyncio import open_connection, run as asyncio_run
+from concurrent.futures import ThreadPoolExecutor
+from json import loads as json_loads
+from os.path import join as os_path_join
+
+from pytest import raises
+
+from errors import DataFileError
+from math_analyser import AnalyserService, start_analyser_server
+from tests.settings import TemporaryDirectory, create_json_test_data_file
+
+input_data = ["[(float('-inf'), -10), (10, float('inf'))]",
+              "[(-77, 61)]",
+              "[(-89, -61), (-43, -12), (10, 27), (61, 72)]"]
+
+
+def test_service_api():
+    """The intersection of the data file is determined once and is kept in memory until the data file is changed."""
+    async def use_service(test_data_file: str) -> None:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            service = AnalyserService(executor)
+            test_intersection = await service.determine_intersection(test_data_file, 'json')
+            assert str(test_intersection.to_list()) == '[(-77, -61), (-43, -12)]'
+            assert await service.determine_intersection(test_data_file, 'JSON') is test_intersection
+            assert await service.determine_closest_points(test_data_file, 'JSON', -1) == [-12]
+            assert await service.determine_closest_points(test_data_file, 'JSON', [-1, -50]) == [(-1.0, [-12]),
+                                                                                               (-50.0, [-43])]
+            with raises(DataFileError):
+                await service.determine_closest_points(test_data_file, 'JSON', float('inf'))
+
+            create_json_test_data_file(test_data_file, input_data)
+            test_intersection = await service.determine_intersection(test_data_file, 'JSON')
+            assert str(test_intersection.to_list()) == '[(-77, -61), (-43, -12), (10, 27), 61]'
+
+    with TemporaryDirectory() as temp_dir:
+        test_data_file = os_path_join(temp_dir, 'data file')
+        create_json_test_data_file(test_data_file, input_data + ["[(-80, 0)]"])
+        asyncio_run(use_service(test_data_file))
+
+
+def test_service_over_http():
+    """The requests of 'INTS' and 'AFFL' modes are answered over HTTP in the same connection."""
+    async def send_requests(test_data_file: str) -> list:
+        service = AnalyserService()
+        async with await start_analyser_server(service, port=0) as server:
+            host, port = server.sockets[0].getsockname()[:2]
+            reader, writer = await open_connection(host, port)
+            responses = list()
+            for path, request_body in (
+                    ('/ints', f'{{"data_file": "{test_data_file}", "format": "JSON"}}'),
+                    ('/affl', f'{{"data_file": "{test_data_file}", "format": "JSON", "point": -1}}'),
+                    ('/affl', f'{{"data_file": "{test_data_file}", "format": "JSON"}}')):
+                writer.write(f'POST {path} HTTP/1.1\r\nContent-Length: {len(request_body)}\r\n\r\n'
+                             f'{request_body}'.encode())
+                status_line = await reader.readline()
+                headers = dict()
+                while (header_line := await reader.readline()).strip():
+                    header_name, separator, header_value = header_line.decode().partition(':')
+                    headers[header_name.lower()] = header_value.strip()
+                response_body = await reader.readexactly(int(headers['content-length']))
+                responses.append((status_line.split()[1], json_loads(response_body)))
+            writer.close()
+            return responses
+
+    with TemporaryDirectory() as temp_dir:
+        test_data_file = os_path_join(temp_dir, 'data file')
+        create_json_test_data_file(test_data_file, input_data)
+        test_responses = asyncio_run(send_requests(test_data_file))
+    assert test_responses[0] == (b'200', {'result': '[(-77, -61), (-43, -12), (10, 27), 61]'})
+    assert test_responses[1] == (b'200', {'result': '[-12, 10]'})
+    assert test_responses[2][0] == b'400'
@@ -0,0 +1,56 @@
+from json import load as json_load
+from os.path import join as os_path_join
+
+import run_batch
+from tests.settings import (TemporaryDirectory,
+                            create_config_file_for_affl_mode,
+                            create_config_file_for_ints_mode,
+                            create_json_test_data_file,
+                            read_txt_file,
+                            read_xml_file)
+
+input_data = ["[(float('-inf'), -10), (10, float('inf'))]",
+              "[(-77, 61)]",
+              "[(-89, -61), (-43, -12), (10, 27), (61, 72)]"]
+
+
+def test_batch_run():
+    """All configuration files of the directory are run, the jobs with the same data file share the intersection,
+    the failed job does not stop the other ones."""
+    with TemporaryDirectory() as temp_dir:
+        test_data_file = os_path_join(temp_dir, 'data file')
+        create_json_test_data_file(test_data_file, input_data)
+        create_config_file_for_ints_mode(os_path_join(temp_dir, '1.ini'),
+                                         {'analysis_mode': 'INTS',
+                                          'data_format': 'JSON',
+                                          'data_file': test_data_file,
+                                          'output_file_format': 'TXT',
+                                          'output_file_path': os_path_join(temp_dir, 'ints output')})
+        create_config_file_for_affl_mode(os_path_join(temp_dir, '2.ini'),
+                                         {'analysis_mode': 'AFFL',
+                                          'math_point': -1,
+                                          'data_format': 'JSON',
+                                          'data_file': test_data_file,
+                                          'output_file_format': 'XML',
+                                          'output_file_path': os_path_join(temp_dir, 'affl output')})
+        create_config_file_for_ints_mode(os_path_join(temp_dir, '3.ini'),
+                                         {'analysis_mode': 'INTS',
+                                          'data_format': 'PDF',
+                                          'data_file': test_data_file,
+                                          'output_file_format': 'TXT',
+                                          'output_file_path': os_path_join(temp_dir, 'invalid output')})
+
+        test_config_files = run_batch.collect_config_files([temp_dir])
+        assert test_config_files == [os_path_join(temp_dir, f'{number}.ini') for number in (1, 2, 3)]
+
+        test_summary = run_batch.run_batch(test_config_files, 2)
+        assert [job_summary['status'] for job_summary in test_summary] == ['OK', 'OK', 'FAILED']
+        assert 'section [input]' in test_summary[2]['error']
+        assert read_txt_file(os_path_join(temp_dir, 'ints output.txt')) == '[(-77, -61), (-43, -12), (10, 27), 61]'
+        assert read_xml_file(os_path_join(temp_dir, 'affl output.xml')) == '[-12, 10]'
+
+        test_summary_file = os_path_join(temp_dir, 'summary.json')
+        run_batch.write_batch_summary(test_summary_file, test_summary, 1.5)
+        with open(test_summary_file) as summary_file:
+            batch_summary = json_load(summary_file)
+        assert (batch_summary['jobs'], batch_summary['done'], batch_summary['failed']) == (3, 2, 1)
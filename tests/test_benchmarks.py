@@ -0,0 +1,71 @@
+from os.path import join as os_path_join
+
+from pytest import raises
+
+from benchmarks.generate_workload import WORKLOAD_SHAPES, generate_math_sets, write_data_file
+from benchmarks.run_benchmarks import BENCHMARK_STAGES, compare_with_baseline, get_workloads_without_baseline
+from benchmarks.run_benchmarks import main as run_benchmarks_main
+from benchmarks.run_benchmarks import run_benchmarks
+from math_analyser import determine_intersection_by_sweep_line, read_initial_math_sets
+
+
+def test_generated_workloads(tmp_path):
+    """Every workload shape is the same for the same seed and is read from every data format."""
+    for shape in WORKLOAD_SHAPES:
+        math_sets = generate_math_sets(shape, 20, 10, seed=1)
+        assert math_sets == generate_math_sets(shape, 20, 10, seed=1)
+        ini_math_sets = list()
+        for data_format in ('JSON', 'TXT', 'XML'):
+            data_file = os_path_join(tmp_path, f'{shape}.{data_format.lower()}')
+            write_data_file(math_sets, data_format, data_file)
+            ini_math_sets.append(read_initial_math_sets(data_file, data_format))
+        assert len(ini_math_sets[0]) == 20
+        assert ini_math_sets[0] == ini_math_sets[1] == ini_math_sets[2]
+
+        math_intersection = determine_intersection_by_sweep_line(ini_math_sets[0])
+        if shape == 'empty_result':
+            assert not math_intersection
+        elif shape in ('clustered', 'fragmented', 'semi_infinite'):
+            assert math_intersection
+
+
+def test_run_benchmarks():
+    """Every stage of every workload is timed and traced."""
+    benchmark_results = run_benchmarks(['fragmented'], ['TXT', 'BIN'], 10, 5, points_number=100, repeat=1)
+    assert list(benchmark_results) == ['fragmented-TXT-10x5', 'fragmented-BIN-10x5']
+    for workload_result in benchmark_results.values():
+        assert workload_result['sets'] == 10
+        assert workload_result['intersection_subranges'] == 5
+        for measure in ('seconds', 'throughput', 'peak_memory_bytes'):
+            assert list(workload_result[measure]) == list(BENCHMARK_STAGES)
+
+
+def test_compare_with_baseline():
+    """The stage that is slower than the baseline by more than the tolerance is a regression."""
+    benchmark_results = {'uniform-TXT-10x5': {'seconds': {'parse': 1.2, 'intersect': 2.0},
+                                              'peak_memory_bytes': {'parse': 100, 'intersect': 100}},
+                         'uniform-XML-10x5': {'seconds': {'parse': 5.0}, 'peak_memory_bytes': {'parse': 100}}}
+    baseline = {'uniform-TXT-10x5': {'seconds': {'parse': 1.0, 'intersect': 1.0},
+                                     'peak_memory_bytes': {'parse': 100}}}
+    assert compare_with_baseline(benchmark_results, baseline, 0.25) == [('uniform-TXT-10x5', 'intersect seconds',
+                                                                         1.0, 2.0)]
+    assert compare_with_baseline(benchmark_results, baseline, 1.5) == []
+    assert get_workloads_without_baseline(benchmark_results, baseline) == ['uniform-XML-10x5']
+
+
+def test_missing_baseline(tmp_path, monkeypatch, capsys):
+    """Without the baseline file the benchmarks end with NO BASELINE status instead of "No regressions found"."""
+    baseline_file = os_path_join(tmp_path, 'baseline.json')
+    arguments = ['run_benchmarks', '--sets', '3', '--ranges', '2', '--shapes', 'uniform', '--formats', 'TXT',
+                 '--points', '10', '--repeat', '1', '--tolerance', '1000', '--baseline', baseline_file]
+    monkeypatch.setattr('sys.argv', arguments)
+    with raises(SystemExit) as exit_info:
+        run_benchmarks_main()
+    assert exit_info.value.code == 2
+    assert 'NO BASELINE' in capsys.readouterr().out
+
+    monkeypatch.setattr('sys.argv', arguments + ['--update-baseline'])
+    run_benchmarks_main()
+    monkeypatch.setattr('sys.argv', arguments)
+    run_benchmarks_main()
+    assert capsys.readouterr().out.endswith('No regressions found.\n')
@@ -120,3 +120,73 @@ def test_infinity_point_2(test_config_parameters):
     test_config_data = ConfigFileData(**test_config_parameters)
     with raises(ConfigFileError):
         test_config_data.verify_config_data()
+
+
+def test_points_file_not_found(test_config_parameters):
+    """The file with math points for AFFL mode does not exist."""
+    test_config_parameters['analysis_mode'] = 'AFFL'
+    test_config_parameters['points_format'] = 'TXT'
+    test_config_parameters['points_file'] = TestData.get_invalid_file_path()
+    test_config_data = ConfigFileData(**test_config_parameters)
+    with raises(DataFileError):
+        test_config_data.verify_config_data()
+
+
+def test_invalid_points_file_format(test_config_parameters):
+    """The format of the file with math points for AFFL mode is invalid."""
+    test_config_parameters['analysis_mode'] = 'AFFL'
+    test_config_parameters['points_format'] = 'XML'
+    test_config_parameters['points_file'] = TestData.get_xml_test_data_file()
+    test_config_data = ConfigFileData(**test_config_parameters)
+    with raises(ConfigFileError):
+        test_config_data.verify_config_data()
+
+
+def test_invalid_workers_number(test_config_parameters):
+    """The number of worker processes is not a positive integer."""
+    for test_workers in ('many', 0):
+        test_config_parameters['workers'] = test_workers
+        test_config_data = ConfigFileData(**test_config_parameters)
+        with raises(ConfigFileError):
+            test_config_data.verify_config_data()
+
+
+def test_invalid_partition(test_config_parameters):
+    """The way the work is split between the workers is not SETS or DOMAIN."""
+    test_config_parameters['partition'] = 'ranges'
+    test_config_data = ConfigFileData(**test_config_parameters)
+    with raises(ConfigFileError):
+        test_config_data.verify_config_data()
+
+
+def test_invalid_memory_limit(test_config_parameters):
+    """The memory limit is not a positive number of megabytes."""
+    for test_memory_limit in ('8GB', 0):
+        test_config_parameters['memory_limit'] = test_memory_limit
+        test_config_data = ConfigFileData(**test_config_parameters)
+        with raises(ConfigFileError):
+            test_config_data.verify_config_data()
+
+
+def test_conflicting_engine_options(test_config_parameters):
+    """The memory limit and streaming cannot be combined with each other, the workers, the NumPy backend
+    or the sidecar cache, the options would be ignored."""
+    for reading_option in ({'memory_limit': 8}, {'streaming': 'yes'}):
+        for conflicting_option, option_name in (({'streaming': 'yes'}, 'streaming'), ({'workers': 2}, 'workers'),
+                                                ({'backend': 'numpy'}, 'backend'), ({'sidecar': 'yes'}, 'sidecar'),
+                                                ({'sidecar_dir': 'sidecars'}, 'sidecar')):
+            if reading_option == conflicting_option:
+                continue
+            test_config_data = ConfigFileData(**test_config_parameters, **reading_option, **conflicting_option)
+            with raises(ConfigFileError, match=f'"{option_name}"'):
+                test_config_data.verify_config_data()
+        test_config_data = ConfigFileData(**test_config_parameters, **reading_option, partition='domain')
+        test_config_data.verify_config_data()
+
+
+def test_positional_parameters():
+    """The parameters added later are trailing keywords, so the positional parameters keep their places."""
+    test_config_data = ConfigFileData('JSON', TestData.get_json_test_data_file(), 'TXT', TestData.get_output_file(),
+                                      'AFFL', None, 'python', 'TXT', 'math points.txt')
+    assert test_config_data.get_points_format() == 'TXT'
+    assert test_config_data.get_points_file() == 'math points.txt'
@@ -0,0 +1,127 @@
+from configparser import ConfigParser
+from os.path import join as os_path_join
+
+from pytest import raises
+
+import run_math_sets_analyser as run_msa
+from errors import ConfigFileError
+from math_analyser import (ConfigFileData, determine_coverage_by_sweep_line, determine_intersection_by_sweep_line,
+                           parse_configuration_file, parse_math_set)
+from math_analyser.sweep_line import merge_math_ranges
+from tests.settings import create_json_test_data_file, read_txt_file
+
+math_sets = [[(-89, -61), -50, (-43, -12), (10, 27), (61, 72)],
+             [(-77, 0), 61.5],
+             [(-20.5, 15), 100]]
+input_data = ["[(-89, -61), -50, (-43, -12), (10, 27), (61, 72)]",
+              "[(-77, 0), 61.5]",
+              "[(-20.5, 15), 100]"]
+
+
+def test_coverage_modes():
+    """The union, complement and difference are the largest math ranges, the intersection is the same
+    as the one of the sweep line. The math ranges of the complement and the difference are written
+    in the interval notation, the endpoints of the removed math sets are excluded."""
+    results = determine_coverage_by_sweep_line(math_sets, ('INTS', 'UNION', 'COMPL', 'DIFF'))
+    assert results['INTS'] == determine_intersection_by_sweep_line(math_sets)
+    assert str(results['UNION'].to_list()) == '[(-89, 27), (61, 72), 100]'
+    assert str(results['COMPL'].to_list()) == '[(-inf, -89), (27, 61), (72, 100), (100, inf)]'
+    assert str(results['DIFF'].to_list()) == '[[-89, -77), (15, 27], [61, 61.5), (61.5, 72]]'
+
+
+def test_infinite_coverage():
+    """The complement of the whole number line is empty, the complement of the empty line is the whole one."""
+    results = determine_coverage_by_sweep_line([[(float('-inf'), -10), (10, float('inf'))], [(-77, 61)]],
+                                               ('UNION', 'COMPL', 'DIFF'))
+    assert results['UNION'].to_list() == [(float('-inf'), float('inf'))]
+    assert results['COMPL'].to_list() == [None]
+    assert results['DIFF'].to_list() == [(float('-inf'), -77), (61, float('inf'))]
+    assert determine_coverage_by_sweep_line([[5]], ('COMPL',))['COMPL'].to_list() == [(float('-inf'), 5),
+                                                                                     (5, float('inf'))]
+
+
+def test_several_modes_full_run(tmp_path):
+    """Every result of several modes is written to its own file."""
+    test_config_ini = ConfigParser()
+    test_config_ini['general'] = {'mode': 'UNION, COMPL, DIFF, AFFL', 'point': '-1'}
+    test_config_ini['input'] = {'format': 'JSON', 'path': os_path_join(tmp_path, 'data file.json')}
+    test_config_ini['output'] = {'format': 'TXT', 'path': os_path_join(tmp_path, 'output file')}
+    with open(os_path_join(tmp_path, 'config.ini'), 'w') as config_file:
+        test_config_ini.write(config_file)
+    create_json_test_data_file(os_path_join(tmp_path, 'data file.json'), input_data)
+
+    run_msa.main(parse_configuration_file(os_path_join(tmp_path, 'config.ini')))
+    assert read_txt_file(os_path_join(tmp_path, 'output file_union.txt')) == '[(-89, 27), (61, 72), 100]'
+    assert (read_txt_file(os_path_join(tmp_path, 'output file_compl.txt'))
+            == '[(-inf, -89), (27, 61), (72, 100), (100, inf)]')
+    assert (read_txt_file(os_path_join(tmp_path, 'output file_diff.txt'))
+            == '[[-89, -77), (15, 27], [61, 61.5), (61.5, 72]]')
+    assert read_txt_file(os_path_join(tmp_path, 'output file_affl.txt')) == '[-12]'
+
+
+def test_invalid_several_modes(tmp_path):
+    """Every one of several modes must be valid."""
+    data_file = os_path_join(tmp_path, 'data file.json')
+    create_json_test_data_file(data_file, input_data)
+    test_config_data = ConfigFileData('JSON', data_file, 'TXT', os_path_join(tmp_path, 'output'),
+                                      'UNION, ALL', None)
+    with raises(ConfigFileError):
+        test_config_data.verify_config_data()
+    test_config_data = ConfigFileData('JSON', data_file, 'TXT', os_path_join(tmp_path, 'output'),
+                                      'UNION,DIFF', None)
+    test_config_data.verify_config_data()
+    assert test_config_data.get_analysis_modes() == ('UNION', 'DIFF')
+
+
+def test_engine_options_of_several_modes(tmp_path):
+    """The cache and the engine options are rejected unless the single INTS or AFFL mode is given."""
+    data_file = os_path_join(tmp_path, 'data file.json')
+    create_json_test_data_file(data_file, input_data)
+    for engine_option in ({'cache_dir': str(tmp_path)}, {'streaming': 'yes'}, {'memory_limit': 8}, {'workers': 2}):
+        for analysis_mode in ('UNION', 'INTS, AFFL'):
+            test_config_data = ConfigFileData('JSON', data_file, 'TXT', os_path_join(tmp_path, 'output'),
+                                              analysis_mode, -1, **engine_option)
+            with raises(ConfigFileError):
+                test_config_data.verify_config_data()
+        test_config_data = ConfigFileData('JSON', data_file, 'TXT', os_path_join(tmp_path, 'output'),
+                                          'INTS', None, **engine_option)
+        test_config_data.verify_config_data()
+
+
+def test_cover_and_depth_modes():
+    """The math ranges covered by at least k math sets and the coverage depth of the whole number line."""
+    results = determine_coverage_by_sweep_line(math_sets, ('COVER', 'DEPTH'), 2)
+    assert str(results['COVER'].to_list()) == '[(-77, -61), -50, (-43, 0), (10, 15), 61.5]'
+    assert str(results['DEPTH'][:6]) == ('[((-inf, -89), 0), ([-89, -77), 1), ([-77, -61], 2), '
+                                         '((-61, -50), 1), (-50, 2), ((-50, -43), 1)]')
+    assert str(results['DEPTH'][-3:]) == '[((72, 100), 0), (100, 1), ((100, inf), 0)]'
+    for test_math_sets in (math_sets, [parse_math_set('[(0, 10)]'), parse_math_set('[(0, 5), (5, 10)]')]):
+        test_cover = determine_coverage_by_sweep_line(test_math_sets, ('COVER',), len(test_math_sets))['COVER']
+        test_intersection = determine_intersection_by_sweep_line(test_math_sets)
+        assert list(zip(test_cover.starts, test_cover.ends)) == merge_math_ranges(test_intersection, set(), set())
+    assert str(test_cover.to_list()) == '[(0, 10)]'
+    assert str(test_intersection.to_list()) == '[(0, 5), (5, 10)]'
+    assert determine_coverage_by_sweep_line(math_sets, ('COVER',), 4)['COVER'].to_list() == [None]
+    assert (determine_coverage_by_sweep_line(math_sets, ('COVER', 'UNION'), 1)['COVER']
+            == determine_coverage_by_sweep_line(math_sets, ('UNION',))['UNION'])
+
+
+def test_cover_mode_full_run(tmp_path):
+    """The number of covering math sets is given as "k" in the section [general], it is required for COVER mode."""
+    test_config_ini = ConfigParser()
+    test_config_ini['general'] = {'mode': 'COVER', 'k': '2'}
+    test_config_ini['input'] = {'format': 'JSON', 'path': os_path_join(tmp_path, 'data file.json')}
+    test_config_ini['output'] = {'format': 'TXT', 'path': os_path_join(tmp_path, 'output file')}
+    with open(os_path_join(tmp_path, 'config.ini'), 'w') as config_file:
+        test_config_ini.write(config_file)
+    create_json_test_data_file(os_path_join(tmp_path, 'data file.json'), input_data)
+
+    run_msa.main(parse_configuration_file(os_path_join(tmp_path, 'config.ini')))
+    assert read_txt_file(os_path_join(tmp_path, 'output file.txt')) == '[(-77, -61), -50, (-43, 0), (10, 15), 61.5]'
+
+    data_file = os_path_join(tmp_path, 'data file.json')
+    for test_k in (None, 'two', 0):
+        test_config_data = ConfigFileData('JSON', data_file, 'TXT', os_path_join(tmp_path, 'output'), 'COVER', None,
+                                          cover_k=test_k)
+        with raises(ConfigFileError):
+            test_config_data.verify_config_data()
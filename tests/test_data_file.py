@@ -1,8 +1,14 @@
+from io import BytesIO, StringIO
+from os.path import join as os_path_join
+from tempfile import TemporaryDirectory
+
 from pytest import raises
 
 from errors import DataFileError
 from math_analyser import (
-    verify_ini_math_sets, get_data_from_json_file, get_data_from_txt_file, get_data_from_xml_file)
+    ConfigFileData, iter_initial_math_sets, read_initial_math_sets,
+    parse_math_set, get_data_from_json_file, get_data_from_txt_file, get_data_from_xml_file,
+    iter_data_from_xml_file, iter_json_array, get_data_from_bin_file, iter_data_from_bin_file, write_bin_data_file)
 from tests.settings import TestData
 
 
@@ -21,68 +27,68 @@ def test_string_data_instead_of_list():
     """One of the initial math sets in the data file has an invalid value,
     a 'str' object instead of required 'list'."""
     with raises(DataFileError):
-        verify_ini_math_sets('"-inf", 57, 74')
+        parse_math_set('"-inf", 57, 74')
 
 
 def test_numeric_data_instead_of_list():
     """One of the initial math sets in the data file has an invalid value,
      an 'int' object instead of required 'list'."""
     with raises(DataFileError):
-        verify_ini_math_sets(547)
+        parse_math_set('547')
 
 
 def test_no_data():
     """One of the initial math sets in the data file has an invalid value: an empty row."""
     with raises(DataFileError):
-        verify_ini_math_sets("")
+        parse_math_set("")
 
 
 def test_empty_list():
     """One of the initial math sets in the data file has an invalid value: an empty 'list'."""
     with raises(DataFileError):
-        verify_ini_math_sets(list())
+        parse_math_set('[]')
 
 
 def test_invalid_string_data():
     """One of the initial math sets in the data file has an invalid value,
     invalid 'str' value at math range."""
     with raises(DataFileError):
-        verify_ini_math_sets([('qw', 'asd')])
+        parse_math_set("[('qw', 'asd')]")
 
 
 def test_range_with_less_than_two_points():
     """One of the initial math sets in the data file has an invalid value,
     math range with less than two points."""
     with raises(DataFileError):
-        verify_ini_math_sets([(47,)])
+        parse_math_set('[(47,)]')
 
 
 def test_range_with_more_than_two_points():
     """One of the initial math sets in the data file has an invalid value,
     math range with more than two points."""
     with raises(DataFileError):
-        verify_ini_math_sets([(123, 23, 23)])
+        parse_math_set('[(123, 23, 23)]')
 
 
 def test_invalid_semi_infinite_range_1():
     """One of the initial math sets in the data file has an invalid value,
     math range with invalid semi-infinite range."""
     with raises(DataFileError):
-        verify_ini_math_sets([(12, float('-inf'))])
+        parse_math_set("[(12, float('-inf'))]")
 
 
 def test_invalid_semi_infinite_range_2():
     """One of the initial math sets in the data file has an invalid value,
     math range with invalid semi-infinite range."""
     with raises(DataFileError):
-        verify_ini_math_sets([(12, '+inf')])
+        parse_math_set("[(12, '+inf')]")
 
 
 def test_set_instead_of_list():
     """One of the initial math sets in the data file has an invalid value,
     'set' object instead of required 'list'."""
     with raises(DataFileError):
-        verify_ini_math_sets({12, 34})
+        parse_math_set('{12, 34}')
 
 
 def test_json_data_file():
@@ -104,3 +110,113 @@ def test_xml_data_file():
     with open(TestData.get_xml_test_data_file()) as test_data_file:
         test_ini_math_sets = get_data_from_xml_file(test_data_file)
     assert math_sets == test_ini_math_sets
+
+
+def test_xml_data_is_streamed():
+    """Tests getting initial math sets one by one from XML data,
+    the invalid value is reached only when it is read."""
+    xml_data = BytesIO(b'<MathSets><value>[(-89, -61), 12]</value><value>[(10, 15)]</value>'
+                       b'<value>invalid math set</value></MathSets>')
+    test_ini_math_sets = iter_data_from_xml_file(xml_data)
+    assert next(test_ini_math_sets) == [(-89, -61), 12]
+    assert next(test_ini_math_sets) == [(10, 15)]
+    with raises(DataFileError):
+        next(test_ini_math_sets)
+
+
+def test_invalid_xml_data():
+    """Tests that the XML data with several root elements or junk characters is rejected, no <value> is lost."""
+    for xml_data in (b'<value>[(1, 5)]</value><value>[(2, 3)]</value>',
+                     b'<MathSets><value>[(1, 5)]</value></MathSets><value>[(2, 3)]</value>',
+                     b'<MathSets><value>[(1, 5)] &amp</value></MathSets>',
+                     b'<MathSets><value>[(1, 5)] & [(2, 3)]</value></MathSets>',
+                     b'<MathSets><value>[(1, 5)]</value>'):
+        with raises(DataFileError, match='invalid XML'):
+            get_data_from_xml_file(BytesIO(xml_data))
+
+
+def test_xml_tags_are_not_case_sensitive():
+    """Tests getting initial math sets from XML data with <value> elements written in any case."""
+    xml_data = BytesIO(b'<MathSets><VALUE>[(-89, -61), 12]</VALUE><Value>[(10, 15)]</Value>'
+                       b'<value>[(1, 2)]</value></MathSets>')
+    assert get_data_from_xml_file(xml_data) == [[(-89, -61), 12], [(10, 15)], [(1, 2)]]
+
+
+def test_json_array_is_read_by_chunks():
+    """Tests getting elements of the JSON array one by one, the elements may be split between the read chunks."""
+    json_data = StringIO(' [ "[(-89, -61), 12]" ,\n"[(10.125, 15)]", 123456789 ] \n')
+    assert list(iter_json_array(json_data, chunk_size=3)) == ['[(-89, -61), 12]', '[(10.125, 15)]', 123456789]
+
+
+def test_large_json_element():
+    """Tests that the element much larger than the chunk is read by doubling chunks, not chunk by chunk."""
+    class CountingReader(StringIO):
+        reads_number = 0
+
+        def read(self, size=-1):
+            self.reads_number += 1
+            return super().read(size)
+
+    large_math_set = f'[{", ".join(f"({number}, {number + 0.5})" for number in range(50000))}]'
+    json_data = CountingReader(f'["[(1, 2)]", "{large_math_set}", 7]')
+    assert list(iter_json_array(json_data, chunk_size=64)) == ['[(1, 2)]', large_math_set, 7]
+    assert json_data.reads_number < 40
+
+
+def test_invalid_json_array():
+    """Tests the JSON data that is not a single JSON array."""
+    for json_text in ('{"value": 1}', '[1 2]', '[1,', '[1] [2]'):
+        with raises(DataFileError):
+            list(iter_json_array(StringIO(json_text), chunk_size=4))
+
+
+def test_json_element_with_trailing_characters():
+    """Tests the JSON elements followed by characters that are not delimiters, at the end of the file too."""
+    for json_text in ('[1x,2]', '["[1]"x,"[2]"]', '[1e]'):
+        for chunk_size in (2, 3, 4, 2 ** 16):
+            with raises(DataFileError):
+                list(iter_json_array(StringIO(json_text), chunk_size=chunk_size))
+
+
+def test_bin_data_file():
+    """Tests getting initial math sets from BIN data file written from the parsed math sets."""
+    with TemporaryDirectory() as temp_dir:
+        test_bin_data_file = os_path_join(temp_dir, 'data file.bin')
+        assert write_bin_data_file(math_sets, test_bin_data_file) == len(math_sets)
+        with open(test_bin_data_file, 'rb') as test_data_file:
+            test_ini_math_sets = get_data_from_bin_file(test_data_file)
+    assert math_sets == test_ini_math_sets
+
+
+def test_damaged_bin_data_file():
+    """Tests BIN data files that are empty, are not BIN files or are truncated."""
+    with TemporaryDirectory() as temp_dir:
+        test_bin_data_file = os_path_join(temp_dir, 'data file.bin')
+        write_bin_data_file(math_sets, test_bin_data_file)
+        with open(test_bin_data_file, 'rb') as test_data_file:
+            bin_data = test_data_file.read()
+
+        for damaged_data in (b'', b'[(-89, -61), 12]', bin_data[:-1], bin_data + b'\x00'):
+            with open(test_bin_data_file, 'wb') as test_data_file:
+                test_data_file.write(damaged_data)
+            with open(test_bin_data_file, 'rb') as test_data_file:
+                with raises(DataFileError):
+                    list(iter_data_from_bin_file(test_data_file))
+
+
+def test_data_file_without_math_sets():
+    """Tests the data files of every format that contain no math sets, they are read whole or one by one."""
+    with TemporaryDirectory() as temp_dir:
+        empty_data = {'JSON': '[]', 'TXT': '', 'XML': '<MathSets></MathSets>', 'BIN': ''}
+        write_bin_data_file([], os_path_join(temp_dir, 'data file.bin'))
+        for data_format, data in empty_data.items():
+            test_data_file = os_path_join(temp_dir, f'data file.{data_format.lower()}')
+            if data_format != 'BIN':
+                with open(test_data_file, 'w') as data_file:
+                    data_file.write(data)
+            with raises(DataFileError):
+                read_initial_math_sets(test_data_file, data_format)
+            test_config_data = ConfigFileData(data_format, test_data_file, 'TXT', TestData.get_output_file(),
+                                              'INTS', None)
+            with raises(DataFileError):
+                list(iter_initial_math_sets(test_config_data))
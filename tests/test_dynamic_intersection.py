@@ -0,0 +1,69 @@
+from pytest import raises
+
+import math_analyser.dynamic_intersection as dynamic_intersection
+from math_analyser import DynamicIntersection, determine_intersection_by_sweep_line
+
+
+math_sets = [[(float('-inf'), -10), (10, float('inf'))],
+             [(-77, 61)],
+             [(-89, -61), (-43, -12), (10, 27), (61, 72)]]
+
+
+def test_add_sets():
+    """The intersection of the added math sets is the same as the one of the sweep line."""
+    test_intersection = DynamicIntersection()
+    for math_set in math_sets:
+        test_intersection.add_set(math_set)
+    assert test_intersection.current_intersection() == determine_intersection_by_sweep_line(math_sets)
+    assert str(test_intersection.current_intersection().to_list()) == '[(-77, -61), (-43, -12), (10, 27), 61]'
+
+
+def test_remove_set():
+    """The removed math set and its endpoints do not affect the intersection."""
+    test_intersection = DynamicIntersection()
+    set_ids = [test_intersection.add_set(math_set) for math_set in math_sets]
+    extra_set_id = test_intersection.add_set([(-50, -20), (0, 20), 25])
+    assert str(test_intersection.current_intersection().to_list()) == '[(-43, -20), (10, 20), 25]'
+
+    test_intersection.remove_set(extra_set_id)
+    assert str(test_intersection.current_intersection().to_list()) == '[(-77, -61), (-43, -12), (10, 27), 61]'
+    test_intersection.remove_set(set_ids[2])
+    assert str(test_intersection.current_intersection().to_list()) == '[(-77, -10), (10, 61)]'
+    with raises(KeyError):
+        test_intersection.remove_set(extra_set_id)
+
+
+def test_no_sets():
+    """The intersection is empty if there are no math sets."""
+    test_intersection = DynamicIntersection(range(-10, 10))
+    assert test_intersection.current_intersection().to_list() == [None]
+    set_id = test_intersection.add_set([(-5, 5)])
+    test_intersection.remove_set(set_id)
+    assert test_intersection.current_intersection().to_list() == [None]
+    assert len(test_intersection) == 0
+
+
+def test_new_endpoints_do_not_rebuild_tree(monkeypatch):
+    """Every new endpoint adds two units to the tree, the units of the known endpoints are not created again,
+    and the endpoints of the removed math sets are pruned."""
+    created_units = list()
+
+    class CountedCoverageNode(dynamic_intersection.CoverageNode):
+        __slots__ = []
+
+        def __init__(self, unit, coverage):
+            created_units.append(unit)
+            super().__init__(unit, coverage)
+
+    monkeypatch.setattr(dynamic_intersection, 'CoverageNode', CountedCoverageNode)
+    test_intersection = DynamicIntersection()
+    set_ids = [test_intersection.add_set([(10 * index, 10 * index + 15)]) for index in range(200)]
+    assert len(created_units) == 2 * 400
+    assert str(test_intersection.current_intersection().to_list()) == '[None]'
+
+    for set_id in set_ids[1:]:
+        test_intersection.remove_set(set_id)
+    assert str(test_intersection.current_intersection().to_list()) == '[(0, 15)]'
+    assert sorted(test_intersection.endpoint_counts) == [0, 15]
+    test_intersection.remove_set(set_ids[0])
+    assert test_intersection.root is None
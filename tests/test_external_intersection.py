@@ -0,0 +1,54 @@
+from configparser import ConfigParser
+from os import listdir
+from os.path import join as os_path_join
+
+from pytest import raises
+
+import math_analyser.external_intersection as external_intersection
+import run_math_sets_analyser as run_msa
+from errors import DataFileError
+from math_analyser import (determine_intersection_by_sweep_line, determine_intersection_in_external_memory,
+                           parse_configuration_file, parse_math_set)
+from tests.settings import create_json_test_data_file, read_txt_file
+
+input_data = ["[(float('-inf'), -10.37), (10.41, float('inf'))]",
+              "[(float('-inf'), -32.08), (-17, 22.2), (54, 57)]",
+              "[(float('-inf'), -41), (-18, 24), (51, 62), (103, float('inf'))]",
+              "[(-89.11, -61.07), (-24.9, float('inf'))]",
+              "[(-77, 54), 61.04, -12]",
+              "[(-89, -61), (-43, -12), (10, 27), (61, 72)]"]
+math_sets = [parse_math_set(math_set) for math_set in input_data]
+
+
+def test_external_memory_intersection(tmp_path, monkeypatch):
+    """The intersection of the spilled and merged endpoints is the same as the one of the sweep line,
+    the temporary files are removed."""
+    monkeypatch.setattr(external_intersection, 'MAX_MERGED_RUNS', 2)
+    reference_intersection = determine_intersection_by_sweep_line(math_sets)
+    for memory_limit in (1, 1000, 2 ** 20):
+        test_intersection = determine_intersection_in_external_memory(iter(math_sets), memory_limit, tmp_path)
+        assert test_intersection == reference_intersection
+        assert str(test_intersection.to_list()) == '[(-77, -61.07), (-17, -12), (10.41, 22.2)]'
+    assert listdir(tmp_path) == []
+
+    with raises(DataFileError):
+        determine_intersection_in_external_memory(iter([]), 1000, tmp_path)
+
+
+def test_memory_limit_full_run(tmp_path):
+    """The memory limit of [engine] switches to the external memory intersection, its peak memory is counted."""
+    test_config_ini = ConfigParser()
+    test_config_ini['general'] = {'mode': 'INTS'}
+    test_config_ini['input'] = {'format': 'JSON', 'path': os_path_join(tmp_path, 'data file.json')}
+    test_config_ini['output'] = {'format': 'TXT', 'path': os_path_join(tmp_path, 'output file')}
+    test_config_ini['engine'] = {'memory_limit': '1'}
+    with open(os_path_join(tmp_path, 'config.ini'), 'w') as config_file:
+        test_config_ini.write(config_file)
+    create_json_test_data_file(os_path_join(tmp_path, 'data file.json'), input_data)
+
+    metrics = dict()
+    config_data = parse_configuration_file(os_path_join(tmp_path, 'config.ini'))
+    run_msa.main(config_data, metrics_callback=lambda kind, name, value: metrics.update({name: value}))
+    assert read_txt_file(os_path_join(tmp_path, 'output file.txt')) == '[(-77, -61.07), (-17, -12), (10.41, 22.2)]'
+    assert metrics['peak_memory_bytes'] > 0
+    assert 'external_memory_intersection' in metrics
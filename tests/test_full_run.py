@@ -1,9 +1,10 @@
 from os.path import join as os_path_join
 
 import run_math_sets_analyser as run_msa
-from math_analyser import parse_configuration_file
+from math_analyser import convert_data_file_to_bin, parse_configuration_file
 from tests.settings import (TemporaryDirectory,
                             create_config_file_for_affl_mode,
+                            create_config_file_for_batch_affl_mode,
                             create_config_file_for_ints_mode,
                             create_json_test_data_file,
                             read_txt_file,
@@ -37,6 +38,15 @@ AFFL_config_parameters = {'analysis_mode': 'AFFL',
                           'output_file_format': 'XML',
                           'output_file_path': 'test output file'}
 
+batch_AFFL_points = '-1\n-50 -15.5\n30\n'
+batch_AFFL_reference_output = '[(-1.0, [-12, 10]), (-50.0, [-43]), (-15.5, [-15.5]), (30.0, [27])]'
+batch_AFFL_config_parameters = {'data_format': 'JSON',
+                                'data_file': 'test data file',
+                                'points_format': 'TXT',
+                                'points_file': 'test points file',
+                                'output_file_format': 'TXT',
+                                'output_file_path': 'test output file'}
+
 
 def test_ints_mode_full_run():
     """Full run test for INTS mode."""
@@ -77,3 +87,49 @@ def test_affl_mode_full_run():
 
         script_result_file = read_xml_file(f'{test_output_file}.xml')
         assert script_result_file == AFFL_reference_output
+
+
+def test_batch_affl_mode_full_run():
+    """Full run test for AFFL mode with the file of math points."""
+    with TemporaryDirectory() as temp_dir:
+        test_config_file = os_path_join(temp_dir, 'config.ini')
+        test_data_file = os_path_join(temp_dir, 'data file')
+        test_points_file = os_path_join(temp_dir, 'points file')
+        test_output_file = os_path_join(temp_dir, 'output file')
+
+        batch_AFFL_config_parameters['data_file'] = test_data_file
+        batch_AFFL_config_parameters['points_file'] = test_points_file
+        batch_AFFL_config_parameters['output_file_path'] = test_output_file
+
+        create_config_file_for_batch_affl_mode(test_config_file, batch_AFFL_config_parameters)
+        create_json_test_data_file(test_data_file, AFFL_input_data)
+        with open(test_points_file, 'w') as points_file:
+            points_file.write(batch_AFFL_points)
+
+        test_configuration_data = parse_configuration_file(test_config_file)
+        run_msa.main(test_configuration_data)
+
+        script_result_file = read_txt_file(f'{test_output_file}.txt')
+        assert script_result_file == batch_AFFL_reference_output
+
+
+def test_ints_mode_full_run_with_bin_data_file():
+    """Full run test for INTS mode with the data file converted to BIN format."""
+    with TemporaryDirectory() as temp_dir:
+        test_config_file = os_path_join(temp_dir, 'config.ini')
+        test_data_file = os_path_join(temp_dir, 'data file')
+        test_bin_data_file = os_path_join(temp_dir, 'data file.bin')
+        test_output_file = os_path_join(temp_dir, 'output file')
+
+        create_json_test_data_file(test_data_file, INTS_input_data)
+        assert convert_data_file_to_bin(test_data_file, 'JSON', test_bin_data_file) == len(INTS_input_data)
+
+        create_config_file_for_ints_mode(test_config_file, {**INTS_config_parameters,
+                                                            'data_format': 'BIN',
+                                                            'data_file': test_bin_data_file,
+                                                            'output_file_path': test_output_file})
+        test_configuration_data = parse_configuration_file(test_config_file)
+        run_msa.main(test_configuration_data)
+
+        script_result_file = read_txt_file(f'{test_output_file}.txt')
+        assert script_result_file == INTS_reference_output
@@ -0,0 +1,135 @@
+from configparser import ConfigParser
+from os import listdir, stat, utime
+from os.path import isdir, isfile
+from os.path import join as os_path_join
+
+from pytest import raises
+
+import math_analyser.input_cache as input_cache
+import math_analyser.result_cache as result_cache
+import run_math_sets_analyser as run_msa
+from errors import ConfigFileError
+from math_analyser import (
+    ConfigFileData, parse_configuration_file, parse_math_set, read_initial_math_sets_with_sidecar)
+from math_analyser.input_cache import SIDECAR_HEADER, get_sidecar_path, read_sidecar_header
+from tests.settings import TestData, create_json_test_data_file, read_txt_file
+
+input_data = ["[(float('-inf'), -10.37), (10.41, float('inf'))]",
+              "[(float('-inf'), -32.08), (-17, 22.2), (54, 57)]",
+              "[(-89.11, -61.07), (-24.9, float('inf'))]",
+              "[(-77, 54), 61.04, -12]"]
+changed_input_data = ["[(float('-inf'), -10.37), (10.41, float('inf'))]",
+                      "[(float('-inf'), -32.08), (-17, 22.2), (54, 58)]",
+                      "[(-89.11, -61.07), (-24.9, float('inf'))]",
+                      "[(-77, 54), 61.04, -12]"]
+
+
+def parsing_is_forbidden(data_file, data_format):
+    raise AssertionError('The data file is parsed instead of loading the sidecar file')
+
+
+def test_sidecar_is_loaded_without_parsing(tmp_path, monkeypatch):
+    """The first run parses the data file and writes the sidecar file next to it,
+    the next run loads the same math sets from the sidecar file."""
+    data_file = os_path_join(tmp_path, 'data file.json')
+    create_json_test_data_file(data_file, input_data)
+    parsed_math_sets = read_initial_math_sets_with_sidecar(data_file, 'JSON')
+    assert parsed_math_sets == [parse_math_set(math_set) for math_set in input_data]
+    assert isfile(os_path_join(tmp_path, '.data file.json.msas'))
+
+    monkeypatch.setattr(input_cache, 'read_initial_math_sets', parsing_is_forbidden)
+    assert read_initial_math_sets_with_sidecar(data_file, 'JSON') == parsed_math_sets
+
+
+def test_sidecar_after_touch_of_data_file(tmp_path, monkeypatch):
+    """The data file with the new modification time and the same content is not parsed again,
+    its new modification time is saved in the sidecar file."""
+    data_file = os_path_join(tmp_path, 'data file.json')
+    create_json_test_data_file(data_file, input_data)
+    parsed_math_sets = read_initial_math_sets_with_sidecar(data_file, 'JSON')
+    utime(data_file, ns=(stat(data_file).st_atime_ns, stat(data_file).st_mtime_ns + 10 ** 9))
+
+    monkeypatch.setattr(input_cache, 'read_initial_math_sets', parsing_is_forbidden)
+    assert read_initial_math_sets_with_sidecar(data_file, 'JSON') == parsed_math_sets
+    sidecar_header = read_sidecar_header(get_sidecar_path(data_file, 'JSON'))
+    assert sidecar_header[3] == stat(data_file).st_mtime_ns
+
+
+def test_sidecar_after_change_of_data_file(tmp_path):
+    """The changed data file of the same size is parsed again, its hash differs from the saved one,
+    the damaged sidecar file is replaced."""
+    data_file = os_path_join(tmp_path, 'data file.json')
+    create_json_test_data_file(data_file, input_data)
+    read_initial_math_sets_with_sidecar(data_file, 'JSON')
+    create_json_test_data_file(data_file, changed_input_data)
+    utime(data_file, ns=(stat(data_file).st_atime_ns, stat(data_file).st_mtime_ns + 10 ** 9))
+    changed_math_sets = [parse_math_set(math_set) for math_set in changed_input_data]
+    assert read_initial_math_sets_with_sidecar(data_file, 'JSON') == changed_math_sets
+
+    sidecar_file = get_sidecar_path(data_file, 'JSON')
+    with open(sidecar_file, 'r+b') as file_to_write:
+        file_to_write.seek(SIDECAR_HEADER.size)
+        file_to_write.write(b'\0' * 8)
+    assert read_initial_math_sets_with_sidecar(data_file, 'JSON') == changed_math_sets
+    assert read_initial_math_sets_with_sidecar(data_file, 'JSON') == changed_math_sets
+
+
+def test_sidecar_directory_full_run(tmp_path, monkeypatch):
+    """The sidecar files are kept in [input] sidecar_dir, the result of the run is the same."""
+    test_config_ini = ConfigParser()
+    test_config_ini['general'] = {'mode': 'INTS'}
+    test_config_ini['input'] = {'format': 'JSON', 'path': os_path_join(tmp_path, 'data file.json'),
+                                'sidecar_dir': os_path_join(tmp_path, 'sidecars')}
+    test_config_ini['output'] = {'format': 'TXT', 'path': os_path_join(tmp_path, 'output file')}
+    with open(os_path_join(tmp_path, 'config.ini'), 'w') as config_file:
+        test_config_ini.write(config_file)
+    create_json_test_data_file(os_path_join(tmp_path, 'data file.json'), input_data)
+
+    for output_file in ('output file.txt', 'output file(1).txt'):
+        config_data = parse_configuration_file(os_path_join(tmp_path, 'config.ini'))
+        assert config_data.get_sidecar()
+        run_msa.main(config_data)
+        assert (read_txt_file(os_path_join(tmp_path, output_file))
+                == '[(-77, -61.07), (-17, -12), (-12, -10.37), (10.41, 22.2), 54]')
+        assert len(listdir(os_path_join(tmp_path, 'sidecars'))) == 1
+        monkeypatch.setattr(input_cache, 'read_initial_math_sets', parsing_is_forbidden)
+
+
+def test_sidecar_directory_is_created_on_write(tmp_path):
+    """The sidecar directory is not created by the lookup of the sidecar file, only when it is written."""
+    data_file = os_path_join(tmp_path, 'data file.json')
+    create_json_test_data_file(data_file, input_data)
+    sidecar_dir = os_path_join(tmp_path, 'sidecars')
+    get_sidecar_path(data_file, 'JSON', sidecar_dir)
+    assert not isdir(sidecar_dir)
+    read_initial_math_sets_with_sidecar(data_file, 'JSON', sidecar_dir)
+    assert len(listdir(sidecar_dir)) == 1
+
+
+def test_sidecar_name(tmp_path):
+    """The format is added to the name of the sidecar file only if it is not the extension of the data file."""
+    assert get_sidecar_path(os_path_join(tmp_path, 'data file.xml'), 'XML') == os_path_join(tmp_path,
+                                                                                           '.data file.xml.msas')
+    assert get_sidecar_path(os_path_join(tmp_path, 'data file'), 'TXT') == os_path_join(tmp_path,
+                                                                                       '.data file.txt.msas')
+
+
+def test_sidecar_temporary_file_is_removed(tmp_path, monkeypatch):
+    """The temporary file of the sidecar file is removed if it cannot be renamed, the math sets are still read."""
+    def replace_with_error(source_path, target_path):
+        raise OSError('Permission denied')
+
+    data_file = os_path_join(tmp_path, 'data file.json')
+    create_json_test_data_file(data_file, input_data)
+    monkeypatch.setattr(result_cache, 'replace', replace_with_error)
+    assert read_initial_math_sets_with_sidecar(data_file, 'JSON') == [parse_math_set(math_set)
+                                                                      for math_set in input_data]
+    assert listdir(tmp_path) == ['data file.json']
+
+
+def test_invalid_sidecar():
+    """The sidecar option is not a boolean value."""
+    test_config_data = ConfigFileData('JSON', TestData.get_json_test_data_file(), 'TXT', TestData.get_output_file(),
+                                      'INTS', None, sidecar='sometimes')
+    with raises(ConfigFileError):
+        test_config_data.verify_config_data()
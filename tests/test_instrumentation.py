@@ -0,0 +1,97 @@
+from configparser import ConfigParser
+from json import load as json_load
+from os.path import isfile
+from os.path import join as os_path_join
+from pstats import Stats
+from threading import Thread
+from time import sleep
+
+import run_math_sets_analyser as run_msa
+from math_analyser import NO_INSTRUMENTATION, Instrumentation, parse_configuration_file, profile_run
+from tests.settings import TemporaryDirectory, create_json_test_data_file, read_txt_file
+
+input_data = ["[(float('-inf'), -10), (10, float('inf'))]",
+              "[(-77, 61)]",
+              "[(-89, -61), (-43, -12), (10, 27), (61, 72)]"]
+
+
+def create_config_file(temp_dir: str, metrics_section: dict) -> str:
+    """Creates config file for INTS mode with the given section [metrics] and returns its path."""
+    test_config_ini = ConfigParser()
+    test_config_ini['general'] = {'mode': 'INTS'}
+    test_config_ini['input'] = {'format': 'JSON', 'path': os_path_join(temp_dir, 'data file.json')}
+    test_config_ini['output'] = {'format': 'TXT', 'path': os_path_join(temp_dir, 'output file')}
+    if metrics_section:
+        test_config_ini['metrics'] = metrics_section
+    config_file = os_path_join(temp_dir, 'config.ini')
+    with open(config_file, 'w') as file_to_write:
+        test_config_ini.write(file_to_write)
+    create_json_test_data_file(os_path_join(temp_dir, 'data file.json'), input_data)
+    return config_file
+
+
+def test_metrics_callback():
+    """The callback gets the span of every stage and the counters of the run."""
+    with TemporaryDirectory() as temp_dir:
+        metrics = list()
+        config_data = parse_configuration_file(create_config_file(temp_dir, {}))
+        run_msa.main(config_data, metrics_callback=lambda *metric: metrics.append(metric))
+
+    spans = [name for kind, name, value in metrics if kind == 'span']
+    counters = {name: value for kind, name, value in metrics if kind == 'counter'}
+    assert spans == ['get_initial_math_sets', 'intersection', 'output_script_data', 'run']
+    assert counters == {'sets': 3, 'ranges': 7, 'endpoints': 14, 'result_size': 4}
+
+
+def test_metrics_and_profile_files():
+    """The metrics are written to JSON file, cProfile statistics are dumped to the profile file."""
+    with TemporaryDirectory() as temp_dir:
+        metrics_file = os_path_join(temp_dir, 'metrics.json')
+        profile_file = os_path_join(temp_dir, 'run.pstats')
+        config_data = parse_configuration_file(create_config_file(temp_dir, {'path': metrics_file,
+                                                                             'profile': profile_file}))
+        run_msa.main(config_data)
+
+        assert read_txt_file(os_path_join(temp_dir, 'output file.txt')) == '[(-77, -61), (-43, -12), (10, 27), 61]'
+        with open(metrics_file) as file_to_read:
+            run_metrics = json_load(file_to_read)
+        assert set(run_metrics['stage_seconds']) == {'get_initial_math_sets', 'intersection',
+                                                     'output_script_data', 'run'}
+        assert run_metrics['counters']['sets'] == 3
+        assert isfile(profile_file)
+        assert Stats(profile_file).total_calls > 0
+
+
+def test_profiled_runs_of_threads():
+    """The profiled runs of several threads wait for each other, every one dumps its own statistics."""
+    run_events = list()
+
+    def profiled_run(profile_file):
+        with profile_run(profile_file):
+            run_events.append('start')
+            sleep(0.05)
+            run_events.append('end')
+
+    with TemporaryDirectory() as temp_dir:
+        profile_files = [os_path_join(temp_dir, f'run {number}.pstats') for number in range(2)]
+        threads = [Thread(target=profiled_run, args=(profile_file,)) for profile_file in profile_files]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert run_events == ['start', 'end', 'start', 'end']
+        assert all(isfile(profile_file) for profile_file in profile_files)
+
+
+def test_disabled_instrumentation():
+    """The disabled instrumentation collects nothing, its spans are the same object."""
+    with NO_INSTRUMENTATION.span('run'):
+        NO_INSTRUMENTATION.count('sets', 3)
+    assert NO_INSTRUMENTATION.span('run') is NO_INSTRUMENTATION.span('intersection')
+    assert NO_INSTRUMENTATION.get_metrics() == {'spans': [], 'stage_seconds': {}, 'counters': {}}
+
+    instrumentation = Instrumentation()
+    with instrumentation.span('run'):
+        instrumentation.count('sets', 3)
+        instrumentation.count('sets', 2)
+    assert instrumentation.get_metrics()['counters'] == {'sets': 5}
@@ -1,4 +1,8 @@
-from math_analyser import determine_intersection_of_ini_math_ranges
+from io import StringIO
+
+from math_analyser import (IntervalSet, determine_intersection_of_ini_math_ranges,
+                           determine_intersection_of_math_sets_stream,
+                           iter_data_from_txt_file)
 from tests.settings import ints_mode_using_temp_files
 
 
@@ -82,3 +86,37 @@ def test_math_sets_without_intersection():
     """'INTS' mode for math sets without intersection."""
     test_result = determine_intersection_of_ini_math_ranges(math_sets_without_intersection, 0, [])
     assert test_result == [None]
+
+
+def test_many_initial_math_sets():
+    """'INTS' mode for more math sets than the recursion limit allows."""
+    many_math_sets = [[(float('-inf'), 10), (20, 30)] for _ in range(5000)] + [[(-5, 25)]]
+    test_result = determine_intersection_of_ini_math_ranges(many_math_sets)
+    assert test_result == [(-5, 10), (20, 25)]
+
+
+def test_math_sets_with_not_overlapping_hulls():
+    """'INTS' mode for math sets which hulls do not overlap."""
+    test_result = determine_intersection_of_ini_math_ranges([[(-89, -61), 3]] + math_sets + [[(10, 12)]])
+    assert test_result == [None]
+
+
+def test_empty_math_set():
+    """'INTS' mode for math sets with the empty one, the intersection is empty."""
+    for empty_math_set in (IntervalSet(), [None]):
+        test_math_sets = math_sets[:3] + [empty_math_set] + math_sets[3:]
+        assert determine_intersection_of_ini_math_ranges(test_math_sets) == [None]
+        assert determine_intersection_of_math_sets_stream(iter(test_math_sets)) == [None]
+
+
+def test_stream_of_math_sets():
+    """'INTS' mode for math sets folded while they are read."""
+    test_result = determine_intersection_of_math_sets_stream(iter(math_sets))
+    assert test_result == output_for_math_sets
+
+
+def test_stream_stops_on_empty_intersection():
+    """'INTS' mode stops reading the math sets as soon as the intersection becomes empty."""
+    txt_data = StringIO('[(-89, -61), (102, float("inf"))]\n[(-57, 35)]\ninvalid math set\n')
+    test_result = determine_intersection_of_math_sets_stream(iter_data_from_txt_file(txt_data))
+    assert test_result == [None]
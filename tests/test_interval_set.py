@@ -0,0 +1,64 @@
+from pickle import dumps, loads
+
+from math_analyser import IntervalSet, determine_intersection_by_sweep_line
+from math_analyser.interval_set import (INT_START_FLAG, INTERVAL_NOTATION_FLAG, OPEN_END_FLAG, OPEN_START_FLAG,
+                                        Interval)
+
+
+math_set = [(51, 62.01), 77.34, (float('-inf'), -41), -18, (103.0, float('inf'))]
+sorted_math_set = [(float('-inf'), -41), -18, (51, 62.01), 77.34, (103.0, float('inf'))]
+
+
+def test_math_set_is_sorted():
+    """The math set is sorted by the start endpoints, math points are stored as ranges with equal endpoints."""
+    test_interval_set = IntervalSet.from_math_ranges(math_set)
+    assert list(test_interval_set.starts) == [float('-inf'), -18, 51, 77.34, 103]
+    assert list(test_interval_set.ends) == [-41, -18, 62.01, 77.34, float('inf')]
+    assert test_interval_set.starts.typecode == test_interval_set.ends.typecode == 'd'
+
+
+def test_conversion_to_legacy_math_set():
+    """The endpoints given as "int" and "float" are restored at conversion to the legacy math set."""
+    test_result = IntervalSet.from_math_ranges(math_set).to_list()
+    assert str(test_result) == str(sorted_math_set)
+
+
+def test_empty_math_set():
+    """The empty math set is converted to [None]."""
+    test_interval_set = IntervalSet.from_math_ranges([None])
+    assert not test_interval_set
+    assert test_interval_set.to_list() == [None]
+    assert test_interval_set.get_hull() is None
+
+
+def test_math_set_hull():
+    """The hull of the math set is determined by its minimum and maximum endpoints."""
+    test_interval_set = IntervalSet.from_math_ranges([(-89, 17.8), 24, (9.9, 12)])
+    assert test_interval_set.get_hull() == (-89, 24)
+
+
+def test_intersection_of_interval_sets():
+    """The intersection is determined for IntervalSet objects and is returned as IntervalSet."""
+    test_result = determine_intersection_by_sweep_line([IntervalSet.from_math_ranges([(-77, 61)]),
+                                                        IntervalSet.from_math_ranges([(-89, -61), (61, 72)])])
+    assert isinstance(test_result, IntervalSet)
+    assert str(test_result.to_list()) == '[(-77, -61), 61]'
+
+
+def test_packed_math_set():
+    """The math set packed to bytes is unpacked without changes."""
+    test_interval_set = IntervalSet.from_math_ranges(math_set)
+    assert IntervalSet.from_bytes(test_interval_set.to_bytes()) == test_interval_set
+
+
+def test_interval_notation():
+    """The math ranges with the interval notation flag are written with the brackets of their endpoints,
+    they are equal to the "tuple" ranges."""
+    test_interval_set = IntervalSet()
+    test_interval_set.append(float('-inf'), -5, INTERVAL_NOTATION_FLAG | OPEN_END_FLAG)
+    test_interval_set.append(0, 5, INT_START_FLAG | INTERVAL_NOTATION_FLAG | OPEN_END_FLAG)
+    test_interval_set.append(5, 7.5, INTERVAL_NOTATION_FLAG | OPEN_START_FLAG)
+    test_interval_set.append(10, float('inf'), INTERVAL_NOTATION_FLAG)
+    assert str(test_interval_set.to_list()) == '[(-inf, -5.0), [0, 5.0), (5.0, 7.5], [10.0, inf)]'
+    assert test_interval_set.to_list() == [(float('-inf'), -5), (0, 5), (5, 7.5), (10, float('inf'))]
+    assert repr(loads(dumps(Interval(0, 5, False, True)))) == '[0, 5)'
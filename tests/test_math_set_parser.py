@@ -0,0 +1,70 @@
+from pytest import raises
+
+from errors import DataFileError
+from math_analyser import parse_math_set
+
+
+def test_all_types_of_math_ranges():
+    """Math set with numeric, semi-infinite ranges and math points is parsed and sorted."""
+    test_result = parse_math_set('[(103.0,  float("inf")), (float(\'-inf\'), -41), -18, (51, 62.01), 77.34,]\n')
+    assert str(test_result.to_list()) == "[(-inf, -41), -18, (51, 62.01), 77.34, (103.0, inf)]"
+
+
+def test_infinite_math_range():
+    """Math set with the only infinite range."""
+    assert parse_math_set("[(float('-inf'), float('+inf'))]") == [(float('-inf'), float('inf'))]
+
+
+def test_no_data():
+    """Math set is an empty row or an empty list."""
+    for test_data in ('', '  \n', '[ ]'):
+        with raises(DataFileError):
+            parse_math_set(test_data)
+
+
+def test_string_data_instead_of_list():
+    """Math set is not given as a list."""
+    with raises(DataFileError):
+        parse_math_set('"-inf", 57, 74')
+
+
+def test_invalid_ranges():
+    """Math set contains invalid ranges."""
+    for test_data in ("[('qw', 'asd')]", '[(47,)]', '[(123, 23, 23)]', "[(12, float('-inf'))]",
+                      "[(12, '+inf')]", '[(12, 12)]', "[(1, 2), (float('-inf'), float('inf'))]"):
+        with raises(DataFileError):
+            parse_math_set(test_data)
+
+
+def test_data_is_not_evaluated():
+    """Math set with an expression is rejected instead of being evaluated."""
+    with raises(DataFileError):
+        parse_math_set("[__import__('os').getcwd()]")
+
+
+def test_position_of_invalid_element():
+    """The position of the invalid element is given in the error."""
+    with raises(DataFileError, match='position 10'):
+        parse_math_set('[(1, 2), (5, 3)]')
+
+
+def test_python_number_literals():
+    """Math point in parentheses, numbers with digit separators and hexadecimal, octal and binary integers
+    are parsed the same way as Python literals."""
+    test_result = parse_math_set("[(1, 2), (3), 1_000, (-0o17, 0b1_0), 0x10, float(0x1F), 1_0.5e1]")
+    assert str(test_result.to_list()) == '[(-15, 2), (1, 2), 3, 16, 31.0, 105.0, 1000]'
+
+
+def test_rejected_python_syntax():
+    """Expressions, names, repeated signs and nested parentheses are not number literals, they are rejected."""
+    for test_data in ('[1 + 2]', '[--5]', '[((1, 2))]', '[1__000]', '[0x]', '[True]'):
+        with raises(DataFileError, match='invalid syntax at position 2'):
+            parse_math_set(test_data)
+
+
+def test_number_out_of_float_range():
+    """The number that cannot be stored as "float" is rejected with the position of its element."""
+    for test_data in (f'[(1, 2), 1{"0" * 400}]', '[(1, 2), 1e400]', f'[(1, 2), (-0x{"f" * 300}, 5)]',
+                      f'[(1, 2), float(1{"0" * 400})]'):
+        with raises(DataFileError, match='position 10'):
+            parse_math_set(test_data)
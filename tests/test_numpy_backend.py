@@ -0,0 +1,88 @@
+from pytest import fixture, importorskip, raises
+
+from errors import ConfigFileError, DataFileError
+from math_analyser import (ConfigFileData,
+                           determine_closest_point_of_math_intersection,
+                           determine_closest_point_with_numpy,
+                           determine_intersection_by_sweep_line,
+                           determine_intersection_with_numpy)
+from tests.settings import TestData
+
+importorskip('numpy')
+
+
+math_sets = [[(float('-inf'), float('inf'))],
+             [(10.41, float('inf')), (float('-inf'), -10.37)],
+             [(float('-inf'), 99.4)],
+             [(-98, float('inf'))],
+             [(float('-inf'), -32.08), (-17, 22.2), (54, 57)],
+             [(float('-inf'), -41), (51, 62), (-18, 24), (103, float('inf'))],
+             [(-89.11, -61.07), (-24.9, float('inf'))],
+             [(-77, 54), 61.04],
+             [(-89, -61), (-43, -12), (10, 27), (61, 72)]]
+math_sets_with_points = [[(-89, 17.8), 24, (25, float('inf'))],
+                         [(-97, 2), (9.9, 24), (36.1, float('inf'))],
+                         [-77, -29, 42.7, (51.1, float('inf'))]]
+overlapping_math_sets = [[(-10, 5), (0, 10), 7, (10, 12)],
+                         [(-5, 20), 3]]
+semi_infinite_math_sets = [[(-89, -61), (-12, float('inf'))],
+                           [(-97, float('inf'))],
+                           [(float('-inf'), float('inf'))]]
+math_sets_without_intersection = [[(-89, -61), (102, float('inf'))],
+                                  [(-57, 35)],
+                                  [(-2, 16), (61, 72)]]
+
+numeric_math_intersection = [(-589, -65), -55, (-17.02, -12.05), (12.05, 22.2)]
+math_points = [-600, -374.98, -55, -17.02, 0, 19.74, 45]
+
+
+@fixture
+def test_config_parameters():
+    return {'analysis_mode': 'INTS',
+            'math_point': None,
+            'data_format': 'JSON',
+            'data_file': TestData.get_json_test_data_file(),
+            'output_file_format': 'TXT',
+            'output_file_path': TestData.get_output_file(),
+            'backend': 'numpy'}
+
+
+def test_intersection_is_the_same_as_sweep_line():
+    """NumPy backend returns the same intersection as the sweep line for all types of math sets."""
+    for test_math_sets in (math_sets, math_sets_with_points, overlapping_math_sets, semi_infinite_math_sets):
+        test_result = determine_intersection_with_numpy(test_math_sets)
+        reference_result = determine_intersection_by_sweep_line(test_math_sets)
+        assert str(test_result.to_list()) == str(reference_result.to_list())
+
+
+def test_math_sets_without_intersection():
+    """NumPy backend for math sets without intersection."""
+    assert determine_intersection_with_numpy(math_sets_without_intersection) == [None]
+
+
+def test_no_math_sets():
+    """NumPy backend raises DataFileError if there are no math sets."""
+    with raises(DataFileError):
+        determine_intersection_with_numpy([])
+
+
+def test_closest_point_is_the_same_as_bisect():
+    """NumPy backend returns the same closest endpoint(s) as the bisect search."""
+    for math_point in math_points:
+        test_result = determine_closest_point_with_numpy(math_point, numeric_math_intersection)
+        assert test_result == determine_closest_point_of_math_intersection(math_point, numeric_math_intersection)
+
+
+def test_numpy_backend_in_config(test_config_parameters):
+    """NumPy backend is accepted in the configuration file."""
+    test_config_data = ConfigFileData(**test_config_parameters)
+    test_config_data.verify_config_data()
+    assert test_config_data.get_backend() == 'NUMPY'
+
+
+def test_invalid_backend_in_config(test_config_parameters):
+    """The invalid backend is specified."""
+    test_config_parameters['backend'] = 'GPU'
+    test_config_data = ConfigFileData(**test_config_parameters)
+    with raises(ConfigFileError):
+        test_config_data.verify_config_data()
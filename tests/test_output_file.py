@@ -2,8 +2,11 @@ from errors import OutputDataError
 from pytest import fixture, raises
 
 from tests.settings import TemporaryDirectory, read_json_file, read_txt_file, read_xml_file
+from concurrent.futures import ThreadPoolExecutor
+from os import listdir
 from os.path import join as os_path_join
-from math_analyser import ConfigFileData, output_script_data
+from math_analyser import ConfigFileData, IntervalSet, OutputSink, choose_name_for_output_file, output_script_data
+from math_analyser.output_data import iter_output_pieces
 
 
 TEST_DATA = [(-77, -61), (-17, -12), (10, 22), (75, float('inf'))]
@@ -69,3 +72,48 @@ def test_xml_output_file(test_config_parameters):
         output_script_data(test_config_data, TEST_DATA)
         xml_output = read_xml_file(f'{test_output_file}.xml')
         assert str(TEST_DATA) == xml_output
+
+
+def test_output_data_is_written_by_pieces():
+    """The output data is written piece by piece, the joined pieces are the same as the whole output data."""
+    test_interval_set = IntervalSet.from_math_ranges(TEST_DATA * 3000)
+    test_pieces = list(iter_output_pieces(test_interval_set))
+    assert len(test_pieces) > 3
+    assert ''.join(test_pieces) == str(test_interval_set.to_list())
+    assert ''.join(iter_output_pieces(IntervalSet())) == '[None]'
+    assert ''.join(iter_output_pieces([(-1.0, [-12, 10]), (30.0, [27])])) == '[(-1.0, [-12, 10]), (30.0, [27])]'
+
+
+def test_output_file_name_is_chosen():
+    """The smallest free number is added to the name of the existing output file."""
+    with TemporaryDirectory() as temp_dir:
+        test_output_file = os_path_join(temp_dir, 'report')
+        assert choose_name_for_output_file('txt', test_output_file) == f'{test_output_file}.txt'
+        for file_name in ('report.txt', 'report(1).txt', 'report(3).txt', 'report(2).json'):
+            with open(os_path_join(temp_dir, file_name), 'w'):
+                pass
+        assert choose_name_for_output_file('txt', test_output_file) == f'{test_output_file}(2).txt'
+
+
+def test_parallel_output_files(test_config_parameters):
+    """The parallel runs with the same output file path write different output files."""
+    with TemporaryDirectory() as temp_dir:
+        test_config_parameters['output_file_format'] = 'TXT'
+        test_config_parameters['output_file_path'] = os_path_join(temp_dir, 'output_test')
+        test_config_data = ConfigFileData(**test_config_parameters)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda test_number: output_script_data(test_config_data, [test_number]), range(20)))
+
+        assert len(listdir(temp_dir)) == 20
+        test_outputs = sorted(read_txt_file(os_path_join(temp_dir, file_name)) for file_name in listdir(temp_dir))
+        assert test_outputs == sorted(str([test_number]) for test_number in range(20))
+
+
+def test_partial_output_file_is_removed():
+    """The output file is not created if its writing fails."""
+    with TemporaryDirectory() as temp_dir:
+        with raises(ValueError):
+            with OutputSink('txt', os_path_join(temp_dir, 'output_test')) as file_to_write:
+                file_to_write.write('[(-77, -61)')
+                raise ValueError('writing failed')
+        assert listdir(temp_dir) == []
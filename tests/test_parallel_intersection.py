@@ -0,0 +1,83 @@
+from math_analyser import (IntervalSet, determine_intersection_by_domain_slices,
+                           determine_intersection_by_sweep_line, determine_intersection_in_parallel,
+                           determine_intersection_of_ini_math_ranges)
+from math_analyser.parallel_intersection import (choose_split_points, concatenate_slices_results,
+                                                 determine_intersection_of_slice, split_math_sets)
+
+
+math_sets = [[(float('-inf'), float('inf'))],
+             [(float('-inf'), -10.37), (10.41, float('inf'))],
+             [(float('-inf'), 99.4)],
+             [(-98, float('inf'))],
+             [(float('-inf'), -32.08), (-17, 22.2), (54, 57)],
+             [(float('-inf'), -41), (-18, 24), (51, 62), (103, float('inf'))],
+             [(-89.11, -61.07), (-24.9, float('inf'))],
+             [(-77, 54), 61.04],
+             [(-89, -61), (-43, -12), (10, 27), (61, 72)]]
+math_sets_without_intersection = [[(-89, -61), (102, float('inf'))],
+                                  [(-57, 35)],
+                                  [(-2, 16), (61, 72)]]
+
+
+def test_parallel_intersection():
+    """The intersection determined by worker processes is the same as the one of the sweep line."""
+    test_result = determine_intersection_in_parallel(math_sets, 2)
+    assert test_result == determine_intersection_by_sweep_line(math_sets)
+    assert str(test_result.to_list()) == '[(-77, -61.07), (-17, -12), (10.41, 22.2)]'
+
+
+def test_parallel_intersection_is_empty():
+    """The empty partial result makes the whole intersection empty."""
+    assert determine_intersection_in_parallel(math_sets_without_intersection * 4, 2).to_list() == [None]
+
+
+def test_parallel_intersection_with_empty_math_set():
+    """The empty math set makes the whole intersection empty without worker processes."""
+    test_math_sets = math_sets + [IntervalSet()]
+    assert determine_intersection_in_parallel(test_math_sets, 2).to_list() == [None]
+    assert determine_intersection_by_domain_slices(test_math_sets, 2).to_list() == [None]
+
+
+def test_single_worker():
+    """The math sets are intersected without worker processes if one worker is given."""
+    assert determine_intersection_in_parallel(math_sets, 1) == determine_intersection_by_sweep_line(math_sets)
+
+
+def test_math_sets_chunks():
+    """The math sets are split into chunks with about the same number of subranges, the order is kept."""
+    test_math_sets = [IntervalSet.from_math_ranges(math_set) for math_set in math_sets]
+    test_chunks = split_math_sets(test_math_sets, 4)
+    assert [math_set for chunk in test_chunks for math_set in chunk] == test_math_sets
+    assert 1 < len(test_chunks) <= 4
+
+
+def test_domain_slices_intersection():
+    """The intersection of the slices of the number line is the same as the one of the whole math sets."""
+    test_result = determine_intersection_by_domain_slices(math_sets, 2)
+    assert test_result == determine_intersection_of_ini_math_ranges(math_sets)
+
+
+def test_split_points_are_endpoints():
+    """The split points of the number line are chosen from the finite endpoints of the math sets."""
+    test_math_sets = [IntervalSet.from_math_ranges(math_set) for math_set in math_sets]
+    test_split_points = choose_split_points(test_math_sets, 4)
+    assert test_split_points == sorted(set(test_split_points))
+    assert all(any(split_point in math_set.starts for math_set in test_math_sets)
+               for split_point in test_split_points)
+
+
+def test_clipped_slice():
+    """The subranges crossing the slice boundary are cut at it, the boundary point is kept."""
+    test_math_sets = [IntervalSet.from_math_ranges([(-10, 5), (7, 12)]), IntervalSet.from_math_ranges([(-1, 10)])]
+    test_result = determine_intersection_of_slice(test_math_sets, 5, 10, determine_intersection_by_sweep_line)
+    assert str(test_result.to_list()) == '[5, (7, 10)]'
+
+
+def test_slices_results_at_boundary():
+    """The math point at the slice boundary is dropped if the neighbouring slice has a range ending (starting) at it
+    and is added once if both slices have it."""
+    test_result = concatenate_slices_results([IntervalSet.from_math_ranges([(-10, 5)]),
+                                              IntervalSet.from_math_ranges([5, 7]),
+                                              IntervalSet.from_math_ranges([(7, 9)]),
+                                              IntervalSet.from_math_ranges([9, 11])])
+    assert str(test_result.to_list()) == '[(-10, 5), (7, 9), 11]'
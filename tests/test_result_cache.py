@@ -0,0 +1,92 @@
+from os import listdir, utime
+from os.path import join as os_path_join
+
+import math_analyser.result_cache as result_cache
+from math_analyser import IntervalSet, ResultCache
+from tests.settings import TemporaryDirectory, create_json_test_data_file
+
+
+math_intersection = IntervalSet.from_math_ranges([(-77, -61.07), (-17, -12), 61.04, (10.41, float('inf'))])
+ini_math_sets = ["[(float('-inf'), -10), (10, float('inf'))]",
+                 "[(-77, 61)]"]
+
+
+def test_stored_intersection_is_loaded():
+    """The stored math intersection is loaded with the same key."""
+    with TemporaryDirectory() as temp_dir:
+        test_cache = ResultCache(os_path_join(temp_dir, 'cache'), 2 ** 20)
+        test_cache.store('json-test', math_intersection)
+        assert test_cache.load('json-test') == math_intersection
+        assert test_cache.load('txt-test') is None
+
+
+def test_key_of_unchanged_and_changed_data_file():
+    """The key depends on the data file content and format, the unchanged data file is not hashed again."""
+    with TemporaryDirectory() as temp_dir:
+        test_data_file = os_path_join(temp_dir, 'data file')
+        create_json_test_data_file(test_data_file, ini_math_sets)
+        test_cache = ResultCache(os_path_join(temp_dir, 'cache'), 2 ** 20)
+
+        test_key = test_cache.get_key(test_data_file, 'JSON')
+        assert test_key.startswith('json-')
+        assert test_cache.get_key(test_data_file, 'JSON') == test_key
+        assert test_cache.get_key(test_data_file, 'TXT') != test_key
+
+        create_json_test_data_file(test_data_file, ini_math_sets[:1])
+        utime(test_data_file, ns=(0, 0))
+        assert test_cache.get_key(test_data_file, 'JSON') != test_key
+
+
+def test_least_recently_used_entry_is_evicted():
+    """The least recently used entry is removed when the cache size exceeds the limit."""
+    entry_size = len(math_intersection.to_bytes())
+    with TemporaryDirectory() as temp_dir:
+        test_cache_dir = os_path_join(temp_dir, 'cache')
+        test_cache = ResultCache(test_cache_dir, 2 * entry_size)
+        test_cache.store('json-first', math_intersection)
+        test_cache.store('json-second', math_intersection)
+        utime(test_cache.get_entry_path('json-first'), ns=(1, 1))
+        utime(test_cache.get_entry_path('json-second'), ns=(2, 2))
+        test_cache.load('json-first')
+        test_cache.store('json-third', math_intersection)
+
+        assert sorted(listdir(test_cache_dir)) == ['json-first.msa', 'json-third.msa']
+
+
+def test_index_is_pruned_on_eviction():
+    """The data file is removed from the cache index when the entry of its hash is evicted."""
+    entry_size = len(math_intersection.to_bytes())
+    with TemporaryDirectory() as temp_dir:
+        test_cache = ResultCache(os_path_join(temp_dir, 'cache'), entry_size)
+        test_keys = list()
+        for file_number in range(3):
+            test_data_file = os_path_join(temp_dir, f'data file {file_number}')
+            create_json_test_data_file(test_data_file, ini_math_sets[file_number:])
+            test_keys.append(test_cache.get_key(test_data_file, 'JSON'))
+        test_cache.store(test_keys[-1], math_intersection)
+
+        assert list(test_cache.read_index()) == [os_path_join(temp_dir, 'data file 2')]
+
+
+def test_cache_directory_is_not_created():
+    """The cache is disabled if its directory cannot be created, nothing is stored or loaded."""
+    with TemporaryDirectory() as temp_dir:
+        create_json_test_data_file(os_path_join(temp_dir, 'file'), ini_math_sets)
+        test_cache = ResultCache(os_path_join(temp_dir, 'file', 'cache'), 2 ** 20)
+        assert not test_cache.is_enabled
+        test_key = test_cache.get_key(os_path_join(temp_dir, 'file'), 'JSON')
+        test_cache.store(test_key, math_intersection)
+        assert test_cache.load(test_key) is None
+
+
+def test_temporary_file_is_removed(monkeypatch):
+    """The temporary file is removed if the entry cannot be written."""
+    def replace_with_error(source_path, target_path):
+        raise OSError('No space left on device')
+
+    monkeypatch.setattr(result_cache, 'replace', replace_with_error)
+    with TemporaryDirectory() as temp_dir:
+        test_cache_dir = os_path_join(temp_dir, 'cache')
+        test_cache = ResultCache(test_cache_dir, 2 ** 20)
+        test_cache.store('json-test', math_intersection)
+        assert listdir(test_cache_dir) == []
@@ -0,0 +1,72 @@
+from configparser import ConfigParser
+from os.path import join as os_path_join
+
+import run_math_sets_analyser as run_msa
+from math_analyser import StabbingIndex, determine_sets_of_math_points, parse_configuration_file
+from tests.settings import create_json_test_data_file, read_txt_file
+
+math_sets = [[(float('-inf'), -10), (10, float('inf'))],
+             [(-77, 61)],
+             [(-89, -61), (-43, -12), (10, 27), (61, 72)]]
+input_data = ["[(float('-inf'), -10), (10, float('inf'))]",
+              "[(-77, 61)]",
+              "[(-89, -61), (-43, -12), (10, 27), (61, 72)]"]
+
+
+def test_sets_containing_point():
+    """The math sets containing the point (the endpoint included) and the ones not containing it."""
+    stabbing_index = StabbingIndex(math_sets)
+    assert stabbing_index.sets_containing(-1) == [1]
+    assert stabbing_index.sets_excluding(-1) == [0, 2]
+    assert stabbing_index.sets_containing(-12) == [0, 1, 2]
+    assert stabbing_index.sets_containing(61) == [0, 1, 2]
+    assert stabbing_index.sets_containing(-100) == [0]
+    assert stabbing_index.sets_containing(100) == [0]
+    assert stabbing_index.sets_containing_points([-1, 30]) == [(-1, [1]), (30, [0, 1])]
+
+
+def test_nearest_sets():
+    """The nearest math sets not containing the point with the distances to them."""
+    stabbing_index = StabbingIndex(math_sets)
+    assert stabbing_index.nearest_sets(-1) == [(0, 9)]
+    assert stabbing_index.nearest_sets(-1, 2) == [(0, 9), (2, 11)]
+    assert stabbing_index.nearest_sets(0) == [(0, 10), (2, 10)]
+    assert stabbing_index.nearest_sets(-12) == []
+    assert stabbing_index.nearest_sets_of_points([-100, 80]) == [(-100, [(2, 11)]), (80, [(2, 8)])]
+
+
+def test_nearest_set_behind_containing_sets():
+    """The nearest math set behind many endpoints of the math sets containing the point is found
+    by the binary search in the endpoints of every math set."""
+    stabbing_index = StabbingIndex([[(0, 10), (20, 21), (22, 23), (24, 25)], [(0, 10)], [(30, 31)], [(-40, -35)]])
+    assert stabbing_index.nearest_sets(5) == [(2, 25)]
+    assert stabbing_index.nearest_sets(5, 2) == [(2, 25), (3, 40)]
+
+
+def test_unit_bitmaps_between_checkpoints():
+    """The bitmaps of the units between the checkpoints are restored from the math sets starting and ending
+    at the endpoints, the result is the same for every unit."""
+    test_math_sets = [[(set_index, set_index + 100), set_index + 150.5] for set_index in range(200)]
+    stabbing_index = StabbingIndex(test_math_sets)
+    assert stabbing_index.checkpoint_step == 4
+    for math_point in range(-1, 360):
+        for test_point in (math_point, math_point + 0.5):
+            assert stabbing_index.sets_containing(test_point) == [
+                set_index for set_index, ((start, end), point) in enumerate(test_math_sets)
+                if start <= test_point <= end or test_point == point]
+
+
+def test_stab_mode_full_run(tmp_path):
+    """The math sets containing the point and the nearest ones are written to the output file."""
+    test_config_ini = ConfigParser()
+    test_config_ini['general'] = {'mode': 'STAB', 'point': '-1'}
+    test_config_ini['input'] = {'format': 'JSON', 'path': os_path_join(tmp_path, 'data file.json')}
+    test_config_ini['output'] = {'format': 'TXT', 'path': os_path_join(tmp_path, 'output file')}
+    with open(os_path_join(tmp_path, 'config.ini'), 'w') as config_file:
+        test_config_ini.write(config_file)
+    create_json_test_data_file(os_path_join(tmp_path, 'data file.json'), input_data)
+
+    run_msa.main(parse_configuration_file(os_path_join(tmp_path, 'config.ini')))
+    assert read_txt_file(os_path_join(tmp_path, 'output file.txt')) == '([1], [(0, 9.0)])'
+    assert determine_sets_of_math_points([-1.0, 30.0], StabbingIndex(math_sets)) == [(-1.0, [1], [(0, 9.0)]),
+                                                                                     (30.0, [0, 1], [(2, 3.0)])]
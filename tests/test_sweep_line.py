@@ -0,0 +1,79 @@
+from pytest import raises
+
+from errors import DataFileError
+from math_analyser import (determine_coverage_by_sweep_line, determine_intersection_by_sweep_line,
+                           determine_intersection_of_ini_math_ranges, determine_intersection_of_math_sets_stream)
+
+
+math_sets = [[(float('-inf'), float('inf'))],
+             [(10.41, float('inf')), (float('-inf'), -10.37)],
+             [(float('-inf'), 99.4)],
+             [(-98, float('inf'))],
+             [(float('-inf'), -32.08), (-17, 22.2), (54, 57)],
+             [(float('-inf'), -41), (51, 62), (-18, 24), (103, float('inf'))],
+             [(-89.11, -61.07), (-24.9, float('inf'))],
+             [(-77, 54), 61.04],
+             [(-89, -61), (-43, -12), (10, 27), (61, 72)]]
+numeric_math_sets = [[(-18, 24), (-75, -41), (51, 62)],
+                     [(-77, 61)],
+                     [(-89, -61), (61, 72), (-43, -12)]]
+semi_infinite_math_sets = [[(-89, -61), (-12, float('inf'))],
+                           [(-97, float('inf'))],
+                           [(float('-inf'), float('inf'))]]
+math_sets_with_points = [[(-89, 17.8), 24, (25, float('inf'))],
+                         [(-97, 2), (9.9, 24), (36.1, float('inf'))],
+                         [-77, -29, 42.7, (51.1, float('inf'))]]
+overlapping_math_sets = [[(-10, 5), (0, 10), 7, (10, 12)],
+                         [(-5, 20), 3]]
+math_sets_without_intersection = [[(-89, -61), (102, float('inf'))],
+                                  [(-57, 35)],
+                                  [(-2, 16), (61, 72)]]
+output_for_math_sets = [(-77, -61.07), (-17, -12), (10.41, 22.2)]
+output_for_numeric_math_sets = [(-75, -61), (-43, -41), (-18, -12), 61]
+output_for_semi_infinite_math_sets = [(-89, -61), (-12, float('inf'))]
+output_for_math_sets_with_points = [-77, -29, 42.7, (51.1, float('inf'))]
+output_for_overlapping_math_sets = [(-5, 0), (0, 3), (3, 5), (5, 7), (7, 10), (10, 12)]
+
+
+def test_all_types_of_math_sets():
+    """Sweep line for all types of math sets."""
+    assert determine_intersection_by_sweep_line(math_sets) == output_for_math_sets
+
+
+def test_numeric_math_sets():
+    """Sweep line for numeric math sets."""
+    assert determine_intersection_by_sweep_line(numeric_math_sets) == output_for_numeric_math_sets
+
+
+def test_semi_infinite_math_sets():
+    """Sweep line for math sets with semi-infinite ranges."""
+    assert determine_intersection_by_sweep_line(semi_infinite_math_sets) == output_for_semi_infinite_math_sets
+
+
+def test_math_sets_with_points():
+    """Sweep line for math sets with math points."""
+    assert determine_intersection_by_sweep_line(math_sets_with_points) == output_for_math_sets_with_points
+
+
+def test_overlapping_ranges_of_one_math_set():
+    """Sweep line for math sets with overlapping ranges, the result is split at all endpoints."""
+    test_result = determine_intersection_by_sweep_line(overlapping_math_sets)
+    assert test_result == output_for_overlapping_math_sets
+    assert test_result == determine_intersection_of_ini_math_ranges(overlapping_math_sets, 0, [])
+
+
+def test_math_sets_without_intersection():
+    """Sweep line for math sets without intersection."""
+    assert determine_intersection_by_sweep_line(math_sets_without_intersection) == [None]
+
+
+def test_no_math_sets():
+    """Every engine raises DataFileError if there are no math sets."""
+    with raises(DataFileError):
+        determine_intersection_by_sweep_line([])
+    with raises(DataFileError):
+        determine_intersection_of_ini_math_ranges([])
+    with raises(DataFileError):
+        determine_intersection_of_math_sets_stream(iter([]))
+    with raises(DataFileError):
+        determine_coverage_by_sweep_line([], ('INTS', 'UNION'))